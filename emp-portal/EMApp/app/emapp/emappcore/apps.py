@@ -23,4 +23,11 @@ class EMAppCoreConfig(AppConfig):
         """
         core_app = register_extensions.AppRegister()
         core_app.setup()
+
+        # Invalidate the cached api keys on any change (see emappcore.utils.api_key_cache)
+        from django.db.models.signals import post_save, post_delete
+        from rest_framework_api_key.models import APIKey
+        from emappcore.utils.api_key_cache import invalidate_api_key
+        post_save.connect(invalidate_api_key, sender=APIKey, dispatch_uid="emapp_invalidate_api_key_save")
+        post_delete.connect(invalidate_api_key, sender=APIKey, dispatch_uid="emapp_invalidate_api_key_delete")
         return None
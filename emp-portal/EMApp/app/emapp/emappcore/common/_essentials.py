@@ -1,6 +1,11 @@
 from emappcore.utils import errors as err
-from jsonschema import validate as _validate
+from jsonschema import validators as _jsonschema_validators
+from jsonschema.exceptions import best_match as _best_match
+from collections.abc import Mapping
+import datetime
 import importlib
+import hashlib
+import types
 import copy
 import os
 import json
@@ -108,6 +113,7 @@ class EMAppValidators:
         register: (classmethod) This used to register any new validators function
                   and available in BaseAppCorePluginInterface.app_validators()
     """
+    _validators_version = 0
 
     @classmethod
     def register(cls, name=None, func=None):
@@ -119,6 +125,288 @@ class EMAppValidators:
         :return: None
         """
         _register_static_methods(cls, "validator", name, func)
+        # Compiled schemas resolve the validator functions again
+        EMAppValidators._validators_version += 1
+
+
+def _for_strings(func):
+    """
+    Normalizer for a string or each string of a list, other values are not changed.
+    :param func: function str -> str
+    :return: function
+    """
+    def _normalizer(value):
+        if isinstance(value, str):
+            return func(value)
+        if isinstance(value, list):
+            return [func(_v) if isinstance(_v, str) else _v for _v in value]
+        return value
+    return _normalizer
+
+
+def _split(value):
+    """
+    Comma separated string to list (e.g. multipart/form-data, imports), empty items are dropped.
+    """
+    if isinstance(value, str):
+        return [_v for _v in value.split(",") if _v.strip()]
+    return value
+
+
+def _to_date(value):
+    """
+    Date or datetime (e.g. imports) to ISO date string.
+    """
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+# Normalizers available in the schema property normalize (space separated, applied in the given order)
+_NORMALIZERS = {
+    "split": _split,
+    "strip": _for_strings(str.strip),
+    "lower": _for_strings(str.lower),
+    "upper": _for_strings(str.upper),
+    "title": _for_strings(str.title),
+    "date": _to_date
+}
+
+
+class _CompiledSchema:
+    """
+    Validation plan of a schema, compiled once on register (see EMAppSchemas.validate).
+
+        - jsonschema validator built once (schema is checked once)
+        - Custom validators of each property as a tuple of names, functions are resolved on the first validation
+          (validators are registered after the schemas) and again if any validator is registered
+        - Options of each property as a frozenset
+        - Plans for the partial validation are cached by the given keys
+        - Normalizers of each property (normalize attribute) as a tuple of functions (see EMAppSchemas.normalize)
+
+    Methods:
+
+        normalize: Normalize the given data in place
+        get_partial: Get the plan for the given property names only
+        get_fields: Get the (key, validator functions, ignore_missing, options) of each property
+        iter_errors: Get the jsonschema errors of the given data
+    """
+    _max_partial_plans = 128
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.properties = frozenset(schema['properties'])
+        _cls = _jsonschema_validators.validator_for(schema)
+        _cls.check_schema(schema)
+        self._validator = _cls(schema)
+        self._fields = tuple(
+            (
+                key,
+                tuple(_name.strip() for _name in _property['validators'].strip().split(" ") if _name.strip()),
+                "ignore_missing" in _property['validators'],
+                frozenset(_option['value'] for _option in _property['options'])
+                if _property.get('options') else None
+            ) for key, _property in schema['properties'].items()
+        )
+        self._normalizers = tuple(
+            (key, self._get_normalizers(key, _property['normalize']))
+            for key, _property in schema['properties'].items() if _property.get('normalize', '').strip()
+        )
+        self._resolved = None
+        self._partial = dict()
+
+    @staticmethod
+    def _get_normalizers(key, value):
+        """
+        :param key: str property name
+        :param value: str space separated normalizer names
+        :return: tuple of functions
+        """
+        _names = value.split()
+        _unknown = [_name for _name in _names if _name not in _NORMALIZERS]
+        if _unknown:
+            raise err.SchemaError("Not supported normalizer {} for the property {}".format(_unknown[0], key))
+        return tuple(_NORMALIZERS[_name] for _name in _names)
+
+    def normalize(self, data_dict):
+        """
+        Apply the normalizers of the given properties in a single pass.
+        :param data_dict: dict (modified in place)
+        :return: dict
+        """
+        for key, _normalizers in self._normalizers:
+            if key in data_dict:
+                _value = data_dict[key]
+                for _normalizer in _normalizers:
+                    _value = _normalizer(_value)
+                data_dict[key] = _value
+        return data_dict
+
+    def get_partial(self, keys):
+        """
+        Plan for the given property names only (e.g. changes of bulk updates).
+        :param keys: iterable of property names
+        :return: _CompiledSchema
+        """
+        keys = frozenset(keys).intersection(self.properties)
+        plan = self._partial.get(keys)
+        if plan is None:
+            schema = dict(self.schema)
+            schema['properties'] = {k: v for k, v in self.schema['properties'].items() if k in keys}
+            schema['required'] = [k for k in self.schema.get('required', []) if k in keys]
+            # Empty required is not a valid schema (draft 4)
+            if not schema['required']:
+                del schema['required']
+            plan = _CompiledSchema(schema)
+            if len(self._partial) >= self._max_partial_plans:
+                self._partial.clear()
+            self._partial[keys] = plan
+        return plan
+
+    def get_fields(self, validators):
+        """
+        Properties with the resolved validator functions.
+        :param validators: EMAppValidators instance (validator functions are looked up on it)
+        :return: tuple of (key, tuple of (name, function), ignore_missing, options)
+        """
+        _version = EMAppValidators._validators_version
+        if self._resolved is None or self._resolved[0] != _version:
+            self._resolved = (_version, tuple(
+                (key, tuple((_name, getattr(validators, _name)) for _name in _names), _ignore_missing, _options)
+                for key, _names, _ignore_missing, _options in self._fields
+            ))
+        return self._resolved[1]
+
+    def iter_errors(self, data_dict):
+        """
+        :param data_dict: dict
+        :return: jsonschema errors
+        """
+        return self._validator.iter_errors(data_dict)
+
+
+def _in_options(value, options):
+    """
+    :param value: given value
+    :param options: frozenset
+    :return: boolean
+    """
+    try:
+        return value in options
+    except TypeError:
+        # Not hashable (e.g. list) never matches
+        return False
+
+
+def _freeze(value):
+    """
+    Read only copy of the schema content (dict as mappingproxy and list as tuple).
+    :param value: schema content
+    :return: read only schema content
+    """
+    if isinstance(value, dict):
+        return types.MappingProxyType(dict((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _split_roles(value):
+    """
+    :param value: str space separated roles (show/update attribute)
+    :return: frozenset
+    """
+    return frozenset(_role for _role in (value or "").split(" ") if _role)
+
+
+class EMAppSchema(Mapping):
+    """
+    Read only schema built once on register (see EMAppSchemas.get_frozen_schema). Schema content can be read as
+    a mapping (e.g. schema['properties'][key]['label']), properties and required are also attributes (templates).
+    Nested dict are mappingproxy and list are tuple, not to be modified.
+
+    Indexes built on register:
+
+        - Properties shown to a role (show attribute)
+        - Properties updated by a role (update attribute)
+        - Properties grouped by group_label (in the order of the schema)
+        - Properties stored as model columns or in the extras table, per model on the first call
+
+    Methods:
+
+        get_show_fields: Get the properties shown to the given role
+        get_update_fields: Get the properties the given role can update
+        get_groups: Get the properties grouped by group_label
+        get_model_fields: Get the properties that are model columns and the properties stored in extras
+    """
+
+    def __init__(self, schema):
+        self._schema = _freeze(schema)
+        self.properties = self._schema['properties']
+        self.required = self._schema.get('required', ())
+
+        _show = dict()
+        _update = dict()
+        _groups = dict()
+        for key, _property in self.properties.items():
+            for _role in _split_roles(_property.get('show')):
+                _show.setdefault(_role, []).append(key)
+            for _role in _split_roles(_property.get('update')):
+                _update.setdefault(_role, []).append(key)
+            _groups.setdefault(_property.get('group_label', ''), []).append(key)
+
+        self._show = dict((_role, frozenset(_keys)) for _role, _keys in _show.items())
+        self._update = dict((_role, frozenset(_keys)) for _role, _keys in _update.items())
+        self._groups = types.MappingProxyType(dict((_gp, tuple(_keys)) for _gp, _keys in _groups.items()))
+        self._model_fields = dict()
+
+    def __getitem__(self, key):
+        return self._schema[key]
+
+    def __iter__(self):
+        return iter(self._schema)
+
+    def __len__(self):
+        return len(self._schema)
+
+    def get_show_fields(self, role):
+        """
+        :param role: str
+        :return: frozenset of property names
+        """
+        return self._show.get(role, frozenset())
+
+    def get_update_fields(self, role):
+        """
+        :param role: str
+        :return: frozenset of property names
+        """
+        return self._update.get(role, frozenset())
+
+    def get_groups(self):
+        """
+        :return: mapping {group_label: tuple of property names}
+        """
+        return self._groups
+
+    def get_model_fields(self, model):
+        """
+        Properties that are columns (concrete fields) of the given model and the rest that are stored in
+        the extras table, both in the order of the schema.
+        :param model: django model class
+        :return: tuple (tuple of columns, tuple of extras)
+        """
+        _fields = self._model_fields.get(model)
+        if _fields is None:
+            _columns = set(_field.name for _field in model._meta.concrete_fields)
+            _fields = (
+                tuple(key for key in self.properties if key in _columns),
+                tuple(key for key in self.properties if key not in _columns)
+            )
+            self._model_fields[model] = _fields
+        return _fields
 
 
 class EMAppSchemas(EMAppValidators):
@@ -129,6 +417,9 @@ class EMAppSchemas(EMAppValidators):
     :methods
 
     get_schema: Gets the content of the schema given name
+    get_frozen_schema: Gets the read only schema with the precomputed indexes given name
+    get_schema_hash: Gets the content hash of the schema given name
+    normalize: Normalize the contents (before validate) as per the given schema name
     validate: Responsible to validate the contents against the given schema name
 
     Methods:
@@ -136,6 +427,9 @@ class EMAppSchemas(EMAppValidators):
         register: (classmethod) This used to register any new schema and
                    available in BaseAppCorePluginInterface.app_schema()
     """
+    _schema_hashes = {}
+    _compiled_schemas = {}
+    _frozen_schemas = {}
 
     def get_schema(self, schema_name):
         """
@@ -145,7 +439,54 @@ class EMAppSchemas(EMAppValidators):
         """
         return copy.deepcopy(getattr(self, "_{}".format(schema_name)))
 
-    def validate(self, schema_name, data_dict):
+    def get_frozen_schema(self, schema_name):
+        """
+        This will get the read only schema given schema name, built once on register. Use this instead of
+        get_schema if the schema is not modified (see EMAppSchema for the indexes).
+        :param schema_name: str (registered schema name)
+        :return: EMAppSchema
+        """
+        _schema = getattr(self, "_{}".format(schema_name))
+        _frozen = self._frozen_schemas.get(schema_name)
+        # Built again if the schema is not the same object (e.g. set without register)
+        if _frozen is None or _frozen[0] is not _schema:
+            _frozen = (_schema, EMAppSchema(_schema))
+            self._frozen_schemas[schema_name] = _frozen
+        return _frozen[1]
+
+    def get_schema_hash(self, schema_name):
+        """
+        This will get the content hash of the schema given schema name. Hash changes only if the schema changes
+        (e.g. on deploy) and can be used in cache keys or ETags.
+        :param schema_name: str (registered schema name)
+        :return: str (sha1 hex digest)
+        """
+        _schema = getattr(self, "_{}".format(schema_name))
+        _cached = self._schema_hashes.get(schema_name)
+        # Schema registered again (overwritten) if the object is not the same
+        if not _cached or _cached[0] is not _schema:
+            _cached = (_schema, hashlib.sha1(json.dumps(_schema, sort_keys=True).encode('utf-8')).hexdigest())
+            self._schema_hashes[schema_name] = _cached
+        return _cached[1]
+
+    def normalize(self, schema_name, data_dict):
+        """
+        Normalize the data as per the normalize attribute of the schema properties (space separated and applied in
+        the given order) before validate. Only the given keys are normalized. Compiled once on register.
+
+            - split: Comma separated string to list
+            - strip, lower, upper, title: String or each string of a list
+            - date: Date or datetime to ISO date string
+
+        e.g. "normalize": "split strip title" - "python , django" -> ["Python", "Django"]
+
+        :param schema_name: str (Name of the schema)
+        :param data_dict: dict (modified in place)
+        :return: dict
+        """
+        return self._get_compiled_schema(schema_name).normalize(data_dict)
+
+    def validate(self, schema_name, data_dict, partial=False):
         """
         Step 1: Validate the json-schema
         Step 2: Validate custom validations given in the schema files
@@ -153,52 +494,48 @@ class EMAppSchemas(EMAppValidators):
 
         Note 1: If no validators given but options are available, then considers it to be possible emtpy values.
         Note 2: If not validators given is same as ignore missing values.
+        Note 3: If partial only the given keys are validated (e.g. changes of bulk updates).
+        Note 4: Validation runs the plan compiled on register (see _CompiledSchema), the schema is not copied.
 
 
         :param schema_name: str (Name of the schema)
         :param data_dict: dict (All the values associated with the schema)
+        :param partial: boolean (validate only the properties given in data_dict)
         :return: None (Raises errors if any validation errors)
         """
 
         log.info("Validating the data against given schema - {}".format(schema_name))
-        schema = self.get_schema(schema_name)
+        plan = self._get_compiled_schema(schema_name)
+        if partial:
+            plan = plan.get_partial(data_dict.keys())
 
-        diff = set(data_dict.keys()).difference(set(schema['properties']))
+        diff = set(data_dict.keys()).difference(plan.properties)
         if diff:
             raise err.ValidationError({
                 "parameter": "Not allowed parameter: {}".format(list(diff)[0])
             })
 
         try:
-            _validate(
-                instance=data_dict,
-                schema=schema
-            )
+            error = _best_match(plan.iter_errors(data_dict))
         except Exception as e:
-            if hasattr(e, 'message'):
-                msg = e.message
-            else:
-                msg = "InternalServerError"
-            raise err.ValidationError({"ValidationError": msg})
+            log.error(e)
+            raise err.ValidationError({"ValidationError": "InternalServerError"})
+        if error is not None:
+            raise err.ValidationError({"ValidationError": error.message})
 
         log.info("Validating all the data given")
-        for key in schema['properties']:
-
-            # Custom Validators
-            _validators_string = schema['properties'][key]['validators'].strip()
-            _options = schema['properties'][key].get('options', '')
+        for key, _validators, _ignore_missing, _options in plan.get_fields(self):
             _given_value = data_dict.get(key, '')
 
-            if _validators_string:
-                _validators = _validators_string.split(" ")
-                for _validator in _validators:
-                    if _validator == "ignore_missing" and not _given_value:
-                        break
-                    else:
-                        getattr(self, _validator.strip())(key, data_dict[key])
+            # Custom Validators
+            for _name, _validator in _validators:
+                if _name == "ignore_missing" and not _given_value:
+                    break
+                else:
+                    _validator(key, data_dict[key])
 
-            if _options and _given_value not in (x['value'] for x in _options):
-                if not _given_value and "ignore_missing" in _validators_string:
+            if _options is not None and not _in_options(_given_value, _options):
+                if not _given_value and _ignore_missing:
                     pass
                 else:
                     # Check for options
@@ -208,6 +545,20 @@ class EMAppSchemas(EMAppValidators):
 
         return True
 
+    def _get_compiled_schema(self, schema_name):
+        """
+        Compiled validation plan of the schema. Compiled on register, compiled again if the schema is not
+        the same object (e.g. set without register).
+        :param schema_name: str (registered schema name)
+        :return: _CompiledSchema
+        """
+        _schema = getattr(self, "_{}".format(schema_name))
+        plan = self._compiled_schemas.get(schema_name)
+        if plan is None or plan.schema is not _schema:
+            plan = _CompiledSchema(_schema)
+            self._compiled_schemas[schema_name] = plan
+        return plan
+
     @classmethod
     def register(cls, schema_dir=None, file_name=None, schema_name=None):
         """
@@ -240,6 +591,8 @@ class EMAppSchemas(EMAppValidators):
                 if hasattr(cls, "_{}".format(schema_name)):
                     log.warning("Overwriting the existing schema - {}".format(schema_name))
                 setattr(cls, "_{}".format(schema_name), schema_content)
+                cls._compiled_schemas[schema_name] = _CompiledSchema(schema_content)
+                cls._frozen_schemas[schema_name] = (schema_content, EMAppSchema(schema_content))
                 log.info("Registering schema - {}".format(schema_name))
 
         except ModuleNotFoundError as e:
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from emappcore.common import config
+from emappcore.utils import mail
+import signal
+import time
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Send the pending emails of the outbox. Sends the retries that are due, run periodically or with --loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="Emails sent over one connection (default EMAIL_OUTBOX_BATCH_SIZE)")
+        parser.add_argument('--loop', action='store_true', help="Keep sending every --interval seconds")
+        parser.add_argument('--interval', type=int, default=None,
+                            help="Seconds between the runs with --loop (default EMAIL_OUTBOX_INTERVAL)")
+        parser.add_argument('--purge', action='store_true',
+                            help="Delete the sent emails older than EMAIL_OUTBOX_KEEP_DAYS")
+
+    def _stop(self, signum, frame):
+        log.info("Stopping the outbox sender (signal {})".format(signum))
+        self._stopping = True
+
+    def handle(self, *args, **options):
+        """
+        Send the pending emails once, or every interval with --loop until SIGTERM/SIGINT.
+        :param args:
+        :param options:
+        :return:
+        """
+        interval = options['interval'] or int(config.get('EMAIL_OUTBOX_INTERVAL', 60))
+        self._stopping = False
+        if options['loop']:
+            signal.signal(signal.SIGTERM, self._stop)
+            signal.signal(signal.SIGINT, self._stop)
+
+        while True:
+            close_old_connections()
+            try:
+                _sent = mail.send_outbox(options['batch_size'])
+                if options['purge']:
+                    _deleted = mail.purge_outbox()
+                    if _deleted:
+                        log.info("Deleted {} sent emails from the outbox".format(_deleted))
+            except Exception as e:
+                if not options['loop']:
+                    raise
+                log.error("Outbox sender failed: {}".format(e))
+            else:
+                if not options['loop']:
+                    self.stdout.write("Sent {} emails".format(_sent))
+
+            if not options['loop']:
+                break
+            _until = time.monotonic() + interval
+            while not self._stopping and time.monotonic() < _until:
+                time.sleep(1)
+            if self._stopping:
+                break
+        return None
@@ -0,0 +1,121 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from emappcore.common import config
+import multiprocessing
+import os
+import signal
+import time
+import logging
+
+try:
+    import django_rq
+except ImportError:
+    django_rq = None
+
+log = logging.getLogger(__name__)
+
+
+def _run_worker(queues, burst, max_jobs):
+    """
+    Worker process. Runs a RQ worker for the given queues (in priority order).
+    :param queues: list of queue names
+    :param burst: boolean
+    :param max_jobs: int or None
+    :return: None
+    """
+    # Own process group, terminal signals (ctrl+c) are sent only to the supervisor which stops the workers
+    os.setpgrp()
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    connections.close_all()
+    worker = django_rq.get_worker(*queues)
+    worker.work(burst=burst, max_jobs=max_jobs)
+
+
+class Command(BaseCommand):
+    help = 'Run a supervised pool of RQ worker processes for the api background jobs (RQ_QUEUES)'
+
+    _poll_interval = 1
+    _max_backoff = 30
+
+    def add_arguments(self, parser):
+        parser.add_argument('queues', nargs='*', type=str,
+                            help="Queue names in priority order (default all the RQ_QUEUES)")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Number of worker processes (default API_JOBS_WORKERS)")
+        parser.add_argument('--max-jobs', type=int, default=None,
+                            help="Restart the worker process after these many jobs (default API_JOBS_WORKER_MAX_JOBS)")
+        parser.add_argument('--burst', action='store_true', help="Workers exit once the queues are empty")
+
+    def _start(self, queues, burst, max_jobs):
+        process = multiprocessing.Process(target=_run_worker, args=(queues, burst, max_jobs), daemon=False)
+        process.start()
+        log.info("Started worker process: {}".format(process.pid))
+        return process
+
+    def _stop(self, signum, frame):
+        log.info("Stopping the workers (signal {}). Workers complete the current jobs".format(signum))
+        self._stopping = True
+
+    def handle(self, *args, **options):
+        """
+        Start the worker processes and restart the processes that exit (crashed or after max jobs) with a backoff.
+        On SIGTERM/SIGINT the workers are stopped after the current jobs are completed.
+        :param args:
+        :param options:
+        :return:
+        """
+        if django_rq is None:
+            raise CommandError("django_rq is not installed")
+
+        queues = options['queues'] or list(config.get('RQ_QUEUES', {}))
+        if not queues:
+            raise CommandError("No queues given or configured in RQ_QUEUES")
+        count = options['workers'] or int(config.get('API_JOBS_WORKERS', 2))
+        max_jobs = options['max_jobs'] or int(config.get('API_JOBS_WORKER_MAX_JOBS', 0)) or None
+        burst = options['burst']
+
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        log.info("Starting {} workers for the queues: {}".format(count, ", ".join(queues)))
+        # Forked workers should not share the database connections
+        connections.close_all()
+        processes = dict((i, self._start(queues, burst, max_jobs)) for i in range(count))
+        started = dict((i, time.monotonic()) for i in range(count))
+        backoff = dict((i, 0) for i in range(count))
+        restart_at = dict()
+        terminated = set()
+
+        while processes or (restart_at and not self._stopping):
+            time.sleep(self._poll_interval)
+            for i, process in list(processes.items()):
+                if process.is_alive():
+                    # Only once, second SIGTERM is a cold shutdown for rq worker
+                    if self._stopping and i not in terminated:
+                        process.terminate()
+                        terminated.add(i)
+                    continue
+
+                process.join()
+                del processes[i]
+                if self._stopping or (burst and process.exitcode == 0):
+                    continue
+
+                # Backoff for the workers exiting right after the start (e.g. redis not available)
+                if time.monotonic() - started[i] < self._max_backoff:
+                    backoff[i] = min(max(backoff[i] * 2, 1), self._max_backoff)
+                else:
+                    backoff[i] = 0
+                log.warning("Worker process {} exited with code {}. Restarting in {} seconds".format(
+                    process.pid, process.exitcode, backoff[i]))
+                restart_at[i] = time.monotonic() + backoff[i]
+
+            for i, _at in list(restart_at.items()):
+                if not self._stopping and time.monotonic() >= _at:
+                    del restart_at[i]
+                    processes[i] = self._start(queues, burst, max_jobs)
+                    started[i] = time.monotonic()
+
+        log.info("All the workers are stopped")
@@ -0,0 +1,189 @@
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from emappcore.common import config
+from emappcore.utils import utilities as u
+import gzip
+import io
+import re
+import zlib
+import logging
+
+log = logging.getLogger(__name__)
+
+# Optional brotli support. If not installed only gzip is negotiated.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Media types worth compressing. Images (e.g. avatars) and other binary formats are already compressed.
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/stream+json",
+    "application/javascript",
+    "application/xml",
+    "application/msgpack",
+    "image/svg+xml"
+)
+
+_ACCEPT_ENCODING_RE = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+class GzipCompressor:
+    """
+    gzip content coding. Level from RESPONSE_COMPRESSION_GZIP_LEVEL.
+
+    Methods:
+        compress: Compress the whole content
+        compress_stream: Compress an iterator of chunks, each chunk is flushed to the client
+    """
+    name = "gzip"
+
+    @property
+    def level(self):
+        return int(config.get('RESPONSE_COMPRESSION_GZIP_LEVEL', 6))
+
+    def compress(self, data):
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def compress_stream(self, chunks):
+        _buffer = io.BytesIO()
+        with gzip.GzipFile(mode='wb', compresslevel=self.level, fileobj=_buffer, mtime=0) as _file:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                _file.write(chunk)
+                _file.flush(zlib.Z_SYNC_FLUSH)
+                yield _buffer.getvalue()
+                _buffer.seek(0)
+                _buffer.truncate()
+        yield _buffer.getvalue()
+
+
+class BrotliCompressor:
+    """
+    brotli content coding (needs brotli package). Quality from RESPONSE_COMPRESSION_BROTLI_QUALITY, low quality
+    is used by default as the responses are compressed on the fly.
+
+    Methods:
+        compress: Compress the whole content
+        compress_stream: Compress an iterator of chunks, each chunk is flushed to the client
+    """
+    name = "br"
+
+    @property
+    def quality(self):
+        return int(config.get('RESPONSE_COMPRESSION_BROTLI_QUALITY', 4))
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+    def compress_stream(self, chunks):
+        _compressor = brotli.Compressor(quality=self.quality)
+        for chunk in chunks:
+            if not chunk:
+                continue
+            yield _compressor.process(chunk) + _compressor.flush()
+        yield _compressor.finish()
+
+
+class EMAppCompressionMiddleware(MiddlewareMixin):
+    """
+    Compress the responses (api and html pages) with the content coding negotiated from Accept-Encoding.
+    brotli is preferred over gzip on equal quality values.
+
+        - Responses smaller than RESPONSE_COMPRESSION_MIN_SIZE bytes, already encoded responses and
+          not compressible media types are not compressed.
+        - Streaming responses are compressed chunk by chunk and each chunk is flushed, so the client receives
+          the items as they are produced (e.g. ndjson search results).
+        - Strong ETags are made weak as the bytes on wire are changed.
+
+    Note: Pages containing secrets (e.g. csrf token) along with user input in the body can be subject to
+    BREACH attack. Disable with RESPONSE_COMPRESSION_ENABLED if that applies to the deployment.
+
+    Methods:
+        get_compressors: (classmethod) Available compressors in the preferred order
+        negotiate: (classmethod) Get the compressor for the request Accept-Encoding
+        process_response: Compress the response
+    """
+
+    @classmethod
+    def get_compressors(cls):
+        """
+        :return: dict {content coding: compressor} in the preferred order
+        """
+        compressors = dict()
+        if brotli is not None:
+            compressors[BrotliCompressor.name] = BrotliCompressor()
+        compressors[GzipCompressor.name] = GzipCompressor()
+        return compressors
+
+    @classmethod
+    def negotiate(cls, accept_encoding):
+        """
+        Get the compressor given the Accept-Encoding header value. Codings with q=0 are not accepted.
+
+        :param accept_encoding: str e.g. "gzip, deflate, br" or "br;q=0.5, gzip"
+        :return: compressor or None
+        """
+        if not accept_encoding:
+            return None
+
+        accepted = dict()
+        for _coding in accept_encoding.split(","):
+            _match = _ACCEPT_ENCODING_RE.match(_coding)
+            if not _match:
+                continue
+            try:
+                _quality = float(_match.group(2)) if _match.group(2) else 1.0
+            except ValueError:
+                continue
+            accepted[_match.group(1).lower()] = _quality
+
+        compressor = None
+        _best = 0
+        for name, _compressor in cls.get_compressors().items():
+            _quality = accepted.get(name, accepted.get("*", 0))
+            if _quality > _best:
+                compressor, _best = _compressor, _quality
+        return compressor
+
+    @staticmethod
+    def _is_compressible(response):
+        _content_type = response.get('Content-Type', '').split(";")[0].strip().lower()
+        return _content_type.startswith(_COMPRESSIBLE_TYPES)
+
+    def process_response(self, request, response):
+        if not u.convert_to_bool(config.get('RESPONSE_COMPRESSION_ENABLED', True)):
+            return response
+
+        if response.has_header('Content-Encoding') or not self._is_compressible(response):
+            return response
+        if not response.streaming and len(response.content) < int(config.get('RESPONSE_COMPRESSION_MIN_SIZE', 1024)):
+            return response
+
+        # Response varies on Accept-Encoding even if not compressed for this client
+        patch_vary_headers(response, ('Accept-Encoding', ))
+
+        compressor = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if compressor is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compressor.compress_stream(response.streaming_content)
+            del response['Content-Length']
+        else:
+            compressed_content = compressor.compress(response.content)
+            if len(compressed_content) >= len(response.content):
+                return response
+            response.content = compressed_content
+            response['Content-Length'] = str(len(response.content))
+
+        _etag = response.get('ETag')
+        if _etag and _etag.startswith('"'):
+            response['ETag'] = 'W/' + _etag
+
+        response['Content-Encoding'] = compressor.name
+        return response
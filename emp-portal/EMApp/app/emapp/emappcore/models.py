@@ -0,0 +1,39 @@
+from django.db import models
+from django.contrib.postgres.fields import ArrayField
+from django.utils import timezone
+import logging
+log = logging.getLogger(__name__)
+
+
+class EmailOutbox(models.Model):
+    """
+    Outbound emails. Rows are written in the transaction of the triggering action
+    (see emappcore.utils.mail.queue_email) and sent by the background sender (emappcore.utils.mail.send_outbox).
+    """
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed")
+    )
+
+    subject = models.CharField(max_length=998, blank=False)
+    body = models.TextField(blank=False)
+    to = ArrayField(models.EmailField(max_length=254), default=list)
+    from_email = models.CharField(max_length=254, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name="email_outbox_status")
+        ]
+
+    def __str__(self):
+        return "{} {}".format(self.id, self.status)
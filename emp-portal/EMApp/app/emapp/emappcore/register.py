@@ -1,6 +1,6 @@
 from emappcore.tools import BaseAppCorePluginInterface, BaseAppRoutePluginInterface
-from emappcore.utils import validators as core_validators, utilities as u
-from emappcore.views.api_views import EMAppAPIView
+from emappcore.utils import validators as core_validators, utilities as u, jobs
+from emappcore.views.api_views import EMAppAPIView, EMAppBatchAPIView, EMAppMetricsView
 from emappcore.views.authentication_views import EMAppLoginView, EMAppLogoutView, \
     EMAppPasswordResetView, EMAppPasswordResetDoneView, EMAppPasswordResetConfirmView, \
     EMAppPasswordResetCompleteView, EMAppPasswordChangeView
@@ -37,10 +37,20 @@ class EMAppCorePluginRegister(BaseAppCorePluginInterface, BaseAppRoutePluginInte
             - name: API name (str)
             - func: API function (function)
             - method: API method (GET, PUT, POST, DELETE)
+            - validator_func: (optional) conditional GET validators function (function) - GET only
+            - max_concurrency: (optional) max concurrent requests for the action (int)
+            - cache: (optional) GET result cache policy {tags, ttl, key_func} (dict)
+            - invalidates: (optional) cache tags invalidated by the action (list)
+            - async_ok: (optional) action can be run as a background job with async=1 (boolean)
 
         :param api: EMAppAPIActions class
         :return: None
         """
+        api.register(
+            action_name="job_status",
+            action_func=jobs.job_status,
+            method='GET'
+        )
         return None
 
     def app_utilities(self, utility):
@@ -68,8 +78,10 @@ class EMAppCorePluginRegister(BaseAppCorePluginInterface, BaseAppRoutePluginInte
             "get_country_name": u.get_country_name,
             "prepare_relative_url_query_string": u.prepare_relative_url_query_string,
             "get_all_countries_select_option": u.get_all_countries_select_option,
+            "get_all_countries_options_html": u.get_all_countries_options_html,
             "prepare_error_data": u.prepare_error_data,
             "convert_request_data_to_dict": u.convert_request_data_to_dict,
+            "get_upload_errors": u.get_upload_errors,
             "list_slice": u.list_slice,
             "is_active_url": u.is_active_url
         }
@@ -182,6 +194,17 @@ class EMAppCorePluginRegister(BaseAppCorePluginInterface, BaseAppRoutePluginInte
         :return: None
         """
 
+        # Route for api batch. Should be registered before app_api, otherwise <action_name> matches batch.
+        log.info("Registering api batch route")
+        route.register(
+            url_key="app_api_batch",
+            django_urlconf_value=path(
+                '{}batch'.format(config.get('APPLICATION_API_ENDPOINT')),
+                EMAppBatchAPIView.as_view(),
+                name='app_api_batch'
+            )
+        )
+
         # Route for api
         log.info("Registering api route")
         route.register(
@@ -193,6 +216,16 @@ class EMAppCorePluginRegister(BaseAppCorePluginInterface, BaseAppRoutePluginInte
             )
         )
 
+        # Route for api metrics (prometheus text format)
+        route.register(
+            url_key="app_api_metrics",
+            django_urlconf_value=path(
+                config.get('API_METRICS_ENDPOINT', 'emapp/metrics'),
+                EMAppMetricsView.as_view(),
+                name='app_api_metrics'
+            )
+        )
+
         route.register(
             url_key="admin",
             django_urlconf_value=path('admin/', admin.site.urls)
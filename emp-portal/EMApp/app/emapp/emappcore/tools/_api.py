@@ -1,4 +1,8 @@
 from emappcore.utils import errors as e
+from emappcore.common import model_transaction
+from emappcore.utils.response_cache import api_response_cache
+import functools
+import inspect
 import logging
 log = logging.getLogger(__name__)
 
@@ -37,9 +41,13 @@ class EMAppAPIActions:
 
     Attributes:
         _action_classes: (private) available api methods and its respective classes
+        _action_metadata: (private) additional options given on register for each method and action name
 
     Methods:
         register: To register a new api function
+        unregister: To remove a registered api function
+        has_action: Check if an api action is registered for a method
+        get_action_metadata: Get the options given on register for an api action
     """
     _action_classes = {
         'get': _APIGetActions,
@@ -47,6 +55,7 @@ class EMAppAPIActions:
         'put': _APIPutActions,
         'delete': _APIDeleteActions
     }
+    _action_metadata = {}
 
     def __init__(self):
         pass
@@ -68,14 +77,52 @@ class EMAppAPIActions:
             return False
 
     @classmethod
-    def register(cls, action_name=None, action_func=None, method=None):
+    def has_action(cls, method, action_name):
+        """
+        Check if an api action is registered for the given method
+
+        :param method: str get, put, post and delete
+        :param action_name: str api action name
+        :return: boolean
+        """
+        if not cls._validate_method(method) or not action_name:
+            return False
+        return hasattr(cls._action_classes.get(method.lower()), action_name)
+
+    @classmethod
+    def get_action_metadata(cls, method, action_name):
+        """
+        Get the options given on register for an api action e.g. validator_func
+
+        :param method: str get, put, post and delete
+        :param action_name: str api action name
+        :return: dict (empty dict if not registered)
+        """
+        if not cls._validate_method(method):
+            return {}
+        return cls._action_metadata.get((method.lower(), action_name), {})
+
+    @classmethod
+    def register(cls, action_name=None, action_func=None, method=None, validator_func=None, max_concurrency=None,
+                 cache=None, invalidates=None, async_ok=False):
         """
         Api registration process which is done in register.py api_action method and
         it is a part of BaseAppCorePluginInterface.
 
+        validator_func is only used for GET actions (conditional GET). It is called with the same
+        app_context and data_dict before the action and should be cheap compared to the action.
+        It returns a tuple (tag, last_modified) - tag is any str that changes when the response changes and
+        last_modified is a datetime, either of them can be None. Return None to skip the conditional GET.
+
         :param action_name: str api action name
         :param action_func: func function corresponding to action_name
         :param method: str get, put, post and delete
+        :param validator_func: func (optional) returns ETag/Last-Modified validators for the action
+        :param max_concurrency: int (optional) max number of concurrent requests for the action across all workers
+        :param cache: dict (optional) GET only. Cache policy {tags, ttl, key_func} see emappcore.utils.response_cache
+        :param invalidates: list (optional) cache tags invalidated after the action is successful (on commit)
+        :param async_ok: boolean (optional) action can be run as a background job with async=1
+                         (see emappcore.utils.jobs). Result should be picklable.
         :return: None
         """
         registration_type = "api"
@@ -93,6 +140,14 @@ class EMAppAPIActions:
             raise e.AppPluginError("Api function given - {} is not callable - "
                                    "check registration.py file".format(action_name))
 
+        if validator_func and not callable(validator_func):
+            raise e.AppPluginError("Api validator function given - {} is not callable - "
+                                   "check registration.py file".format(action_name))
+
+        if cache and (method.lower() != "get" or not isinstance(cache, dict) or not cache.get('tags')):
+            raise e.AppPluginError("Api cache policy given - {} should be a dict with tags and only allowed for "
+                                   "GET".format(action_name))
+
         if hasattr(cls, action_name):
             log.warning("Overwriting the existing api action: {}".format(action_name))
         else:
@@ -103,6 +158,30 @@ class EMAppAPIActions:
         except AttributeError:
             raise e.AppPluginError("Given api method not available. Supported api methods - get, post, put and delete")
 
+        cls._action_metadata[(method.lower(), action_name)] = {
+            "validator_func": validator_func,
+            "max_concurrency": max_concurrency,
+            "cache": cache,
+            "invalidates": tuple(invalidates or ()),
+            "async_ok": bool(async_ok)
+        }
+
+    @classmethod
+    def unregister(cls, action_name=None, method=None):
+        """
+        Remove a registered api action and its options e.g. an action registered only for a test.
+
+        :param action_name: str api action name
+        :param method: str get, post, put and delete
+        :return: None
+        """
+        if not cls.has_action(method, action_name):
+            raise e.NotFoundError("API action not found")
+
+        log.info("Removing the api action: {} for method: {}".format(action_name, method))
+        delattr(cls._action_classes.get(method.lower()), action_name)
+        cls._action_metadata.pop((method.lower(), action_name), None)
+
 
 class APIActions(EMAppAPIActions):
     """
@@ -126,7 +205,55 @@ class APIActions(EMAppAPIActions):
         if not hasattr(action_class, action_name):
             raise e.NotFoundError("API action not found")
 
-        return getattr(action_class, action_name)(app_context, data_dict)
+        action_func = getattr(action_class, action_name)
+        metadata, policy = self._get_cache_policy(action_class, action_name, app_context)
+        cache_key, cached, result = api_response_cache.get(action_name, policy, app_context, data_dict)
+        if cached:
+            log.info("Api action result from cache: {}".format(action_name))
+            return result
+
+        result = action_func(app_context, data_dict)
+
+        return self._after_action(cache_key, metadata, policy, result)
+
+    def _get_cache_policy(self, action_class, action_name, app_context):
+        """
+        Get the action metadata and the cache policy. Streamed results are not cached.
+
+        :param action_class: class API action class
+        :param action_name: str Action name
+        :param app_context: dict
+        :return: tuple (metadata dict, cache policy dict or None)
+        """
+        _method = next((k for k, v in self._action_classes.items() if v is action_class), None)
+        metadata = self.get_action_metadata(_method, action_name)
+        if app_context.get('stream'):
+            return metadata, None
+        return metadata, metadata.get('cache')
+
+    @staticmethod
+    def _after_action(cache_key, metadata, policy, result):
+        """
+        Cache the result if the action has cache policy and invalidate the cache tags given in invalidates.
+        Tags are invalidated right away and again once the transaction is committed, so that results cached
+        before the commit are not used.
+
+        :param cache_key: str or None
+        :param metadata: dict
+        :param policy: dict or None
+        :param result: api action result
+        :return: result (generator result is returned as list if cached)
+        """
+        if cache_key:
+            if inspect.isgenerator(result):
+                result = list(result)
+            api_response_cache.set(cache_key, policy, result)
+
+        if metadata.get('invalidates'):
+            api_response_cache.invalidate(metadata['invalidates'])
+            if model_transaction.get_connection().in_atomic_block:
+                model_transaction.on_commit(functools.partial(api_response_cache.invalidate, metadata['invalidates']))
+        return result
 
     def get_actions(self, action_name, app_context, data_dict):
         """
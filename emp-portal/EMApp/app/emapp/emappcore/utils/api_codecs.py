@@ -0,0 +1,154 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from emappcore.utils import errors as err
+from collections import OrderedDict
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+# Optional faster codecs. If not installed stdlib json is used and messagepack is not available.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class BaseCodec:
+    """
+    Base class for api wire format codecs. Responsible to decode the request body and encode the api response.
+
+    Attributes:
+        name: str codec name
+        media_types: tuple of media types (Content-Type/Accept) handled by the codec
+        content_type: str response content type
+
+    Methods:
+        loads: Decode the bytes to python object
+        dumps: Encode the python object to bytes
+    """
+    name = None
+    media_types = ()
+    content_type = None
+
+    def loads(self, data):
+        raise NotImplementedError
+
+    def dumps(self, obj):
+        raise NotImplementedError
+
+
+class JSONCodec(BaseCodec):
+    """
+    Stdlib json codec. Same encoding as django JsonResponse (DjangoJSONEncoder).
+    """
+    name = "json"
+    media_types = ("application/json", )
+    content_type = "application/json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj, cls=DjangoJSONEncoder).encode("utf-8")
+
+
+class FastJSONCodec(JSONCodec):
+    """
+    orjson codec. Dates and datetimes are passed through to DjangoJSONEncoder so the
+    output is same as JSONCodec.
+    """
+    name = "orjson"
+    _default = DjangoJSONEncoder().default
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, default=self._default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+class MessagePackCodec(BaseCodec):
+    """
+    MessagePack codec for bulk integration clients. Types not supported by messagepack (dates, uuid, decimal)
+    are encoded same as json.
+    """
+    name = "msgpack"
+    media_types = ("application/msgpack", "application/x-msgpack")
+    content_type = "application/msgpack"
+    _default = DjangoJSONEncoder().default
+
+    def loads(self, data):
+        return msgpack.unpackb(data, raw=False)
+
+    def dumps(self, obj):
+        return msgpack.packb(obj, default=self._default, use_bin_type=True)
+
+
+class EMAppCodecs:
+    """
+    Registry of the api wire format codecs. Decoder is selected from the request Content-Type and encoder
+    from the Accept header. json is the default codec.
+
+    Methods:
+
+        register: (classmethod) Register a codec for its media types. Overwrites any existing codec.
+        get_decoder: (classmethod) Get the codec for the given Content-Type
+        get_encoder: (classmethod) Get the codec for the given Accept header
+    """
+    _codecs = OrderedDict()
+    _default_media_type = "application/json"
+
+    @classmethod
+    def register(cls, codec=None):
+        """
+        Register a new codec
+
+        :param codec: BaseCodec instance
+        :return: None
+        """
+        if not isinstance(codec, BaseCodec) or not codec.media_types:
+            raise err.AppPluginError("Codec should be an instance of BaseCodec with media_types")
+
+        for media_type in codec.media_types:
+            if media_type in cls._codecs:
+                log.warning("Overwriting the existing codec for: {}".format(media_type))
+            cls._codecs[media_type] = codec
+
+    @staticmethod
+    def _media_type(value):
+        return value.split(";")[0].strip().lower()
+
+    @classmethod
+    def get_decoder(cls, content_type):
+        """
+        Get the codec for the request Content-Type
+
+        :param content_type: str
+        :return: codec or None if not supported
+        """
+        return cls._codecs.get(cls._media_type(content_type or ''))
+
+    @classmethod
+    def get_encoder(cls, accept=None):
+        """
+        Get the codec for the Accept header. First supported media type is selected,
+        if none of the media types are supported default json codec is used.
+
+        :param accept: str
+        :return: codec
+        """
+        for value in (accept or '').split(","):
+            _codec = cls._codecs.get(cls._media_type(value))
+            if _codec:
+                return _codec
+        return cls._codecs[cls._default_media_type]
+
+
+EMAppCodecs.register(FastJSONCodec() if orjson else JSONCodec())
+if msgpack:
+    EMAppCodecs.register(MessagePackCodec())
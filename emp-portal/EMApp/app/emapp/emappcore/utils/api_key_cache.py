@@ -0,0 +1,184 @@
+from django.core.cache import caches
+from emappcore.common import config
+from emappcore.utils import utilities as u
+import collections
+import hashlib
+import hmac
+import threading
+import time
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class APIKeyCache:
+    """
+    Cache of the verified api keys. Verifying an api key (APIKey.objects.get_from_key and is_valid) uses the
+    password hasher and few queries, hence verified keys are cached with the resolved user id, role and superuser
+    flag.
+
+    Entries are keyed by the api key prefix (APIKey.prefix) and contain a sha256 fingerprint of the full key, so the
+    raw key is never stored and the entry can be invalidated with the prefix or the APIKey.id.
+
+    Two levels:
+        - Process local LRU (API_KEY_CACHE_MAX_SIZE entries, API_KEY_CACHE_LOCAL_TTL seconds)
+        - Configured CACHES (API_KEY_CACHE, API_KEY_CACHE_TTL seconds) shared by all the workers
+
+    Note: Invalidation removes the entry from redis and the local LRU of the current process. Other processes
+          can use their local entry until API_KEY_CACHE_LOCAL_TTL.
+
+    Methods:
+
+        get: Get the cached entry for an api key
+        set: Cache the verified api key
+        invalidate: Invalidate the cached entry given an api key, APIKey.id or APIKey.prefix
+    """
+    _key_prefix = "emapp:apikey"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = collections.OrderedDict()
+
+    @property
+    def is_enabled(self):
+        return u.convert_to_bool(config.get('API_KEY_CACHE_ENABLED', True))
+
+    @staticmethod
+    def _get_prefix(key):
+        """
+        Api key and APIKey.id are of the format <prefix>.<secret or hashed key>
+        :param key: str
+        :return: str
+        """
+        return (key or '').partition(".")[0]
+
+    @staticmethod
+    def _fingerprint(key):
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _cache_key(self, prefix):
+        return "{}:{}".format(self._key_prefix, prefix)
+
+    @staticmethod
+    def _get_cache():
+        return caches[config.get('API_KEY_CACHE', 'default')]
+
+    def _get_local(self, prefix):
+        with self._lock:
+            entry = self._local.get(prefix)
+            if not entry:
+                return None
+            if entry[0] <= time.time():
+                del self._local[prefix]
+                return None
+            self._local.move_to_end(prefix)
+            return entry[1]
+
+    def _set_local(self, prefix, value):
+        _max_size = int(config.get('API_KEY_CACHE_MAX_SIZE', 1024))
+        _ttl = int(config.get('API_KEY_CACHE_LOCAL_TTL', 10))
+        with self._lock:
+            self._local[prefix] = (time.time() + _ttl, value)
+            self._local.move_to_end(prefix)
+            while len(self._local) > _max_size:
+                self._local.popitem(last=False)
+
+    def get(self, key):
+        """
+        Get the cached entry for an api key. Errors from the cache are logged and treated as cache miss.
+
+        :param key: str (api key given in the request)
+        :return: dict (user_id, role, is_superuser) or None
+        """
+        prefix = self._get_prefix(key)
+        if not self.is_enabled or not prefix:
+            return None
+
+        value = self._get_local(prefix)
+        if value is None:
+            try:
+                value = self._get_cache().get(self._cache_key(prefix))
+            except Exception as e:
+                log.warning("Not able to get the api key from cache: {}".format(e))
+                value = None
+            if value:
+                self._set_local(prefix, value)
+
+        if not value or not hmac.compare_digest(value['fingerprint'], self._fingerprint(key)):
+            return None
+
+        if value.get('expires') and value['expires'] <= time.time():
+            return None
+
+        return value
+
+    def set(self, key, user_id=None, role=None, is_superuser=False, expiry_date=None):
+        """
+        Cache a verified api key. Entry never outlives the api key expiry date.
+
+        :param key: str (api key given in the request)
+        :param user_id: str
+        :param role: str
+        :param is_superuser: boolean
+        :param expiry_date: datetime (APIKey.expiry_date) or None
+        :return: None
+        """
+        prefix = self._get_prefix(key)
+        if not self.is_enabled or not prefix:
+            return None
+
+        _ttl = int(config.get('API_KEY_CACHE_TTL', 300))
+        _expires = expiry_date.timestamp() if expiry_date else None
+        if _expires:
+            _ttl = min(_ttl, int(_expires - time.time()))
+            if _ttl <= 0:
+                return None
+
+        value = {
+            "fingerprint": self._fingerprint(key),
+            "user_id": user_id,
+            "role": role,
+            "is_superuser": is_superuser,
+            "expires": _expires
+        }
+        try:
+            self._get_cache().set(self._cache_key(prefix), value, _ttl)
+        except Exception as e:
+            log.warning("Not able to cache the api key: {}".format(e))
+        self._set_local(prefix, value)
+        return None
+
+    def invalidate(self, key):
+        """
+        Invalidate the cached entry given an api key, APIKey.id or APIKey.prefix.
+
+        :param key: str
+        :return: None
+        """
+        prefix = self._get_prefix(key)
+        if not prefix:
+            return None
+
+        log.info("Invalidating cached api key: {}".format(prefix))
+        with self._lock:
+            self._local.pop(prefix, None)
+        try:
+            self._get_cache().delete(self._cache_key(prefix))
+        except Exception as e:
+            log.error("Not able to invalidate the cached api key: {}".format(e))
+        return None
+
+
+api_key_cache = APIKeyCache()
+
+
+def invalidate_api_key(sender, instance, **kwargs):
+    """
+    Signal receiver (APIKey post_save and post_delete). Any change in the api key e.g. revoked, deleted or
+    rotated (Employee.generate_api_key, generate_api_key management command) invalidates the cached entry.
+
+    :param sender: APIKey model class
+    :param instance: APIKey instance
+    :return: None
+    """
+    api_key_cache.invalidate(instance.prefix or instance.id)
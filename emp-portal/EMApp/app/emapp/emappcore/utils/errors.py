@@ -57,3 +57,16 @@ class BadRequest(BaseEMAppError):
 
 class InternalServerError(BaseEMAppError):
     pass
+
+
+class Conflict(BaseEMAppError):
+    pass
+
+
+class TooManyRequests(BaseEMAppError):
+    """
+    Rate limit or concurrency limit exceeded. retry_after is the number of seconds the client should wait.
+    """
+    def __init__(self, *args, retry_after=1):
+        super(TooManyRequests, self).__init__(*args)
+        self.retry_after = retry_after
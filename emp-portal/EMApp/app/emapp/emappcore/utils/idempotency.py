@@ -0,0 +1,152 @@
+from django.core.cache import caches
+from emappcore.common import config
+from emappcore.utils import errors as err, utilities as u
+import hashlib
+import json
+import time
+import uuid
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class APIIdempotency:
+    """
+    Idempotency keys for the POST api actions. Client sends the header Idempotency-Key (unique per operation,
+    e.g. uuid) and retries with the same key. Completed responses are stored in the configured CACHES
+    (API_IDEMPOTENCY_CACHE) for API_IDEMPOTENCY_TTL seconds and replayed on a duplicate request.
+
+        - Keys are scoped per verified user (api key or logged in) and api action.
+        - Duplicate of an in flight request waits (API_IDEMPOTENCY_WAIT seconds) for the first request to complete
+          and replays its response, err.Conflict is raised if it does not complete in time.
+        - Reusing a key with different parameters raises err.BadRequest.
+        - Only successful (2xx) responses are stored, failed requests can be retried with the same key.
+
+    If the cache is not available requests are run without idempotency (logged).
+
+    Methods:
+
+        get_fingerprint: (staticmethod) Fingerprint of the request parameters
+        begin: Acquire the key for a request or get the stored response
+        complete: Store the response and release the key
+        abort: Release the key without storing the response
+    """
+    _key_prefix = "emapp:idempotency"
+    _poll_interval = 0.05
+
+    @property
+    def is_enabled(self):
+        return u.convert_to_bool(config.get('API_IDEMPOTENCY_ENABLED', True))
+
+    @staticmethod
+    def _get_cache():
+        return caches[config.get('API_IDEMPOTENCY_CACHE', 'default')]
+
+    def _keys(self, scope):
+        _scope = hashlib.sha1(scope.encode('utf-8')).hexdigest()
+        return "{}:lock:{}".format(self._key_prefix, _scope), "{}:result:{}".format(self._key_prefix, _scope)
+
+    @staticmethod
+    def get_fingerprint(data_dict):
+        """
+        :param data_dict: dict (api parameters)
+        :return: str sha256 hex digest
+        """
+        _value = json.dumps(data_dict, sort_keys=True, default=str)
+        return hashlib.sha256(_value.encode('utf-8')).hexdigest()
+
+    def begin(self, scope, fingerprint):
+        """
+        Acquire the idempotency key for the request. If the key is in use by another request, wait until the
+        response is stored.
+
+        :param scope: str (user id, action name and idempotency key)
+        :param fingerprint: str (from get_fingerprint)
+        :return: tuple (token to complete/abort or None, stored response dict or None)
+        """
+        if not self.is_enabled:
+            return None, None
+
+        _cache = self._get_cache()
+        lock_key, result_key = self._keys(scope)
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + float(config.get('API_IDEMPOTENCY_WAIT', 10))
+
+        while True:
+            try:
+                stored = _cache.get(result_key)
+                if stored is None and _cache.add(lock_key, token, int(config.get('API_IDEMPOTENCY_LOCK_TTL', 60))):
+                    # Request with the same key can be completed between get and add
+                    stored = _cache.get(result_key)
+                    if stored is None:
+                        return token, None
+                    _cache.delete(lock_key)
+            except Exception as e:
+                log.warning("Not able to check the idempotency key: {}".format(e))
+                return None, None
+
+            if stored is not None:
+                if stored['fingerprint'] != fingerprint:
+                    raise err.BadRequest({
+                        "idempotency_key": "Idempotency-Key is already used with different parameters"
+                    })
+                log.info("Replaying the stored response for the idempotency key")
+                return None, stored
+
+            if time.monotonic() >= deadline:
+                raise err.Conflict({
+                    "idempotency_key": "A request with the same Idempotency-Key is in progress. "
+                                       "Retry after some time"
+                })
+            time.sleep(self._poll_interval)
+
+    def _release(self, lock_key, token):
+        _cache = self._get_cache()
+        if _cache.get(lock_key) == token:
+            _cache.delete(lock_key)
+
+    def complete(self, scope, token, fingerprint, status, content_type, content):
+        """
+        Store the response and release the key. Errors are logged and never raised.
+
+        :param scope: str
+        :param token: str (from begin)
+        :param fingerprint: str
+        :param status: int http status
+        :param content_type: str
+        :param content: bytes
+        :return: None
+        """
+        if not token:
+            return None
+        lock_key, result_key = self._keys(scope)
+        try:
+            self._get_cache().set(result_key, {
+                "fingerprint": fingerprint,
+                "status": status,
+                "content_type": content_type,
+                "content": content
+            }, int(config.get('API_IDEMPOTENCY_TTL', 86400)))
+            self._release(lock_key, token)
+        except Exception as e:
+            log.error("Not able to store the response for the idempotency key: {}".format(e))
+        return None
+
+    def abort(self, scope, token):
+        """
+        Release the key without storing the response (e.g. failed request). Errors are logged and never raised.
+
+        :param scope: str
+        :param token: str (from begin)
+        :return: None
+        """
+        if not token:
+            return None
+        try:
+            self._release(self._keys(scope)[0], token)
+        except Exception as e:
+            log.error("Not able to release the idempotency key: {}".format(e))
+        return None
+
+
+api_idempotency = APIIdempotency()
@@ -0,0 +1,225 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections
+from django.utils.functional import SimpleLazyObject
+from emappcore.common import config
+from emappcore.utils import errors as err, utilities as u
+import functools
+import inspect
+import logging
+
+try:
+    import django_rq
+    from rq import get_current_job
+    from rq.exceptions import NoSuchJobError
+    from rq.job import Job
+except ImportError:
+    django_rq = None
+
+log = logging.getLogger(__name__)
+
+
+def _get_user_by_id(user_id):
+    """
+    Get the user of the job
+    :param user_id: str
+    :return: user model instance
+    """
+    return get_user_model().objects.get(pk=user_id)
+
+
+def run_api_job(method, action_name, context, data_dict):
+    """
+    RQ job function to run an api action in the worker. App context is rebuilt from the user id given on enqueue.
+    Errors are stored in the job meta (same error_type and msg as the api error response) and raised,
+    hence the job is failed.
+
+    :param method: str get, put, post and delete
+    :param action_name: str api action name
+    :param context: dict (serializable app context from APIJobs.enqueue)
+    :param data_dict: dict api parameters
+    :return: api action result (generator is returned as list)
+    """
+    from emappcore.tools import api_action
+
+    job = get_current_job()
+    app_context = dict(context)
+    app_context.update({
+        "user": SimpleLazyObject(functools.partial(_get_user_by_id, context['user_id']))
+        if context.get('user_id') else AnonymousUser(),
+        "files": {},
+        "stream": False,
+        "job_id": job.id if job else None
+    })
+
+    close_old_connections()
+    try:
+        log.info("Running api action job: {}".format(action_name))
+        result = api_action._run_action(api_action._action_classes.get(method), action_name, app_context, data_dict)
+        if inspect.isgenerator(result):
+            result = list(result)
+        return result
+    except Exception as e:
+        log.error(e)
+        if job is not None:
+            job.meta['error'] = {
+                "error_type": e.__class__.__name__,
+                "msg": e.args[0] if e.args else "unknown"
+            }
+            job.save_meta()
+        raise
+    finally:
+        close_old_connections()
+
+
+class APIJobs:
+    """
+    Background jobs for the api actions registered with async_ok. Client sends async=1 (query string) and gets
+    the job id back, the action is run by the workers (management command emapp_workers) on the configured
+    RQ_QUEUES (API_JOBS_QUEUE). Job status, progress and result are available with the api action job_status.
+
+        - Jobs are owned by the user who submitted them, other users (except super users) get NotFound.
+        - Results are kept for API_JOBS_RESULT_TTL seconds.
+        - File uploads are not supported.
+
+    Methods:
+
+        enqueue: Enqueue an api action and get the job details
+        get_status: Get the status, progress and result of a job
+        set_progress: (staticmethod) Set the progress of the current job from an api action
+    """
+
+    @property
+    def is_enabled(self):
+        return django_rq is not None and u.convert_to_bool(config.get('API_JOBS_ENABLED', True))
+
+    @staticmethod
+    def _get_queue(name=None):
+        return django_rq.get_queue(name or config.get('API_JOBS_QUEUE', 'low'))
+
+    @staticmethod
+    def _get_owner(app_context):
+        _user = app_context.get('user')
+        if _user is not None and _user.is_authenticated:
+            return str(_user.id)
+        return None
+
+    @staticmethod
+    def _as_dict(job):
+        result = {
+            "job_id": job.id,
+            "action_name": job.meta.get('action_name'),
+            "status": job.get_status(),
+            "progress": job.meta.get('progress'),
+            "enqueued_at": job.enqueued_at.isoformat() if job.enqueued_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "ended_at": job.ended_at.isoformat() if job.ended_at else None
+        }
+        if job.is_finished:
+            result['result'] = job.result
+        if job.is_failed:
+            result['error'] = job.meta.get('error') or {"error_type": "InternalServerError", "msg": "unknown"}
+        return result
+
+    def enqueue(self, method, action_name, app_context, data_dict):
+        """
+        Enqueue the api action to be run by the workers.
+
+        :param method: str get, put, post and delete
+        :param action_name: str api action name
+        :param app_context: dict
+        :param data_dict: dict api parameters
+        :return: dict job details
+        """
+        if not self.is_enabled:
+            raise err.BadRequest({
+                "async": "Background jobs are not enabled"
+            })
+        if app_context.get('files'):
+            raise err.BadRequest({
+                "async": "File uploads are not supported for background jobs"
+            })
+
+        _owner = self._get_owner(app_context)
+        _context = {
+            "api_action": action_name,
+            "type": "job",
+            "user_id": _owner,
+            "is_superuser": app_context.get('is_superuser', False),
+            "role": app_context.get('role', '')
+        }
+        _ttl = int(config.get('API_JOBS_RESULT_TTL', 86400))
+        job = self._get_queue().enqueue_call(
+            run_api_job,
+            args=(method, action_name, _context, data_dict),
+            timeout=int(config.get('API_JOBS_TIMEOUT', 3600)),
+            result_ttl=_ttl,
+            failure_ttl=_ttl,
+            meta={"owner": _owner, "action_name": action_name, "progress": None}
+        )
+        log.info("Enqueued api action job: {} - {}".format(action_name, job.id))
+        return self._as_dict(job)
+
+    def get_status(self, job_id, app_context):
+        """
+        Get the job status. Only the owner of the job or super user can get the job.
+
+        :param job_id: str
+        :param app_context: dict
+        :return: dict job details (result if finished, error if failed)
+        """
+        if not self.is_enabled:
+            raise err.BadRequest({
+                "async": "Background jobs are not enabled"
+            })
+        try:
+            job = Job.fetch(str(job_id), connection=self._get_queue().connection)
+        except NoSuchJobError:
+            job = None
+
+        if job is None or (job.meta.get('owner') != self._get_owner(app_context) and
+                           not app_context.get('is_superuser')):
+            raise err.NotFoundError({
+                "job_id": "Job not found."
+            })
+        return self._as_dict(job)
+
+    @staticmethod
+    def set_progress(app_context, done, total=None):
+        """
+        Set the progress of the current job. Does nothing if the action is not run as a job.
+
+        :param app_context: dict
+        :param done: int
+        :param total: int (optional)
+        :return: None
+        """
+        if not app_context.get('job_id'):
+            return None
+        job = get_current_job()
+        if job is not None:
+            job.meta['progress'] = {"done": done, "total": total}
+            job.save_meta()
+        return None
+
+
+api_jobs = APIJobs()
+
+
+def job_status(app_context, data_dict):
+    """
+    Api action to get the status, progress and the result of a background job (see APIJobs).
+
+    :parameter
+        job_id: str (job id returned for the action requested with async=1)
+
+    :param app_context: dict
+    :param data_dict: dict
+    :return: dict job details
+    """
+    _job_id = data_dict.get('job_id', '')
+    if not _job_id:
+        raise err.ValidationError({
+            "job_id": "job_id parameter is required."
+        })
+    return api_jobs.get_status(_job_id, app_context)
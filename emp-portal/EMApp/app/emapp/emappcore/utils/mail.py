@@ -0,0 +1,240 @@
+from django.core.cache import caches
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from emappcore.common import config, model_transaction
+from emappcore.utils import validators, errors as err, utilities as u
+import datetime
+import logging
+
+try:
+    import django_rq
+except ImportError:
+    django_rq = None
+
+log = logging.getLogger(__name__)
+
+_SCHEDULED_CACHE_KEY = "emapp:mail:outbox:scheduled"
+
+
+def _get_outbox_model():
+    from emappcore.models import EmailOutbox
+    return EmailOutbox
+
+
+def _get_cache():
+    return caches[config.get('EMAIL_OUTBOX_CACHE', 'default')]
+
+
+def queue_emails(messages):
+    """
+    Queue the emails in the outbox (table EmailOutbox). Rows are written in the current transaction, hence the
+    emails are sent only if the triggering action is committed. The background sender is scheduled on commit.
+    Nothing is sent over SMTP in the request.
+
+    :param messages: list of dict {subject, body, to (list of emails), from_email (optional)}
+    :return: list of EmailOutbox model instances
+    """
+    _outbox = list()
+    for _message in messages:
+        _to = _message.get('to') or []
+        if isinstance(_to, str):
+            _to = [_to]
+        if not _message.get('subject') or not _message.get('body'):
+            raise err.ValidationError({
+                "email": "Subject or body is required parameter"
+            })
+        if not _to:
+            raise err.ValidationError({
+                "email": "At least one recipient is required"
+            })
+        for _email in _to:
+            validators.email_validator("to", _email)
+
+        _outbox.append(_get_outbox_model()(
+            subject=_message['subject'],
+            body=_message['body'],
+            to=list(_to),
+            from_email=_message.get('from_email') or ""
+        ))
+
+    if not _outbox:
+        return _outbox
+
+    log.info("Queueing {} emails in the outbox".format(len(_outbox)))
+    _get_outbox_model().objects.bulk_create(_outbox)
+    model_transaction.on_commit(schedule_send)
+    return _outbox
+
+
+def queue_email(subject, body, to, from_email=None):
+    """
+    Queue a single email in the outbox. See queue_emails.
+
+    :param subject: str Email subject
+    :param body: str Email body
+    :param to: list of emails
+    :param from_email: str (optional, default DEFAULT_FROM_EMAIL)
+    :return: EmailOutbox model instance
+    """
+    return queue_emails([{
+        "subject": subject,
+        "body": body,
+        "to": to,
+        "from_email": from_email
+    }])[0]
+
+
+def schedule_send():
+    """
+    Enqueue the background sender (RQ job on EMAIL_OUTBOX_QUEUE). Only one job is enqueued until the job is
+    started, the job drains all the pending emails. If the job cannot be enqueued, the emails are sent by the next
+    run of the management command emapp_send_outbox.
+    :return: None
+    """
+    if django_rq is None or not u.convert_to_bool(config.get('EMAIL_OUTBOX_ASYNC', True)):
+        return None
+
+    try:
+        if not _get_cache().add(_SCHEDULED_CACHE_KEY, 1, int(config.get('EMAIL_OUTBOX_SCHEDULE_TTL', 300))):
+            return None
+    except Exception as e:
+        log.warning("Not able to check the scheduled outbox sender: {}".format(e))
+
+    try:
+        django_rq.get_queue(config.get('EMAIL_OUTBOX_QUEUE', 'low')).enqueue_call(
+            run_send_outbox,
+            timeout=int(config.get('API_JOBS_TIMEOUT', 3600)),
+            result_ttl=0
+        )
+    except Exception as e:
+        log.warning("Not able to schedule the outbox sender: {}".format(e))
+    return None
+
+
+def run_send_outbox():
+    """
+    RQ job function for the background sender.
+    :return: int number of emails sent
+    """
+    try:
+        _get_cache().delete(_SCHEDULED_CACHE_KEY)
+    except Exception as e:
+        log.warning("Not able to clear the scheduled outbox sender: {}".format(e))
+    return send_outbox()
+
+
+def _get_retry_delay(attempts):
+    """
+    Exponential backoff for the failed emails.
+    :param attempts: int attempts so far
+    :return: datetime.timedelta
+    """
+    _delay = int(config.get('EMAIL_OUTBOX_RETRY_DELAY', 60)) * (2 ** max(attempts - 1, 0))
+    return datetime.timedelta(seconds=min(_delay, int(config.get('EMAIL_OUTBOX_MAX_RETRY_DELAY', 3600))))
+
+
+def _set_failed(outbox, error, now):
+    """
+    Set the email for a retry or as failed after EMAIL_OUTBOX_MAX_ATTEMPTS.
+    :param outbox: EmailOutbox model instance
+    :param error: Exception
+    :param now: datetime
+    :return: None
+    """
+    outbox.attempts += 1
+    outbox.last_error = str(error)[:1000]
+    if outbox.attempts >= int(config.get('EMAIL_OUTBOX_MAX_ATTEMPTS', 5)):
+        log.error("Email {} failed after {} attempts: {}".format(outbox.id, outbox.attempts, error))
+        outbox.status = outbox.STATUS_FAILED
+    else:
+        log.warning("Email {} failed, retrying: {}".format(outbox.id, error))
+        outbox.next_attempt_at = now + _get_retry_delay(outbox.attempts)
+    return None
+
+
+def _send_batch(batch_size):
+    """
+    Send a batch of due emails over one connection. Rows are locked (skip locked), hence the senders can run
+    concurrently.
+    :param batch_size: int
+    :return: tuple (claimed, sent)
+    """
+    outbox_model = _get_outbox_model()
+    _sent = 0
+    with model_transaction.atomic():
+        _batch = list(
+            outbox_model.objects.select_for_update(skip_locked=True).filter(
+                status=outbox_model.STATUS_PENDING,
+                next_attempt_at__lte=timezone.now()
+            ).order_by('next_attempt_at')[:batch_size]
+        )
+        if not _batch:
+            return 0, 0
+
+        connection = get_connection(fail_silently=False)
+        try:
+            connection.open()
+        except Exception as e:
+            log.error("Not able to connect to the email server: {}".format(e))
+            _now = timezone.now()
+            for _outbox in _batch:
+                _set_failed(_outbox, e, _now)
+        else:
+            try:
+                for _outbox in _batch:
+                    _message = EmailMessage(_outbox.subject, _outbox.body, from_email=_outbox.from_email or None,
+                                            to=_outbox.to, connection=connection)
+                    try:
+                        _message.send()
+                    except Exception as e:
+                        _set_failed(_outbox, e, timezone.now())
+                        continue
+                    _outbox.attempts += 1
+                    _outbox.status = outbox_model.STATUS_SENT
+                    _outbox.sent_at = timezone.now()
+                    _outbox.last_error = ""
+                    _sent += 1
+            finally:
+                connection.close()
+
+        outbox_model.objects.bulk_update(
+            _batch, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at'])
+    return len(_batch), _sent
+
+
+def send_outbox(batch_size=None):
+    """
+    Background sender. Drains the due emails of the outbox in batches (EMAIL_OUTBOX_BATCH_SIZE), each batch over
+    one email server connection. Failed emails are retried with an exponential backoff
+    (EMAIL_OUTBOX_RETRY_DELAY doubled for each attempt up to EMAIL_OUTBOX_MAX_RETRY_DELAY) and are set as failed
+    after EMAIL_OUTBOX_MAX_ATTEMPTS.
+
+    :param batch_size: int (optional, default EMAIL_OUTBOX_BATCH_SIZE)
+    :return: int number of emails sent
+    """
+    batch_size = batch_size or int(config.get('EMAIL_OUTBOX_BATCH_SIZE', 100))
+    _total = 0
+    while True:
+        _claimed, _sent = _send_batch(batch_size)
+        _total += _sent
+        # Failed emails are due later, stop if nothing could be sent (e.g. email server not available)
+        if _claimed < batch_size or not _sent:
+            break
+    if _total:
+        log.info("Sent {} emails from the outbox".format(_total))
+    return _total
+
+
+def purge_outbox(days=None):
+    """
+    Delete the sent emails older than the given days.
+    :param days: int (optional, default EMAIL_OUTBOX_KEEP_DAYS)
+    :return: int number of emails deleted
+    """
+    outbox_model = _get_outbox_model()
+    days = days if days is not None else int(config.get('EMAIL_OUTBOX_KEEP_DAYS', 7))
+    _deleted, _ = outbox_model.objects.filter(
+        status=outbox_model.STATUS_SENT,
+        sent_at__lt=timezone.now() - datetime.timedelta(days=days)
+    ).delete()
+    return _deleted
@@ -0,0 +1,202 @@
+from emappcore.common import config
+from emappcore.utils import utilities as u
+import collections
+import threading
+import logging
+
+log = logging.getLogger(__name__)
+
+# Latency histogram buckets (upper bounds in seconds)
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _LocalMetricsStore:
+    """
+    Process local metrics store. Used only if redis is not available, hence metrics are
+    per worker process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hashes = collections.defaultdict(lambda: collections.defaultdict(float))
+
+    def increment(self, operations):
+        """
+        :param operations: list of tuple (hash name, field, amount)
+        :return: None
+        """
+        with self._lock:
+            for name, field, amount in operations:
+                self._hashes[name][field] += amount
+
+    def get_all(self, name):
+        """
+        :param name: str hash name
+        :return: dict
+        """
+        with self._lock:
+            return dict(self._hashes[name])
+
+
+class _RedisMetricsStore:
+    """
+    Redis metrics store. All the uwsgi workers share the same counters.
+    """
+
+    def __init__(self, connection):
+        self._connection = connection
+
+    def increment(self, operations):
+        """
+        All the increments are sent in a single pipeline (one round trip).
+
+        :param operations: list of tuple (hash name, field, amount)
+        :return: None
+        """
+        pipeline = self._connection.pipeline(transaction=False)
+        for name, field, amount in operations:
+            if isinstance(amount, float):
+                pipeline.hincrbyfloat(name, field, amount)
+            else:
+                pipeline.hincrby(name, field, amount)
+        pipeline.execute()
+
+    def get_all(self, name):
+        """
+        :param name: str hash name
+        :return: dict
+        """
+        return {
+            k.decode() if isinstance(k, bytes) else k: float(v)
+            for k, v in self._connection.hgetall(name).items()
+        }
+
+
+class APIMetrics:
+    """
+    Per api action and method metrics. Keeps request counters, error counts by error_type and latency histograms.
+    Metrics are aggregated in redis (configured CACHES - API_METRICS_CACHE) so that all the worker processes
+    share the same metrics. If redis is not available metrics are kept per process.
+
+    Methods:
+
+        observe: Record a single api call
+        collect: Get all the recorded metrics
+        render_prometheus: Get all the recorded metrics as prometheus text format
+    """
+    _key_prefix = "emapp:metrics"
+    _separator = "|"
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self._buckets = tuple(sorted(buckets))
+        self._store = None
+
+    @property
+    def is_enabled(self):
+        return u.convert_to_bool(config.get('API_METRICS_ENABLED', True))
+
+    def _get_store(self):
+        """
+        Get redis store if available else process local store.
+        :return: store instance
+        """
+        if self._store is None:
+            try:
+                from django_redis import get_redis_connection
+                self._store = _RedisMetricsStore(get_redis_connection(config.get('API_METRICS_CACHE', 'default')))
+            except Exception as e:
+                log.warning("Redis not available for api metrics, using process local metrics: {}".format(e))
+                self._store = _LocalMetricsStore()
+        return self._store
+
+    def _key(self, name):
+        return "{}:{}".format(self._key_prefix, name)
+
+    def observe(self, method, action_name, duration, error_type=None):
+        """
+        Record a single api call. Errors while recording are logged and never raised.
+
+        :param method: str (get, post, put, delete)
+        :param action_name: str
+        :param duration: float (seconds)
+        :param error_type: str error class name if the api call failed
+        :return: None
+        """
+        if not self.is_enabled:
+            return None
+
+        _label = self._separator.join((method, action_name))
+        _bucket = next((str(b) for b in self._buckets if duration <= b), "+Inf")
+        operations = [
+            (self._key("requests"), _label, 1),
+            (self._key("latency_sum"), _label, float(duration)),
+            (self._key("latency_bucket"), self._separator.join((_label, _bucket)), 1)
+        ]
+        if error_type:
+            operations.append((self._key("errors"), self._separator.join((_label, error_type)), 1))
+
+        try:
+            self._get_store().increment(operations)
+        except Exception as e:
+            log.error("Not able to record api metrics: {}".format(e))
+
+        return None
+
+    def collect(self):
+        """
+        Get all the recorded metrics.
+
+        :return: dict (requests, errors, latency_sum, latency_bucket) of dict
+        """
+        _store = self._get_store()
+        return {
+            name: {tuple(k.split(self._separator)): v for k, v in _store.get_all(self._key(name)).items()}
+            for name in ("requests", "errors", "latency_sum", "latency_bucket")
+        }
+
+    @staticmethod
+    def _labels(method, action_name, **extra):
+        _labels = [("action", action_name), ("method", method)] + sorted(extra.items())
+        return ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in _labels)
+
+    def render_prometheus(self):
+        """
+        Get all the recorded metrics as prometheus text exposition format.
+
+        :return: str
+        """
+        metrics = self.collect()
+        lines = [
+            "# HELP emapp_api_requests_total Total api requests by action and method.",
+            "# TYPE emapp_api_requests_total counter"
+        ]
+        for (method, action_name), value in sorted(metrics['requests'].items()):
+            lines.append("emapp_api_requests_total{{{}}} {}".format(self._labels(method, action_name), int(value)))
+
+        lines += [
+            "# HELP emapp_api_errors_total Total api errors by action, method and error type.",
+            "# TYPE emapp_api_errors_total counter"
+        ]
+        for (method, action_name, error_type), value in sorted(metrics['errors'].items()):
+            lines.append("emapp_api_errors_total{{{}}} {}".format(
+                self._labels(method, action_name, error_type=error_type), int(value)))
+
+        lines += [
+            "# HELP emapp_api_request_duration_seconds Api request latency by action and method.",
+            "# TYPE emapp_api_request_duration_seconds histogram"
+        ]
+        for (method, action_name), count in sorted(metrics['requests'].items()):
+            cumulative = 0
+            for _bucket in [str(b) for b in self._buckets] + ["+Inf"]:
+                cumulative += int(metrics['latency_bucket'].get((method, action_name, _bucket), 0))
+                lines.append("emapp_api_request_duration_seconds_bucket{{{}}} {}".format(
+                    self._labels(method, action_name, le=_bucket), cumulative))
+            lines.append("emapp_api_request_duration_seconds_sum{{{}}} {}".format(
+                self._labels(method, action_name), metrics['latency_sum'].get((method, action_name), 0.0)))
+            lines.append("emapp_api_request_duration_seconds_count{{{}}} {}".format(
+                self._labels(method, action_name), int(count)))
+
+        return "\n".join(lines) + "\n"
+
+
+api_metrics = APIMetrics()
@@ -1,4 +1,6 @@
 from emappcore.utils import errors as err
+from django.db import connections, router
+from django.db.models import deletion
 import datetime
 import json
 import logging
@@ -44,19 +46,34 @@ def create_extras_table_values(extras_model=None, connecting_key=None,
     return model_extra
 
 
-def model_dictize(db_models=None, db_extras=None, schema=None):
+def _index_extras(rows):
     """
-    This will extract all the necessary information for the connected db models.
+    Index the extras rows by key with the values decoded once (first row of a key is used).
+    :param rows: iterable of (key, value)
+    :return: dict
+    """
+    result = dict()
+    for key, value in rows:
+        if key in result:
+            continue
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                pass
+        result[key] = value
+    return result
 
-    Note: Extras tables are stored as key value pair and all the data is string/json.
 
-    :param db_models: tuple (items is of type django model instance)
-    :param db_extras: tuple (items is of type django model instance)
-    :param schema: dict
+def _dictize(db_models, extras, properties):
+    """
+    :param db_models: tuple of model instances
+    :param extras: dict (see _index_extras)
+    :param properties: list
     :return: dict
     """
     result_dict = dict()
-    for _property in schema['properties']:
+    for _property in properties:
         # Main models
         for _model in db_models:
             if hasattr(_model, _property):
@@ -69,18 +86,54 @@ def model_dictize(db_models=None, db_extras=None, schema=None):
                 break
 
         # This is for extra tables.
-        for _extra in db_extras:
-            for row in _extra:
-                if row and row.key == _property:
-                    if isinstance(row.value, str):
-                        try:
-                            result_dict[_property] = json.loads(row.value)
-                        except ValueError:
-                            result_dict[_property] = row.value
-                    break
+        if _property in extras:
+            result_dict[_property] = extras[_property]
     return result_dict
 
 
+def model_dictize(db_models=None, db_extras=None, schema=None):
+    """
+    This will extract all the necessary information for the connected db models.
+
+    Note: Extras tables are stored as key value pair and all the data is string/json.
+
+    :param db_models: tuple (items is of type django model instance)
+    :param db_extras: tuple (items is of type django model instance)
+    :param schema: dict or EMAppSchema (only properties are used)
+    :return: dict
+    """
+    _extras = _index_extras((row.key, row.value) for _extra in db_extras for row in _extra if row)
+    return _dictize(db_models, _extras, schema['properties'])
+
+
+def model_dictize_many(db_models=None, schema=None, extras_model=None, connecting_key=None):
+    """
+    Same as model_dictize for a list of model instances (e.g. list views, exports). Extras of all the
+    instances are fetched with a single query (connecting_key__in) and indexed by key for each instance,
+    instead of a query for each instance.
+
+    :param db_models: queryset or list of model instances
+    :param schema: dict or EMAppSchema (only properties are used)
+    :param extras_model: model class (optional, extras are not fetched if not given)
+    :param connecting_key: str (foreign key of the extras model to the model)
+    :return: list of dict (same order as db_models)
+    """
+    db_models = list(db_models)
+    _properties = list(schema['properties'])
+    _rows = dict()
+    if db_models and extras_model is not None:
+        _extras = extras_model.objects.filter(
+            **{"{}__in".format(connecting_key): [_model.pk for _model in db_models]}
+        ).order_by('pk').values_list(connecting_key, 'key', 'value')
+        for _pk, key, value in _extras:
+            _rows.setdefault(_pk, []).append((key, value))
+
+    return [
+        _dictize((_model, ), _index_extras(_rows.get(_model.pk, ())), _properties)
+        for _model in db_models
+    ]
+
+
 def clean_data_dict_for_api_calls(data_dict, params_to_delete=None):
     """
     Removed the keys from data dict given parameter. Internal use only
@@ -102,3 +155,141 @@ def clean_data_dict_for_api_calls(data_dict, params_to_delete=None):
         except KeyError:
             pass
     return data_dict
+
+
+def _get_reverse_relations(model):
+    """
+    Reverse one to one and foreign key relations to the model (including auto created m2m through tables),
+    same relations as django deletion collector. Relations to the parent models (multi table inheritance)
+    are not included.
+    :param model: model class
+    :return: list
+    """
+    return [
+        _f for _f in model._meta.get_fields(include_parents=False, include_hidden=True)
+        if _f.auto_created and not _f.concrete and (_f.one_to_one or _f.one_to_many)
+    ]
+
+
+def delete_cascade(model, pks):
+    """
+    Delete the rows of the model for the given primary keys and cascade to the related tables with set based
+    queries (DELETE/UPDATE ... WHERE fk IN (...)), children first. Only primary keys of the related tables
+    with further relations are loaded, rows are never loaded into python. QuerySet.delete loads all the related
+    rows if signal receivers are connected to all the models (e.g. elastic search auto sync).
+
+    Note: Model delete methods and signals are not called, the caller should handle the side effects
+    (search index, files, caches). Should be called inside a transaction.
+
+        - CASCADE: related rows are deleted (recursively)
+        - SET_NULL: related rows are updated
+        - PROTECT: raises err.ValidationError if any related row
+        - DO_NOTHING: skipped
+        - Parent tables (multi table inheritance) are deleted after the model
+
+    :param model: model class
+    :param pks: list of primary keys
+    :return: int number of deleted rows of the model
+    """
+    if not pks:
+        return 0
+
+    for _relation in _get_reverse_relations(model):
+        _field = _relation.field
+        _on_delete = _field.remote_field.on_delete
+        _related_model = _relation.related_model
+        _related = _related_model._base_manager.filter(**{"{}__in".format(_field.name): pks}).order_by()
+
+        if _on_delete is deletion.CASCADE:
+            if _get_reverse_relations(_related_model) or _related_model._meta.parents:
+                delete_cascade(_related_model, list(_related.values_list('pk', flat=True)))
+            else:
+                _related._raw_delete(_related.db)
+        elif _on_delete is deletion.SET_NULL:
+            _related.update(**{_field.name: None})
+        elif _on_delete is deletion.PROTECT:
+            if _related.exists():
+                raise err.ValidationError({
+                    _related_model._meta.model_name: "Cannot delete, referenced by {}".format(
+                        _related_model._meta.verbose_name_plural)
+                })
+        elif _on_delete is not deletion.DO_NOTHING:
+            raise err.NotSupported({
+                _related_model._meta.model_name: "on_delete not supported for set based delete"
+            })
+
+    log.info("Deleting {} rows from {}".format(len(pks), model._meta.db_table))
+    _queryset = model._base_manager.filter(pk__in=pks)
+    # Raw delete runs a single DELETE query without collecting the rows
+    count = _queryset._raw_delete(_queryset.db)
+
+    for _parent in model._meta.parents:
+        delete_cascade(_parent, pks)
+    return count
+
+
+def _insert_rows(model, objs, using):
+    """
+    Insert the columns of the model table (local fields only, not the parent tables) for the given instances
+    with a single INSERT ... VALUES query. Values are prepared same as QuerySet.bulk_create (pre_save and
+    get_db_prep_save).
+
+    :param model: model class
+    :param objs: list of model instances
+    :param using: str database alias
+    :return: None
+    """
+    connection = connections[using]
+    _fields = model._meta.local_concrete_fields
+    _rows = []
+    _params = []
+    for obj in objs:
+        _placeholders = []
+        for _field in _fields:
+            _value = _field.get_db_prep_save(_field.pre_save(obj, True), connection)
+            # Some fields need a cast in the query e.g. ArrayField
+            _placeholders.append(
+                _field.get_placeholder(_value, None, connection) if hasattr(_field, "get_placeholder") else "%s")
+            _params.append(_value)
+        _rows.append("({})".format(", ".join(_placeholders)))
+
+    _qn = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES {}".format(
+        _qn(model._meta.db_table), ", ".join(_qn(_field.column) for _field in _fields), ", ".join(_rows))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, _params)
+
+
+def bulk_create_multi_table(model, objs):
+    """
+    Insert many instances of a multi table inherited model (e.g. Employee -> BaseProfile). QuerySet.bulk_create
+    does not support these models. Rows are inserted table by table starting from the root parent, one query per
+    table, and the parent links (e.g. baseprofile_ptr) are set from the parent primary key.
+
+    Note: Primary key of the root parent should be set before the insert (e.g. default uuid), auto increment keys
+    are not supported. Model save methods and signals are not called. Should be called inside a transaction.
+
+    :param model: model class
+    :param objs: list of model instances (not saved)
+    :return: list of model instances
+    """
+    if not objs:
+        return objs
+
+    using = router.db_for_write(model)
+    for _model in list(reversed(model._meta.get_parent_list())) + [model]:
+        for _parent, _link in _model._meta.parents.items():
+            for obj in objs:
+                setattr(obj, _link.attname, getattr(obj, _parent._meta.pk.attname))
+
+        if any(getattr(obj, _model._meta.pk.attname) is None for obj in objs):
+            raise err.NotSupported({
+                _model._meta.model_name: "Primary key should be set before the insert"
+            })
+        log.info("Inserting {} rows into {}".format(len(objs), _model._meta.db_table))
+        _insert_rows(_model, objs, using)
+
+    for obj in objs:
+        obj._state.adding = False
+        obj._state.db = using
+    return objs
@@ -0,0 +1,198 @@
+from emappcore.common import config
+from emappcore.utils import errors as err, utilities as u
+import math
+import time
+import uuid
+import logging
+
+log = logging.getLogger(__name__)
+
+# Token bucket. Refill the bucket for the elapsed time and take the cost if available.
+# KEYS[1] bucket key. ARGV: rate (tokens per second), burst (bucket size), now (seconds), cost
+# Returns {allowed (1 or 0), retry after in seconds (str)}
+_TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HMSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+# Concurrency slots. In flight requests are kept in a sorted set by start time, stale entries
+# (e.g. worker killed before releasing) are removed first.
+# KEYS[1] slots key. ARGV: limit, now, stale before, slot id, key ttl
+# Returns 1 if acquired else 0
+_ACQUIRE_SLOT_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[3])
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], ARGV[2], ARGV[4])
+    redis.call('EXPIRE', KEYS[1], ARGV[5])
+    return 1
+end
+return 0
+"""
+
+
+class APIAdmissionControl:
+    """
+    Rate limiting and concurrency limits for the api backed by redis (configured CACHES - API_RATE_LIMIT_CACHE),
+    so that the limits are shared by all the worker processes.
+
+        - Token bucket per remote address and action class (read - GET, write - others), checked before
+          the api key is verified. Configured with API_IP_RATE_LIMITS {read: {rate, burst}, write: {rate, burst}},
+          rate is tokens per second.
+        - Token bucket per verified user (of the api key or session) and action class.
+          Configured with API_RATE_LIMITS, same as API_IP_RATE_LIMITS.
+        - Concurrency limit per api action. Registered with api.register(max_concurrency=) and can be
+          overwritten with API_MAX_CONCURRENCY {action_name: limit}.
+
+    Exceeding any of the limits raises err.TooManyRequests with retry_after. If redis is not available
+    requests are allowed (logged).
+
+    Methods:
+
+        get_action_class: (staticmethod) Get the action class (read or write) for a request method
+        check_rate: Take a token from the client bucket for the action class
+        acquire: Acquire a concurrency slot for an api action
+        release: Release the concurrency slot
+    """
+    _key_prefix = "emapp:ratelimit"
+
+    def __init__(self):
+        self._connection = None
+        self._scripts = None
+
+    @property
+    def is_enabled(self):
+        return u.convert_to_bool(config.get('API_RATE_LIMIT_ENABLED', True))
+
+    def _get_scripts(self):
+        """
+        Redis lua scripts. Registered on first use.
+        :return: tuple (token bucket script, acquire slot script)
+        """
+        if self._scripts is None:
+            from django_redis import get_redis_connection
+            self._connection = get_redis_connection(config.get('API_RATE_LIMIT_CACHE', 'default'))
+            self._scripts = (
+                self._connection.register_script(_TOKEN_BUCKET_SCRIPT),
+                self._connection.register_script(_ACQUIRE_SLOT_SCRIPT)
+            )
+        return self._scripts
+
+    def _key(self, *args):
+        return ":".join((self._key_prefix, ) + args)
+
+    @staticmethod
+    def get_action_class(method):
+        """
+        :param method: str get, post, put and delete
+        :return: str read or write
+        """
+        return "read" if (method or '').lower() == "get" else "write"
+
+    def check_rate(self, identity, method, cost=1, config_key='API_RATE_LIMITS'):
+        """
+        Take tokens from the bucket of the client for the action class.
+
+        :param identity: str (client identity e.g. verified user id or remote address)
+        :param method: str request method
+        :param cost: int number of tokens
+        :param config_key: str config of the limits (API_RATE_LIMITS or API_IP_RATE_LIMITS)
+        :return: None (raises err.TooManyRequests)
+        """
+        if not self.is_enabled:
+            return None
+
+        action_class = self.get_action_class(method)
+        _limit = config.get(config_key, {}).get(action_class)
+        if not _limit:
+            return None
+
+        try:
+            allowed, retry_after = self._get_scripts()[0](
+                keys=[self._key("bucket", action_class, identity)],
+                args=[float(_limit['rate']), float(_limit['burst']), time.time(), cost]
+            )
+        except Exception as e:
+            log.warning("Not able to check the api rate limit: {}".format(e))
+            return None
+
+        if not int(allowed):
+            raise err.TooManyRequests({
+                "rate_limit": "Too many {} requests. Retry after some time".format(action_class)
+            }, retry_after=max(1, int(math.ceil(float(retry_after)))))
+        return None
+
+    @staticmethod
+    def _get_max_concurrency(action_metadata, action_name):
+        _limit = config.get('API_MAX_CONCURRENCY', {}).get(action_name, action_metadata.get('max_concurrency'))
+        return int(_limit) if _limit else None
+
+    def acquire(self, action_name, action_metadata):
+        """
+        Acquire a concurrency slot for the api action if the action has a concurrency limit.
+
+        :param action_name: str
+        :param action_metadata: dict (metadata given on api register)
+        :return: str slot id or None if the action is not limited (raises err.TooManyRequests)
+        """
+        _limit = self._get_max_concurrency(action_metadata, action_name)
+        if not self.is_enabled or not _limit:
+            return None
+
+        slot = uuid.uuid4().hex
+        now = time.time()
+        _timeout = int(config.get('API_CONCURRENCY_TIMEOUT', 60))
+        try:
+            acquired = self._get_scripts()[1](
+                keys=[self._key("slots", action_name)],
+                args=[_limit, now, now - _timeout, slot, _timeout]
+            )
+        except Exception as e:
+            log.warning("Not able to check the api concurrency limit: {}".format(e))
+            return None
+
+        if not int(acquired):
+            raise err.TooManyRequests({
+                "concurrency": "Too many concurrent requests for {}. Retry after some time".format(action_name)
+            }, retry_after=1)
+        return slot
+
+    def release(self, action_name, slot):
+        """
+        Release the concurrency slot. Errors are logged and never raised.
+
+        :param action_name: str
+        :param slot: str (slot id from acquire)
+        :return: None
+        """
+        if not slot:
+            return None
+        try:
+            self._get_scripts()
+            self._connection.zrem(self._key("slots", action_name), slot)
+        except Exception as e:
+            log.error("Not able to release the api concurrency slot: {}".format(e))
+        return None
+
+
+api_admission = APIAdmissionControl()
@@ -0,0 +1,94 @@
+from markupsafe import Markup, escape
+import functools
+import threading
+import types
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class CountryReferenceData:
+    """
+    Countries (ISO 3166) lookup tables for the validators, utilities and the form/display snippets. Tables are
+    built once from pycountry on the first use (pycountry is not imported on start up) and are read only.
+
+        - names: alpha 2 code (upper case) to country name
+        - codes: set of the valid alpha 2 codes
+        - options: select options [{value, text}] in the order of pycountry
+        - options html: <option> tags prerendered for each selected code
+
+    Same table is used for the nationality codes.
+
+    Methods:
+
+        get_name: Get the country name given alpha 2 code
+        is_valid: Check the alpha 2 code
+        get_options: Get the select options
+        get_options_html: Get the prerendered <option> tags with the given code selected
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tables = None
+
+    def _build(self):
+        """
+        Build the lookup tables from pycountry
+        :return: tuple (names, codes, options)
+        """
+        import pycountry
+
+        log.info("Building the country reference data")
+        _countries = [(_country.alpha_2.upper(), _country.name) for _country in pycountry.countries]
+        names = types.MappingProxyType(dict(_countries))
+        codes = frozenset(names)
+        options = tuple(types.MappingProxyType({"value": _code, "text": _name}) for _code, _name in _countries)
+        return names, codes, options
+
+    def _get_tables(self):
+        if self._tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self._tables = self._build()
+        return self._tables
+
+    @staticmethod
+    def _normalize(code):
+        return code.upper() if isinstance(code, str) else None
+
+    def get_name(self, code):
+        """
+        :param code: str alpha 2 code (case insensitive)
+        :return: str country name or "" if not valid
+        """
+        return self._get_tables()[0].get(self._normalize(code), "")
+
+    def is_valid(self, code):
+        """
+        :param code: str alpha 2 code (case insensitive)
+        :return: boolean
+        """
+        return self._normalize(code) in self._get_tables()[1]
+
+    def get_options(self):
+        """
+        :return: tuple of read only {value, text}
+        """
+        return self._get_tables()[2]
+
+    @functools.lru_cache(maxsize=512)
+    def get_options_html(self, selected=""):
+        """
+        Prerendered <option> tags of all the countries, cached for each selected code.
+        :param selected: str alpha 2 code
+        :return: Markup
+        """
+        selected = self._normalize(selected) or ""
+        return Markup("".join(
+            '<option value="{}"{}>{}</option>'.format(
+                escape(_option["value"]), " selected" if _option["value"] == selected else "", escape(_option["text"]))
+            for _option in self.get_options()
+        ))
+
+
+countries = CountryReferenceData()
@@ -0,0 +1,139 @@
+from django.core.cache import caches
+from emappcore.common import config
+from emappcore.utils import utilities as u
+import hashlib
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class APIResponseCache:
+    """
+    Result cache for the GET api actions registered with a cache policy. Results are stored in the configured
+    CACHES (API_RESPONSE_CACHE).
+
+    Cache policy is given on api register:
+
+        api.register(..., method='GET', cache={"tags": ["employee"], "ttl": 300, "key_func": func})
+        api.register(..., method='POST', invalidates=["employee"])
+
+        - tags: list of tags, entries are invalidated if any of the tags is invalidated
+        - ttl: (optional) seconds, default API_RESPONSE_CACHE_TTL
+        - key_func: (optional) func(app_context, data_dict) returns str, added to the cache key if the result
+                    depends on more than the action name, parameters and the user role (e.g. logged in user)
+
+    Cache key contains the action name, parameters (data_dict), user role and the current version of each tag.
+    Invalidating a tag increments its version, hence all the entries of the tag are not used anymore and expire
+    with ttl.
+
+    Methods:
+
+        get: Get the cached result
+        set: Cache the result
+        invalidate: Invalidate the given tags
+    """
+    _key_prefix = "emapp:apicache"
+    _missing = object()
+
+    @property
+    def is_enabled(self):
+        return u.convert_to_bool(config.get('API_RESPONSE_CACHE_ENABLED', True))
+
+    @staticmethod
+    def _get_cache():
+        return caches[config.get('API_RESPONSE_CACHE', 'default')]
+
+    def _tag_key(self, tag):
+        return "{}:tag:{}".format(self._key_prefix, tag)
+
+    def _get_tag_versions(self, tags):
+        _keys = [self._tag_key(tag) for tag in tags]
+        _versions = self._get_cache().get_many(_keys)
+        return [_versions.get(key, 0) for key in _keys]
+
+    @staticmethod
+    def _get_viewer(app_context):
+        """
+        Role of the user. Anonymous users and logged in users without role are not same.
+        :param app_context: dict
+        :return: str
+        """
+        _role = app_context.get('role', '')
+        if _role:
+            return "{}:{}".format(_role, app_context.get('is_superuser', False))
+        _user = app_context.get('user')
+        return "user" if _user is not None and _user.is_authenticated else "anonymous"
+
+    def _cache_key(self, action_name, policy, app_context, data_dict):
+        _key_func = policy.get('key_func')
+        _value = json.dumps([
+            action_name,
+            data_dict,
+            self._get_viewer(app_context),
+            _key_func(app_context, data_dict) if _key_func else None,
+            self._get_tag_versions(policy.get('tags', ()))
+        ], sort_keys=True, default=str)
+        return "{}:{}:{}".format(self._key_prefix, action_name, hashlib.sha1(_value.encode('utf-8')).hexdigest())
+
+    def get(self, action_name, policy, app_context, data_dict):
+        """
+        Get the cached result. Errors from the cache are logged and treated as cache miss.
+
+        :param action_name: str
+        :param policy: dict (cache policy given on register)
+        :param app_context: dict
+        :param data_dict: dict
+        :return: tuple (cache key, boolean - True if cached, result)
+        """
+        if not self.is_enabled or not policy:
+            return None, False, None
+        try:
+            key = self._cache_key(action_name, policy, app_context, data_dict)
+            result = self._get_cache().get(key, self._missing)
+        except Exception as e:
+            log.warning("Not able to get the api result from cache: {}".format(e))
+            return None, False, None
+
+        if result is self._missing:
+            return key, False, None
+        return key, True, result
+
+    def set(self, key, policy, result):
+        """
+        Cache the result with the key from get.
+
+        :param key: str
+        :param policy: dict (cache policy given on register)
+        :param result: api action result
+        :return: None
+        """
+        if not key:
+            return None
+        try:
+            self._get_cache().set(key, result, int(policy.get('ttl') or config.get('API_RESPONSE_CACHE_TTL', 300)))
+        except Exception as e:
+            log.warning("Not able to cache the api result: {}".format(e))
+        return None
+
+    def invalidate(self, tags):
+        """
+        Invalidate all the cached results of the given tags.
+
+        :param tags: list of str
+        :return: None
+        """
+        if not tags:
+            return None
+        _cache = self._get_cache()
+        for tag in tags:
+            log.info("Invalidating api cache tag: {}".format(tag))
+            try:
+                _cache.add(self._tag_key(tag), 0, None)
+                _cache.incr(self._tag_key(tag))
+            except Exception as e:
+                log.error("Not able to invalidate the api cache tag {}: {}".format(tag, e))
+        return None
+
+
+api_response_cache = APIResponseCache()
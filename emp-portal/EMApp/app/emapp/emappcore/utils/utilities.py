@@ -1,9 +1,9 @@
 from emappcore.common import config
+from emappcore.utils.reference_data import countries
 from urllib.parse import urlparse
 from pathlib import PurePosixPath
 import pyfiglet
 import random
-import pycountry
 import logging
 log = logging.getLogger(__name__)
 
@@ -100,24 +100,24 @@ def get_country_name(country_code):
     if not country_code:
         return ""
 
-    try:
-        country = pycountry.countries.get(alpha_2=country_code)
-        if not country:
-            return ""
-        return country.name
-    except Exception as e:
-        log.error(e)
-        return ""
+    return countries.get_name(country_code)
 
 
 def get_all_countries_select_option():
     """
-
-    :return:
+    Select options of all the countries (read only, see emappcore.utils.reference_data)
+    :return: tuple of {value, text}
     """
-    options = [{"value": x.alpha_2, "text": x.name} for x in list(pycountry.countries)]
+    return countries.get_options()
+
 
-    return options
+def get_all_countries_options_html(selected=""):
+    """
+    Prerendered <option> tags of all the countries (see emappcore.utils.reference_data)
+    :param selected: str country code
+    :return: Markup
+    """
+    return countries.get_options_html(selected or "")
 
 
 def prepare_relative_url_query_string(request, param_to_add):
@@ -184,6 +184,25 @@ def convert_request_data_to_dict(requests_query_dict):
     return data_dict
 
 
+def get_upload_errors(request):
+    """
+    Parse the form data and files of the request and get the errors of the upload handlers. Upload handlers
+    stop an invalid upload with django StopUpload and set the errors in upload_errors (dict)
+    e.g. emappext.hr_mgmt.utils.upload_handlers.AvatarUploadHandler
+    :param request: django request object
+    :return: dict (errors) empty if no errors
+    """
+    _content_type = request.META.get('CONTENT_TYPE', '') or request.META.get('content_type', '')
+    if "multipart/form-data" not in _content_type:
+        return dict()
+
+    request.FILES
+    errors = dict()
+    for handler in request.upload_handlers:
+        errors.update(getattr(handler, "upload_errors", None) or dict())
+    return errors
+
+
 def list_slice(ls, from_indx, to_index):
     """
     Slice the given list between from and to value
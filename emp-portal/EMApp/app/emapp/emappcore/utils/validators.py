@@ -1,28 +1,105 @@
+from django.core.cache import caches
+from emappcore.common import config
 from emappcore.utils import errors as err
-from email_validator import validate_email, EmailNotValidError
-import pycountry
+from emappcore.utils.reference_data import countries
+from email_validator import validate_email, validate_email_deliverability, EmailNotValidError, \
+    EmailUndeliverableError
 import validators as py_validators
 from datetime import datetime
 import logging
 
 log = logging.getLogger(__name__)
 
+EMAIL_VALIDATION_MODES = ("syntax", "deliverability", "allowlist")
+
+
+def _is_domain_deliverable(domain):
+    """
+    DNS deliverability check (MX, A or AAAA record) of the email domain, cached per domain in
+    EMAIL_VALIDATION_CACHE for EMAIL_VALIDATION_DNS_TTL seconds (undeliverable for
+    EMAIL_VALIDATION_DNS_NEGATIVE_TTL seconds). Timeouts are not failures and are not cached. Cache errors are
+    logged and the domain is looked up.
+
+    :param domain: str (ascii domain)
+    :return: boolean
+    """
+    _key = "emapp:email:domain:{}".format(domain)
+    _cache = caches[config.get('EMAIL_VALIDATION_CACHE', 'default')]
+    try:
+        _cached = _cache.get(_key)
+    except Exception as e:
+        log.warning("Not able to get the email domain from cache: {}".format(e))
+        _cached = None
+    if _cached is not None:
+        return _cached
+
+    try:
+        result = validate_email_deliverability(domain, domain,
+                                               timeout=int(config.get('EMAIL_VALIDATION_DNS_TIMEOUT', 5)))
+    except EmailUndeliverableError as e:
+        log.info(e)
+        _deliverable, _ttl = False, int(config.get('EMAIL_VALIDATION_DNS_NEGATIVE_TTL', 300))
+    else:
+        if result.get("unknown-deliverability"):
+            return True
+        _deliverable, _ttl = True, int(config.get('EMAIL_VALIDATION_DNS_TTL', 86400))
+
+    try:
+        _cache.set(_key, _deliverable, _ttl)
+    except Exception as e:
+        log.warning("Not able to cache the email domain: {}".format(e))
+    return _deliverable
+
+
+def _is_domain_allowed(domain):
+    """
+    Domain or its sub domains in EMAIL_VALIDATION_ALLOWED_DOMAINS.
+    :param domain: str (ascii domain)
+    :return: boolean
+    """
+    domain = domain.lower()
+    for _allowed in config.get('EMAIL_VALIDATION_ALLOWED_DOMAINS', []) or []:
+        _allowed = _allowed.strip().lower()
+        if _allowed and (domain == _allowed or domain.endswith("." + _allowed)):
+            return True
+    return False
+
 
 def email_validator(key, value):
     """
     Verify if the given email id is valid or not. Raises a validation error if not valid.
 
+    Syntax is always validated without network, domain is further checked as per EMAIL_VALIDATION_MODE:
+
+        - syntax: No further check
+        - deliverability: Domain should accept emails (DNS lookup cached per domain)
+        - allowlist: Domain should be in EMAIL_VALIDATION_ALLOWED_DOMAINS
+
     :param key: key value where the value is from
     :param value: value should be of type email
     :return: None
     """
+    _mode = config.get('EMAIL_VALIDATION_MODE', 'deliverability')
+    if _mode not in EMAIL_VALIDATION_MODES:
+        raise err.AppPluginError("Not supported EMAIL_VALIDATION_MODE: {}".format(_mode))
+
     try:
-        validate_email(value)
-    except EmailNotValidError as e:
+        _email = validate_email(value, check_deliverability=False)
+    except (EmailNotValidError, TypeError) as e:
         raise err.ValidationError({
             key: "Not a valid email. Please verify your email"
         })
 
+    if _mode == "deliverability" and not _is_domain_deliverable(_email.ascii_domain):
+        raise err.ValidationError({
+            key: "Not a valid email. Please verify your email"
+        })
+
+    if _mode == "allowlist" and not _is_domain_allowed(_email.ascii_domain):
+        raise err.ValidationError({
+            key: "Email domain is not allowed"
+        })
+
 
 def date_validator(key, value):
     """
@@ -96,17 +173,14 @@ def country_code_validator(key, value):
     :param value: str
     :return: None
     """
-    try:
-        _country = pycountry.countries.get(alpha_2=value)
-        if not _country:
-            raise err.ValidationError({
-                key: "Not a valid country code - should follow ISO 3166 standard."
-            })
-    except Exception as e:
-        log.error(e)
+    if not isinstance(value, str):
         raise err.ValidationError({
             key: "Something wrong with given country code - should follow ISO 3166 standard."
         })
+    if not countries.is_valid(value):
+        raise err.ValidationError({
+            key: "Not a valid country code - should follow ISO 3166 standard."
+        })
 
 
 def url_validator(key, value):
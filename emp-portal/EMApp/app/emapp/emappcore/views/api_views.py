@@ -1,4 +1,8 @@
-from django.http import JsonResponse
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from django.utils.functional import SimpleLazyObject
+from django.contrib.auth import get_user_model
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
@@ -6,14 +10,33 @@ from rest_framework_api_key.permissions import HasAPIKey
 from rest_framework_api_key.models import APIKey
 from emappcore.tools import api_action
 from emappcore.utils import errors as err
-from emappcore.common import utilities as u
+from emappcore.utils.metrics import api_metrics
+from emappcore.utils.api_key_cache import api_key_cache
+from emappcore.utils.rate_limit import api_admission
+from emappcore.utils.idempotency import api_idempotency
+from emappcore.utils.jobs import api_jobs
+from emappcore.utils.api_codecs import EMAppCodecs
+from emappcore.common import config, model_transaction, utilities as u
+import calendar
 import collections
-import json
+import functools
+import hashlib
+import inspect
+import time
 import logging
 
 log = logging.getLogger(__name__)
 
 
+def _get_user_by_id(user_id):
+    """
+    Get the user for a cached api key
+    :param user_id: str
+    :return: user model instance
+    """
+    return get_user_model().objects.get(pk=user_id)
+
+
 class EMAppAPIView(APIView):
     """
     View function for all api. This will return json response.
@@ -22,14 +45,50 @@ class EMAppAPIView(APIView):
     Methods:
 
         api_response: This is as view function and is added in url dispatcher
-        _prepare_api_context: (private) Builds context for the api functions
+        _prepare_api_context: (private) Verifies the request headers and builds context for the api functions
+        _build_api_context: (private) Builds context for the api functions
         _parse_api_parameters: (private) Get all parameters or query string from the request to dictionary
         _send_success_response: (private) Prepares a data from api return and returns as json response
+        _make_success_response: (private) Makes the http response (streaming or encoded) for an api result
         _send_error_response: (private) Prepares a error data from api return and returns as json response
+        _build_success_result: (private) Builds the success envelope for an api result
+        _build_error_result: (private) Builds the error envelope and status code for an error
+        _get_stream_format: (private) Get the streaming format the client opted in with the Accept header
+        _stream_ndjson: (private) Streams a generator api result as NDJSON
+        _stream_json: (private) Streams a generator api result as chunked json envelope
+        _admit_client: (private) Rate limit per remote address before the api key is verified
+        _admit: (private) Rate limit per user and concurrency limit before running an api action
+        _release_after_response: (private) Release the concurrency slot once the response is sent
+        _get_conditional_validators: (private) Get the ETag and Last-Modified for a GET action with validator_func
+        _is_not_modified: (private) Check the request If-None-Match/If-Modified-Since against the validators
+        _set_conditional_headers: (private) Set ETag, Last-Modified and cache headers on the response
+        _begin_idempotent_request: (private) Acquire the Idempotency-Key or get the stored response to replay
+        _end_idempotent_request: (private) Store the response for the Idempotency-Key or release the key
+        _is_job_request: (private) Check if the client requested the api action as a background job
+        _send_job_response: (private) Send the job details of the api action enqueued as a background job
+
+    Note: Api actions can return a generator. If the client opted in with Accept: application/x-ndjson or
+          application/stream+json, the result is streamed otherwise it is sent as a json list.
+          app_context['stream'] is True if the client opted in for streaming.
+
+    Note: GET actions registered with validator_func support conditional GET. ETag and Last-Modified are sent
+          with the response and If-None-Match/If-Modified-Since is answered with 304 without running the action.
+
+    Note: POST requests of the verified users with Idempotency-Key header are run once per key, duplicates get
+          the stored response (with Idempotent-Replayed: true) or wait for the in flight request.
+
+    Note: Actions registered with async_ok are run as background jobs if the client sent async=1 in the
+          query string. Response is 202 with the job id, job status is available with the job_status action.
 
     """
     parser_classes = [MultiPartParser, FormParser]
     permission_classes = [HasAPIKey | IsAuthenticated]
+    _error_type = None
+    _encoder = None
+    _stream_media_types = collections.OrderedDict((
+        ("application/x-ndjson", "ndjson"),
+        ("application/stream+json", "json")
+    ))
 
     @staticmethod
     def _prepare_api_context(request=None, action_name=None):
@@ -42,28 +101,56 @@ class EMAppAPIView(APIView):
         :param request: django request object
         :return: dict
         """
-        if "application/json" not in (request.META.get('CONTENT_TYPE', '') or request.META.get('content_type', '')):
-            # check if its a 'multipart/form-data
-            if "multipart/form-data" in (request.META.get('CONTENT_TYPE', '') or request.META.get('content_type', '')):
-                pass
-            else:
-                raise err.BadRequest({
-                    "headers": "Headers are not set Content-type: application/json is required"
-                })
+        _content_type = request.META.get('CONTENT_TYPE', '') or request.META.get('content_type', '')
+        # Content type should be multipart/form-data or any of the registered codecs e.g. application/json
+        if "multipart/form-data" not in _content_type and not EMAppCodecs.get_decoder(_content_type):
+            raise err.BadRequest({
+                "headers": "Headers are not set Content-type: application/json is required"
+            })
 
+        return EMAppAPIView._build_api_context(request=request, action_name=action_name)
+
+    @staticmethod
+    def _build_api_context(request=None, action_name=None):
+        """
+        Builds the api context from the logged in user or from the api key given in the request headers.
+        Unlike _prepare_api_context, the request content type is not verified.
+
+        Note: Verified api keys are cached (see emappcore.utils.api_key_cache).
+        Note: user_id is set only for a verified api key or a logged in user (used as the client identity).
+        Note: Raises err.ValidationError if an upload handler stopped the upload (see utilities.get_upload_errors).
+
+        :param request: django request object
+        :param action_name: str
+        :return: dict
+        """
         log.info("Building api context")
+        _upload_errors = u.get_upload_errors(request)
+        if _upload_errors:
+            raise err.ValidationError(_upload_errors)
+
         context = {
             "api_action": action_name,
             "type": "api",
             "user": request.user,
             "files": request.FILES,
             "is_superuser": False,
-            "role": ""
+            "role": "",
+            "user_id": None
         }
 
         if "HTTP_API_KEY" in request.META or "X-API_KEY" in request.headers:
             log.info("Found api key. Fetching user")
             _key = request.META.get('HTTP_API_KEY', '') or request.headers.get('X-API_KEY', '')
+            _cached = api_key_cache.get(_key)
+            if _cached:
+                # User is fetched only if the api action uses it
+                context['user'] = SimpleLazyObject(functools.partial(_get_user_by_id, _cached['user_id']))
+                context['is_superuser'] = _cached['is_superuser']
+                context['role'] = _cached['role']
+                context['user_id'] = _cached['user_id']
+                return context
+
             try:
                 api_key = APIKey.objects.get_from_key(_key)
 
@@ -73,8 +160,14 @@ class EMAppAPIView(APIView):
                     context['role'] = context['user'].role if hasattr(context['user'], "role") else ""
                     if context['is_superuser']:
                         context['role'] = "admin"
+                    context['user_id'] = context['user'].id
+                    api_key_cache.set(_key, user_id=context['user'].id, role=context['role'],
+                                      is_superuser=context['is_superuser'], expiry_date=api_key.expiry_date)
             except APIKey.DoesNotExist:
                 pass
+
+        if context['user_id'] is None and context['user'].is_authenticated:
+            context['user_id'] = context['user'].id
         return context
 
     @staticmethod
@@ -88,16 +181,26 @@ class EMAppAPIView(APIView):
         """
 
         log.info("Preparing api parameters")
-        if request.META.get('CONTENT_LENGTH', '') and "application/json" in (
-                request.META.get('CONTENT_TYPE', '') or request.META.get('content_type', '')):
-            data_dict = json.loads(request.body)
+        _decoder = EMAppCodecs.get_decoder(request.META.get('CONTENT_TYPE', '') or request.META.get('content_type', ''))
+        if request.META.get('CONTENT_LENGTH', '') and _decoder:
+            data_dict = _decoder.loads(request.body)
         else:
             data_dict = u.convert_request_data_to_dict(getattr(request, request.method))
 
         return data_dict
 
-    @staticmethod
-    def _send_error_response(error_cls):
+    def _encode_response(self, result, status=200):
+        """
+        Encode the result with the codec selected from the request Accept header (default json).
+
+        :param result: dict
+        :param status: int http status code
+        :return: HttpResponse
+        """
+        encoder = self._encoder or EMAppCodecs.get_encoder()
+        return HttpResponse(encoder.dumps(result), content_type=encoder.content_type, status=status)
+
+    def _send_error_response(self, error_cls):
         """
         Responsible to parse the send thejson response with suitable error type and message.
 
@@ -105,16 +208,36 @@ class EMAppAPIView(APIView):
         :return: json
         """
         log.info("Sending error response")
+        result, status_code = self._build_error_result(error_cls)
+        # Send 200 for errors
+        # Give custom error message for application level validation errors
+        response = self._encode_response(result, status=status_code)
+        if getattr(error_cls, 'retry_after', None):
+            response['Retry-After'] = str(error_cls.retry_after)
+        return response
+
+    @staticmethod
+    def _build_error_result(error_cls):
+        """
+        Builds the error envelope and the http status code for a given error.
+
+        :param error_cls: instance (Error instance raised from the api action)
+        :return: tuple (OrderedDict, int)
+        """
         error_type = error_cls.__class__.__name__
 
-        if error_type in ("BadRequest", ):
+        if error_type in ("BadRequest", "ValidationError", "ParameterError", "ParameterNotAllowed"):
             status_code = 400
         elif error_type in ("NotFoundError", "UserNotFound"):
             status_code = 404
-        elif error_type == ("ValidationError", "ParameterError", "ParameterNotAllowed", "MethodNotAllowed"):
-            status_code = 409
+        elif error_type in ("MethodNotAllowed", ):
+            status_code = 405
         elif error_type in ("NotAuthorized", ):
             status_code = 401
+        elif error_type in ("Conflict", ):
+            status_code = 409
+        elif error_type in ("TooManyRequests", ):
+            status_code = 429
         else:
             status_code = 500
 
@@ -128,11 +251,205 @@ class EMAppAPIView(APIView):
             "error_type": error_type,
             "msg": msg or "unknown"
         })
-        # Send 200 for errors
-        # Give custom error message for application level validation errors
-        return JsonResponse(result, status=status_code)
+        return result, status_code
+
+    @staticmethod
+    def _build_success_result(action_name, api_result):
+        """
+        Builds the success envelope for a given api action result.
+
+        :param action_name: str (Action name of the api that is registered)
+        :param api_result: Return value of the api action
+        :return: OrderedDict
+        """
+        result = collections.OrderedDict({
+            "status": "success",
+            "action_name": action_name
+        })
+
+        if inspect.isgenerator(api_result):
+            api_result = list(api_result)
+
+        if isinstance(api_result, list):
+            result['count'] = len(api_result)
+
+        result['result'] = api_result
+
+        return result
+
+    @classmethod
+    def _get_stream_format(cls, request):
+        """
+        Get the streaming format from the Accept header. Client has to opt in for streaming.
+
+        :param request: django request object
+        :return: str (ndjson or json) or None
+        """
+        _accept = request.META.get('HTTP_ACCEPT', '')
+        for media_type, stream_format in cls._stream_media_types.items():
+            if media_type in _accept:
+                return stream_format
+        return None
 
-    def _send_success_response(self, method=None, action_name=None, context=None, data_dict=None):
+    def _stream_ndjson(self, action_name, api_result):
+        """
+        Streams each item of the api result as a json line. If the action fails while streaming,
+        last line is the error envelope. Api result is closed once the stream ends or is closed.
+
+        :param action_name: str
+        :param api_result: generator
+        :return: generator
+        """
+        _json = EMAppCodecs.get_encoder()
+        try:
+            for item in api_result:
+                yield _json.dumps(item) + b"\n"
+        except Exception as e:
+            log.error(e)
+            result, status_code = self._build_error_result(e)
+            result['action_name'] = action_name
+            yield _json.dumps(result) + b"\n"
+        finally:
+            # Client disconnected or the stream ended, release the resources held by the api result (e.g. scroll)
+            api_result.close()
+
+    def _stream_json(self, action_name, api_result):
+        """
+        Streams the api result as the json envelope same as non streaming response. Count is sent at the end.
+        If the action fails while streaming, envelope contains status error and error details.
+
+        :param action_name: str
+        :param api_result: generator
+        :return: generator
+        """
+        _json = EMAppCodecs.get_encoder()
+        yield b'{"status": "success", "action_name": ' + _json.dumps(action_name) + b', "result": ['
+        count = 0
+        error = None
+        try:
+            for item in api_result:
+                yield (b',' if count else b'') + _json.dumps(item)
+                count += 1
+        except Exception as e:
+            log.error(e)
+            error, status_code = self._build_error_result(e)
+        finally:
+            api_result.close()
+        yield '], "count": {}'.format(count).encode()
+        if error:
+            yield b', "error": ' + _json.dumps(error)
+        yield b'}'
+
+    def _get_conditional_validators(self, method, action_name, context, data_dict, stream_format=None):
+        """
+        Get the ETag and Last-Modified for a GET action registered with validator_func.
+        ETag is weak and also depends on the response codec and the stream format.
+
+        :param method: str
+        :param action_name: str
+        :param context: dict
+        :param data_dict: dict
+        :param stream_format: str (ndjson or json) or None
+        :return: tuple (etag, last_modified timestamp) or None
+        """
+        if method != "get":
+            return None
+
+        validator_func = api_action.get_action_metadata(method, action_name).get('validator_func')
+        if not validator_func:
+            return None
+
+        validators = validator_func(context, data_dict)
+        if not validators:
+            return None
+
+        tag, last_modified = validators
+        etag = None
+        if tag is not None:
+            _encoder = self._encoder or EMAppCodecs.get_encoder()
+            _value = "|".join((action_name, str(tag), _encoder.name, stream_format or ''))
+            etag = 'W/"{}"'.format(hashlib.sha1(_value.encode('utf-8')).hexdigest())
+        if last_modified is not None:
+            last_modified = calendar.timegm(last_modified.utctimetuple())
+
+        return etag, last_modified
+
+    def _is_not_modified(self, etag, last_modified):
+        """
+        Check the request If-None-Match (weak comparison) or If-Modified-Since if If-None-Match is not given.
+
+        :param etag: str or None
+        :param last_modified: int timestamp or None
+        :return: boolean
+        """
+        if_none_match = self.request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            if not etag:
+                return False
+            _etags = [x[2:] if x.startswith('W/') else x for x in parse_etags(if_none_match)]
+            return '*' in _etags or etag[2:] in _etags
+
+        if_modified_since = parse_http_date_safe(self.request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        if if_modified_since and last_modified is not None:
+            return last_modified <= if_modified_since
+
+        return False
+
+    @staticmethod
+    def _set_conditional_headers(response, etag, last_modified):
+        """
+        Set ETag, Last-Modified on the response. Responses depends on the user role, so these are private and
+        should be revalidated every time.
+
+        :param response: HttpResponse
+        :param etag: str or None
+        :param last_modified: int timestamp or None
+        :return: HttpResponse
+        """
+        if etag:
+            response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ('Accept', ))
+        return response
+
+    def _is_job_request(self, method, action_name, data_dict):
+        """
+        Check if the client requested a background job with async=1 in the query string.
+        Raises err.BadRequest if the action is not registered with async_ok.
+
+        :param method: str
+        :param action_name: str
+        :param data_dict: dict (async parameter is removed)
+        :return: boolean
+        """
+        _async = self.request.GET.get('async', '')
+        if method == "get":
+            data_dict.pop('async', None)
+        if not u.core_convert_to_bool(_async):
+            return False
+
+        if not api_action.get_action_metadata(method, action_name).get('async_ok'):
+            raise err.BadRequest({
+                "async": "Api action cannot be run as a background job"
+            })
+        return True
+
+    def _send_job_response(self, action_name, job):
+        """
+        Send the job details of the enqueued api action with 202 Accepted.
+
+        :param action_name: str
+        :param job: dict (from api_jobs.enqueue)
+        :return: HttpResponse
+        """
+        response = self._encode_response(self._build_success_result(action_name, job), status=202)
+        response['Location'] = "job_status?job_id={}".format(job['job_id'])
+        return response
+
+    def _send_success_response(self, method=None, action_name=None, context=None, data_dict=None,
+                               stream_format=None):
         """
         Access API function for a request method and send the response as json.
 
@@ -142,30 +459,176 @@ class EMAppAPIView(APIView):
         :param action_name: (Action name of the api that is registered)
         :param context: dict (Contains information on user and their role)
         :param data_dict: (All url parameters as dict)
+        :param stream_format: str (ndjson or json) if client opted in for streaming
         :return: Json
         """
 
-        response = collections.OrderedDict({
-            "status": "success",
-            "action_name": action_name
-        })
-
         try:
             log.info("Given api action: {}".format(action_name))
-            func = getattr(api_action, "{}_actions".format(method))
-            api_result = func(action_name, context, data_dict)
+            if self._is_job_request(method, action_name, data_dict):
+                job = api_jobs.enqueue(method, action_name, context, data_dict)
+                return self._send_job_response(action_name, job)
 
-            if isinstance(api_result, list):
-                response['count'] = len(api_result)
+            validators = self._get_conditional_validators(method, action_name, context, data_dict, stream_format)
+            if validators and self._is_not_modified(*validators):
+                log.info("Api action result not modified: {}".format(action_name))
+                return self._set_conditional_headers(HttpResponse(status=304), *validators)
 
-            response['result'] = api_result
+            func = getattr(api_action, "{}_actions".format(method))
+            api_result = func(action_name, context, data_dict)
 
-            return JsonResponse(response, status=200)
+            return self._make_success_response(action_name, api_result, stream_format, validators)
         except Exception as e:
             # Send error response
             log.error(e)
+            self._error_type = e.__class__.__name__
             return self._send_error_response(e)
 
+    def _make_success_response(self, action_name, api_result, stream_format=None, validators=None):
+        """
+        Makes the http response for an api result. Streams generator result if the client opted in.
+
+        :param action_name: str (Action name of the api that is registered)
+        :param api_result: Return value of the api action
+        :param stream_format: str (ndjson or json) if client opted in for streaming
+        :param validators: tuple (etag, last_modified) conditional GET validators or None
+        :return: HttpResponse or StreamingHttpResponse
+        """
+        if stream_format and inspect.isgenerator(api_result):
+            log.info("Streaming api result as: {}".format(stream_format))
+            if stream_format == "ndjson":
+                response = StreamingHttpResponse(self._stream_ndjson(action_name, api_result),
+                                                 content_type="application/x-ndjson")
+            else:
+                response = StreamingHttpResponse(self._stream_json(action_name, api_result),
+                                                 content_type="application/json")
+        else:
+            response = self._encode_response(self._build_success_result(action_name, api_result), status=200)
+
+        if validators:
+            self._set_conditional_headers(response, *validators)
+        return response
+
+    def _admit_client(self, method):
+        """
+        Rate limit per remote address and action class. Checked before the api key is verified, hence the
+        requests with forged api keys are limited without hashing the keys. Raises err.TooManyRequests.
+
+        :param method: str
+        :return: None
+        """
+        api_admission.check_rate("ip:{}".format(self.request.META.get('REMOTE_ADDR', '')), method,
+                                 config_key='API_IP_RATE_LIMITS')
+        return None
+
+    def _admit(self, method, action_name, context):
+        """
+        Admission control before running an api action. Rate limit per verified user and action class and
+        concurrency limit per action (see emappcore.utils.rate_limit). Raises err.TooManyRequests.
+        Anonymous or not verified clients are only limited per remote address (see _admit_client).
+
+        :param method: str
+        :param action_name: str
+        :param context: dict (api context)
+        :return: str concurrency slot to be released or None
+        """
+        if context.get('user_id'):
+            api_admission.check_rate("user:{}".format(context['user_id']), method)
+        return api_admission.acquire(action_name, api_action.get_action_metadata(method, action_name))
+
+    def _begin_idempotent_request(self, method, action_name, context, data_dict):
+        """
+        Idempotency for the POST api actions if the client sent Idempotency-Key (see emappcore.utils.idempotency).
+        Waits if a request with the same key is in flight. Keys are scoped by the verified user, hence the stored
+        response is only replayed to the user who made the request. Idempotency-Key of anonymous or not verified
+        clients is ignored.
+
+        :param method: str
+        :param action_name: str
+        :param context: dict (api context)
+        :param data_dict: dict
+        :return: tuple (idempotency scope, token, fingerprint, replayed response or None)
+        """
+        _key = self.request.META.get('HTTP_IDEMPOTENCY_KEY', '')
+        if method != "post" or not _key or not context.get('user_id'):
+            return None, None, None, None
+        if len(_key) > 255:
+            raise err.BadRequest({
+                "idempotency_key": "Idempotency-Key should not be more than 255 characters"
+            })
+
+        scope = "{}:{}:{}".format(context['user_id'], action_name, _key)
+        fingerprint = api_idempotency.get_fingerprint(data_dict)
+        token, stored = api_idempotency.begin(scope, fingerprint)
+        if stored is None:
+            return scope, token, fingerprint, None
+
+        response = HttpResponse(stored['content'], status=stored['status'], content_type=stored['content_type'])
+        response['Idempotent-Replayed'] = "true"
+        return scope, None, fingerprint, response
+
+    @staticmethod
+    def _end_idempotent_request(scope, token, fingerprint, response=None):
+        """
+        Store the successful response for the idempotency key, else release the key so that the client can retry.
+
+        :param scope: str or None
+        :param token: str or None (from _begin_idempotent_request)
+        :param fingerprint: str
+        :param response: HttpResponse or None if the request failed
+        :return: None
+        """
+        if not token:
+            return None
+        if response is not None and not response.streaming and 200 <= response.status_code < 300:
+            api_idempotency.complete(scope, token, fingerprint, response.status_code,
+                                     response['Content-Type'], response.content)
+        else:
+            api_idempotency.abort(scope, token)
+        return None
+
+    @staticmethod
+    def _release_after_response(response, action_name, slot):
+        """
+        Release the concurrency slot. Streaming responses release the slot once the stream is consumed.
+
+        :param response: HttpResponse or StreamingHttpResponse
+        :param action_name: str
+        :param slot: str or None
+        :return: response
+        """
+        if not slot:
+            return response
+
+        if not response.streaming:
+            api_admission.release(action_name, slot)
+            return response
+
+        def _stream(content):
+            try:
+                for chunk in content:
+                    yield chunk
+            finally:
+                api_admission.release(action_name, slot)
+
+        response.streaming_content = _stream(response.streaming_content)
+        return response
+
+    def _record_metrics(self, method, action_name, started):
+        """
+        Record the api call metrics. Not registered actions are recorded as unknown to
+        keep the number of metric labels bounded. For streamed responses latency is measured
+        until the response starts streaming.
+
+        :param method: str
+        :param action_name: str
+        :param started: float (time.perf_counter at the beginning of the request)
+        :return: None
+        """
+        if not api_action.has_action(method, action_name):
+            action_name = "unknown"
+        api_metrics.observe(method, action_name, time.perf_counter() - started, error_type=self._error_type)
+
     def dispatch(self, request, *args, **kwargs):
         """
         This is the view function for API response.
@@ -174,20 +637,274 @@ class EMAppAPIView(APIView):
         """
         action_name = kwargs.get('action_name', '')
         log.info("Requested api action: {}".format(action_name))
+        request_method = request.method.lower()
+        started = time.perf_counter()
+        self._encoder = EMAppCodecs.get_encoder(request.META.get('HTTP_ACCEPT', ''))
         try:
+            self._admit_client(request_method)
             context = self._prepare_api_context(
                 request=request,
                 action_name=action_name
             )
             data_dict = self._parse_api_parameters(request)
+            stream_format = self._get_stream_format(request)
+            context['stream'] = stream_format is not None
+
+            # Replayed responses are also rate limited
+            slot = self._admit(request_method, action_name, context)
+            try:
+                scope, token, fingerprint, response = self._begin_idempotent_request(
+                    request_method, action_name, context, data_dict)
+                if response is None:
+                    try:
+                        response = self._send_success_response(
+                            method=request_method,
+                            action_name=action_name,
+                            context=context,
+                            data_dict=data_dict,
+                            stream_format=stream_format
+                        )
+                    finally:
+                        self._end_idempotent_request(scope, token, fingerprint, response)
+            except Exception:
+                api_admission.release(action_name, slot)
+                raise
+            response = self._release_after_response(response, action_name, slot)
+        except Exception as e:
+            self._error_type = e.__class__.__name__
+            response = self._send_error_response(e)
+
+        self._record_metrics(request_method, action_name, started)
+        return response
+
+
+class _BatchRollback(Exception):
+    """
+    Raised internally to roll back an atomic batch on the first failing action.
+    """
+    def __init__(self, results):
+        super(_BatchRollback, self).__init__("Batch rolled back")
+        self.results = results
+
+
+class EMAppBatchAPIView(EMAppAPIView):
+    """
+    View function to run many api actions in one http request. Each action is run through
+    api_action._run_action and gets its own result or error envelope.
+
+    Request body (application/json or any of the registered codecs):
+
+        {
+            "atomic": false,
+            "actions": [
+                {"action": "show_employee", "method": "get", "params": {"id": "dlx-emp1"}},
+                {"action": "update_employee", "method": "post", "params": {"id": "dlx-emp1", "position": "Lead"}}
+            ]
+        }
+
+    Note 1: If atomic is true, all the actions run in a single database transaction. The first failing action
+            rolls back the whole batch and the remaining actions are not executed.
+    Note 2: Index (elastic search) updates done by an action are not part of the database transaction.
+
+    Methods:
+
+        _parse_batch_parameters: (private) Get the list of actions and the atomic flag from the request body
+        _run_batch_action: (private) Run a single action of the batch and returns its envelope
+        _run_batch: (private) Run all the actions of the batch
+    """
+
+    @staticmethod
+    def _parse_batch_parameters(request):
+        """
+        Parse the batch request body. Batch accepts body in any of the registered codecs (e.g. application/json)
+        with list of actions or dict containing actions and atomic.
+
+        :param request: django request object
+        :return: tuple (list, boolean)
+        """
+        _decoder = EMAppCodecs.get_decoder(request.META.get('CONTENT_TYPE', '') or request.META.get('content_type', ''))
+        if not _decoder:
+            raise err.BadRequest({
+                "headers": "Headers are not set Content-type: application/json is required"
+            })
+
+        try:
+            data = _decoder.loads(request.body) if request.body else []
+        except Exception:
+            raise err.BadRequest({
+                "body": "Batch body should be a valid json"
+            })
+
+        if isinstance(data, list):
+            actions, atomic = data, False
+        elif isinstance(data, dict):
+            actions, atomic = data.get('actions', []), u.core_convert_to_bool(data.get('atomic', False))
+        else:
+            raise err.ParameterError({
+                "actions": "Batch body should be a list of actions"
+            })
+
+        if not isinstance(actions, list) or not actions:
+            raise err.ParameterError({
+                "actions": "At least one action is required"
+            })
+
+        _max_actions = int(config.get('API_BATCH_MAX_ACTIONS', 50))
+        if len(actions) > _max_actions:
+            raise err.ParameterError({
+                "actions": "Max number of actions allowed in a batch is {}".format(_max_actions)
+            })
+
+        return actions, atomic
+
+    def _run_batch_action(self, item, context):
+        """
+        Run a single batch action and build its envelope.
+
+        :param item: dict (contains action, method and params)
+        :param context: dict (api context of the batch request)
+        :return: tuple (OrderedDict, boolean - True if action is successful)
+        """
+        action_name = item.get('action', '') if isinstance(item, dict) else ''
+        try:
+            if not isinstance(item, dict) or not action_name:
+                raise err.ParameterError({
+                    "action": "Each batch item should be a dict with action, method and params"
+                })
+
+            method = str(item.get('method', 'get')).lower()
+            if not api_action._validate_method(method):
+                raise err.MethodNotAllowed("Only get, post, put, delete methods are allowed")
+
+            params = item.get('params', {}) or {}
+            if not isinstance(params, dict):
+                raise err.ParameterError({
+                    "params": "params should be of type dict"
+                })
 
-            request_method = request.method.lower()
+            _context = dict(context)
+            _context['api_action'] = action_name
+            started = time.perf_counter()
+            slot = None
+            try:
+                slot = self._admit(method, action_name, _context)
+                api_result = api_action._run_action(api_action._action_classes.get(method), action_name,
+                                                    _context, params)
+                if inspect.isgenerator(api_result):
+                    api_result = list(api_result)
+            except Exception as e:
+                self._error_type = e.__class__.__name__
+                raise
+            finally:
+                api_admission.release(action_name, slot)
+                self._record_metrics(method, action_name, started)
+                self._error_type = None
+            return self._build_success_result(action_name, api_result), True
+        except Exception as e:
+            log.error(e)
+            result, status_code = self._build_error_result(e)
+            result['action_name'] = action_name
+            result['status_code'] = status_code
+            return result, False
 
-            return self._send_success_response(
-                method=request_method,
-                action_name=action_name,
-                context=context,
-                data_dict=data_dict
+    def _run_batch(self, actions, context, atomic=False):
+        """
+        Run all the batch actions. If atomic, raises _BatchRollback on first error which will
+        roll back the surrounding transaction.
+
+        :param actions: list
+        :param context: dict
+        :param atomic: boolean
+        :return: list
+        """
+        results = []
+        for item in actions:
+            result, is_success = self._run_batch_action(item, context)
+            results.append(result)
+            if atomic and not is_success:
+                raise _BatchRollback(results)
+        return results
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        This is the view function for batch API response.
+        :param request: django request object
+        :return: json
+        """
+        log.info("Requested api batch")
+        started = time.perf_counter()
+        self._encoder = EMAppCodecs.get_encoder(request.META.get('HTTP_ACCEPT', ''))
+        error_type = None
+        try:
+            if request.method.lower() != "post":
+                raise err.MethodNotAllowed("Only post method is allowed for batch")
+
+            self._admit_client("post")
+            context = self._prepare_api_context(
+                request=request,
+                action_name="batch"
             )
+            actions, atomic = self._parse_batch_parameters(request)
+
+            if not atomic:
+                results = self._run_batch(actions, context)
+            else:
+                try:
+                    with model_transaction.atomic():
+                        results = self._run_batch(actions, context, atomic=True)
+                except _BatchRollback as e:
+                    results = e.results
+                    for result in results[:-1]:
+                        result['status'] = "rolled_back"
+                        result.pop('result', None)
+                        result.pop('count', None)
+                    for item in actions[len(results):]:
+                        results.append(collections.OrderedDict({
+                            "status": "skipped",
+                            "action_name": item.get('action', '') if isinstance(item, dict) else ''
+                        }))
+
+            response = collections.OrderedDict({
+                "status": "success" if all(x['status'] == "success" for x in results) else "error",
+                "action_name": "batch",
+                "count": len(results),
+                "result": results
+            })
+            response = self._encode_response(response, status=200)
         except Exception as e:
+            log.error(e)
+            error_type = e.__class__.__name__
+            response = self._send_error_response(e)
+
+        api_metrics.observe("post", "batch", time.perf_counter() - started, error_type=error_type)
+        return response
+
+
+class EMAppMetricsView(EMAppAPIView):
+    """
+    View function for the api metrics. Metrics are returned in prometheus text format.
+    Only admin or super user (logged in or api key) can see the metrics.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        """
+        This is the view function for api metrics.
+        :param request: django request object
+        :return: text/plain
+        """
+        try:
+            if request.method.lower() != "get":
+                raise err.MethodNotAllowed("Only get method is allowed for metrics")
+
+            self._admit_client("get")
+            context = self._build_api_context(request=request, action_name="metrics")
+            _user = context['user']
+            if not (context['role'] == "admin" or _user.is_superuser or getattr(_user, "role", "") == "admin"):
+                raise err.NotAuthorized({
+                    "user": "Only admin can see the api metrics"
+                })
+
+            return HttpResponse(api_metrics.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+        except Exception as e:
+            log.error(e)
             return self._send_error_response(e)
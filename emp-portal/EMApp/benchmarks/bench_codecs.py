@@ -0,0 +1,82 @@
+"""
+Micro benchmark for the api wire format codecs (emappcore.utils.api_codecs).
+
+Compares encode/decode time and payload size of show_employee and search_employee (100 rows) like
+responses for all the available codecs.
+
+Usage:
+    python benchmarks/bench_codecs.py [--rounds 2000]
+"""
+import os
+import sys
+import argparse
+import datetime
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app', 'emapp'))
+
+from django.conf import settings
+
+settings.configure()
+
+from emappcore.utils.api_codecs import JSONCodec, FastJSONCodec, MessagePackCodec, orjson, msgpack
+
+
+def _employee(i):
+    return {
+        "id": i,
+        "employee_id": "etm-{:04d}px".format(i),
+        "first_name": "Kenny",
+        "middle_name": "l",
+        "last_name": "John",
+        "full_name": "Kenny l John",
+        "work_email": "kenny_john{}@gmail.com".format(i),
+        "date_of_birth": datetime.date(1992, 7, 9),
+        "joining_date": datetime.date(2018, 10, 1),
+        "nationality_code": "in",
+        "bio": "An experienced software developer and researcher with a passion for developing AI tools and "
+               "linked and open data applications.",
+        "contact_ph": "0899518706",
+        "graduation_level": "bachelor",
+        "position": "Senior Software Developer",
+        "work_country_code": "ie",
+        "work_address": "Dublin",
+        "is_active": True,
+        "created_at": datetime.datetime(2020, 7, 1, 10, 30, 12),
+        "updated_at": datetime.datetime(2020, 7, 2, 11, 0, 0),
+        "skills": ["python", "django", "elasticsearch"]
+    }
+
+
+PAYLOADS = {
+    "show_employee": {"status": "success", "action_name": "show_employee", "result": _employee(1)},
+    "search_employee": {
+        "status": "success", "action_name": "search_employee", "count": 100,
+        "result": [_employee(i) for i in range(100)]
+    }
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    codecs = [JSONCodec()]
+    if orjson:
+        codecs.append(FastJSONCodec())
+    if msgpack:
+        codecs.append(MessagePackCodec())
+
+    print("{:<16} {:<8} {:>10} {:>12} {:>12}".format("payload", "codec", "bytes", "encode (us)", "decode (us)"))
+    for payload_name, payload in PAYLOADS.items():
+        for codec in codecs:
+            encoded = codec.dumps(payload)
+            encode = timeit.timeit(lambda: codec.dumps(payload), number=args.rounds) / args.rounds
+            decode = timeit.timeit(lambda: codec.loads(encoded), number=args.rounds) / args.rounds
+            print("{:<16} {:<8} {:>10} {:>12.1f} {:>12.1f}".format(
+                payload_name, codec.name, len(encoded), encode * 1e6, decode * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Micro benchmark for the response compression (emappcore.middleware.EMAppCompressionMiddleware).
+
+Compares the cpu time against the bytes saved for gzip and brotli at a few levels for the search_employee
+json (100 rows), an ndjson stream (compressed and flushed per item) and a search page like html with
+12 profile cards.
+
+Usage:
+    python benchmarks/bench_compression.py [--rounds 200]
+"""
+import os
+import sys
+import argparse
+import json
+import timeit
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app', 'emapp'))
+
+# Settings are configured in bench_codecs
+from bench_codecs import PAYLOADS, _employee
+from django.core.serializers.json import DjangoJSONEncoder
+from emappcore.common import config
+from emappcore.middleware import GzipCompressor, BrotliCompressor, brotli
+
+_CARD = """
+<div class="col-md-3 col-sm-6">
+  <div class="card profile-card">
+    <img class="card-img-top rounded-circle" src="/media/avatars/{employee_id}.png" alt="{first_name}">
+    <div class="card-body">
+      <h5 class="card-title"><a href="/profile/{employee_id}">{first_name} {last_name}</a></h5>
+      <p class="card-text text-muted">{position}</p>
+      <p class="card-text"><i class="fa fa-envelope"></i> {work_email}</p>
+      <p class="card-text"><i class="fa fa-map-marker"></i> {work_address}, {work_country_code}</p>
+    </div>
+  </div>
+</div>"""
+
+
+def _search_page():
+    cards = "".join(_CARD.format(**_employee(i)) for i in range(12))
+    return ("<html><head><title>Search - EM App</title></head><body><div class='container'>"
+            "<div class='row'>{}</div></div></body></html>".format(cards)).encode("utf-8")
+
+
+def _ndjson_chunks():
+    return [json.dumps(_employee(i), cls=DjangoJSONEncoder).encode("utf-8") + b"\n" for i in range(100)]
+
+
+def _compressors():
+    for level in (1, 6, 9):
+        yield "gzip-{}".format(level), 'RESPONSE_COMPRESSION_GZIP_LEVEL', level, GzipCompressor()
+    if brotli:
+        for quality in (1, 4, 11):
+            yield "br-{}".format(quality), 'RESPONSE_COMPRESSION_BROTLI_QUALITY', quality, BrotliCompressor()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = {
+        "search_employee": json.dumps(PAYLOADS["search_employee"], cls=DjangoJSONEncoder).encode("utf-8"),
+        "search_page": _search_page()
+    }
+    chunks = _ndjson_chunks()
+
+    print("{:<16} {:<8} {:>10} {:>10} {:>8} {:>12}".format(
+        "payload", "coding", "bytes", "on wire", "saved", "cpu (us)"))
+    for name, config_key, level, compressor in _compressors():
+        _level = mock.patch.dict(config, {config_key: level})
+        _level.start()
+        for payload_name, payload in payloads.items():
+            compressed = compressor.compress(payload)
+            cpu = timeit.timeit(lambda: compressor.compress(payload), number=args.rounds) / args.rounds
+            print("{:<16} {:<8} {:>10} {:>10} {:>7.0%} {:>12.1f}".format(
+                payload_name, name, len(payload), len(compressed), 1 - len(compressed) / len(payload), cpu * 1e6))
+
+        # Streaming, each item is flushed hence the ratio is lower than compressing the whole content
+        raw_size = sum(len(chunk) for chunk in chunks)
+        compressed = b"".join(compressor.compress_stream(iter(chunks)))
+        cpu = timeit.timeit(lambda: b"".join(compressor.compress_stream(iter(chunks))),
+                            number=args.rounds) / args.rounds
+        print("{:<16} {:<8} {:>10} {:>10} {:>7.0%} {:>12.1f}".format(
+            "ndjson_stream", name, raw_size, len(compressed), 1 - len(compressed) / raw_size, cpu * 1e6))
+        _level.stop()
+
+
+if __name__ == '__main__':
+    main()
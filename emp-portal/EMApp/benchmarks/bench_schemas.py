@@ -0,0 +1,139 @@
+"""
+Micro benchmark for the schema validation (emappcore.common.schemas.validate).
+
+Compares the compiled validation plan (built once on register) against the previous path (schema deep copy,
+jsonschema validator built and schema checked, validators string split and looked up on every call) for
+employee_schema: a create, a partial update and a bulk create of 500 employees.
+
+Emails are validated in syntax mode (EMAIL_VALIDATION_MODE, no DNS), both paths run the same validator functions.
+
+Usage:
+    python benchmarks/bench_schemas.py [--rounds 2000]
+"""
+import os
+import sys
+import argparse
+import copy
+import timeit
+from unittest import mock
+
+_here = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_here, '..', 'app', 'emapp'))
+sys.path.insert(0, os.path.join(_here, '..', 'extensions', 'emappext-hr_mgmt'))
+
+from django.conf import settings
+
+settings.configure()
+
+from jsonschema import validate as _validate
+from emappcore.common import config, schemas, validators
+from emappcore.utils import validators as core_validators, errors as err
+
+_VALIDATORS = ("ignore_missing", "email_validator", "date_validator", "not_empty", "number_validator",
+               "country_code_validator", "url_validator")
+
+EMPLOYEE = {
+    "date_of_birth": "1992-07-09",
+    "first_name": "Vinoop",
+    "last_name": "Sanil",
+    "work_email": "vinoop_sanil@gmail.com",
+    "nationality_code": "in",
+    "employee_id": "DLX-EMP7",
+    "work_country_code": "ie",
+    "work_address": "Dublin",
+    "joining_date": "2018-10-01",
+    "position": "Senior Software Developer",
+    "graduation_level": "bachelor",
+    "contact_ph": "0899518706",
+    "role": "hr",
+    "bio": "An experienced software developer and researcher with a passion for developing AI tools and linked "
+           "and open data applications."
+}
+
+CHANGES = {
+    "position": "Lead Software Developer",
+    "work_country_code": "in"
+}
+
+
+def _previous_validate(schema_name, data_dict, partial=False):
+    """
+    EMAppSchemas.validate before the compiled validation plan.
+    """
+    schema = schemas.get_schema(schema_name)
+    if partial:
+        schema['properties'] = {k: v for k, v in schema['properties'].items() if k in data_dict}
+        schema['required'] = [k for k in schema.get('required', []) if k in data_dict]
+
+    diff = set(data_dict.keys()).difference(set(schema['properties']))
+    if diff:
+        raise err.ValidationError({"parameter": "Not allowed parameter: {}".format(list(diff)[0])})
+
+    try:
+        _validate(instance=data_dict, schema=schema)
+    except Exception as e:
+        raise err.ValidationError({"ValidationError": getattr(e, 'message', "InternalServerError")})
+
+    for key in schema['properties']:
+        _validators_string = schema['properties'][key]['validators'].strip()
+        _options = schema['properties'][key].get('options', '')
+        _given_value = data_dict.get(key, '')
+
+        if _validators_string:
+            for _validator in _validators_string.split(" "):
+                if _validator == "ignore_missing" and not _given_value:
+                    break
+                else:
+                    getattr(schemas, _validator.strip())(key, data_dict[key])
+
+        if _options and _given_value not in (x['value'] for x in _options):
+            if not _given_value and "ignore_missing" in _validators_string:
+                pass
+            else:
+                raise err.ValidationError({key: "Given value does not match the available options"})
+    return True
+
+
+def _compiled_validate(schema_name, data_dict, partial=False):
+    return schemas.validate(schema_name, data_dict, partial=partial)
+
+
+def _bulk(validate, employees):
+    for _employee in employees:
+        validate("employee_schema", _employee)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    for _name in _VALIDATORS:
+        validators.register(name=_name, func=getattr(core_validators, _name))
+    schemas.register(schema_dir="emappext.hr_mgmt.schema", file_name="employee_schema.json",
+                     schema_name="employee_schema")
+
+    employees = list()
+    for i in range(500):
+        _employee = copy.deepcopy(EMPLOYEE)
+        _employee['employee_id'] = "DLX-EMP{}".format(i)
+        _employee['work_email'] = "employee_{}@gmail.com".format(i)
+        employees.append(_employee)
+
+    cases = [
+        ("create", args.rounds, lambda validate: validate("employee_schema", EMPLOYEE)),
+        ("partial update", args.rounds, lambda validate: validate("employee_schema", CHANGES, partial=True)),
+        ("bulk create 500", max(args.rounds // 500, 1), lambda validate: _bulk(validate, employees))
+    ]
+
+    with mock.patch.dict(config, {"EMAIL_VALIDATION_MODE": "syntax"}):
+        print("{:<16} {:>14} {:>14} {:>8}".format("case", "previous (us)", "compiled (us)", "speedup"))
+        for name, rounds, func in cases:
+            previous = timeit.timeit(lambda: func(_previous_validate), number=rounds) / rounds
+            compiled = timeit.timeit(lambda: func(_compiled_validate), number=rounds) / rounds
+            print("{:<16} {:>14.1f} {:>14.1f} {:>7.1f}x".format(name, previous * 1e6, compiled * 1e6,
+                                                               previous / compiled))
+
+
+if __name__ == '__main__':
+    main()
@@ -86,16 +86,16 @@ class EmployeeDocument(Document):
         )
         return default_search_fields
 
-    def as_dict(self):
+    def as_dict(self, fields=None):
         """
         Convert the index data to dictionary
+        :param fields: list (optional) Only these fields are returned
         :return:
         """
         result = dict()
-        _fields = self.default_search_fields_full_text()
+        _fields = self.default_search_fields_full_text() + ("id", )
         for _field in _fields:
-            result[_field] = getattr(self, _field)
-
-        result['id'] = getattr(self, "id")
+            if fields is None or _field in fields:
+                result[_field] = getattr(self, _field)
 
         return result
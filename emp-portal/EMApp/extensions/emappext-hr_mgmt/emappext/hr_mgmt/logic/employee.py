@@ -1,8 +1,17 @@
-from emappcore.common import schemas, model_transaction, validators, utilities as u
+from emappcore.common import config, schemas, model_transaction, validators, utilities as u
 from emappcore.utils import model_helper, errors as err
+from emappcore.utils.api_key_cache import api_key_cache
+from emappcore.utils.jobs import api_jobs
 from emappext.hr_mgmt import models
 from emappext.hr_mgmt.index.employee_index import EmployeeDocument
-from emappext.hr_mgmt.utils import auth, email
+from emappext.hr_mgmt.utils import auth, email, files
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+import base64
+import binascii
+import itertools
+import json
 import os
 import logging
 
@@ -32,43 +41,18 @@ def create_employee(app_context, data_dict):
     """
     log.info("Checking authorization")
     auth.employee_create(app_context)
-    _employee_id = data_dict.get('employee_id', '')
     _files = app_context.get('files', '')
     _show_employee = u.core_convert_to_bool(data_dict.pop('show_employee', True))
 
-    if data_dict.get('skills', ''):
-        _skills = data_dict['skills']
-        if isinstance(_skills, str):
-            # Hack for multipart/form-data?? Dont know if this is the right way
-            # TODO: need to create a data insert pre processing pipeline
-            data_dict['skills'] = [s.strip().title() for s in _skills.split(",")]
-
-    log.info("Validating the given data for employee create")
-    # Validate the data vs schema and model validate
-    schemas.validate("employee_schema", data_dict)
+    _validate_employee_create_data(data_dict)
+    _employee_id = data_dict.get('employee_id', '')
 
-    _properties = schemas.get_schema('employee_schema')['properties']
+    _schema = schemas.get_frozen_schema('employee_schema')
 
     log.info("Creating a employee for employee id: {}".format(_employee_id))
     try:
         with model_transaction.atomic():
-            employee_model = models.Employee()
-            employee_model.username = _employee_id
-            _extras = []
-            for _key in _properties:
-                _val = data_dict.get(_key, '')
-
-                if hasattr(employee_model, _key):
-                    setattr(employee_model, _key, _val)
-                else:
-                    log.info("Adding to extras key - employee: {}".format(_key))
-                    _extras.append(model_helper.create_extras_table_values(
-                        extras_model=models.EmployeeExtras,
-                        connecting_key="employee",
-                        connecting_model=employee_model,
-                        key=_key,
-                        value=_val
-                    ))
+            employee_model, _extras = _build_employee_models(data_dict, _schema)
 
             if _files and _files.get('upload_avatar', ''):
                 log.info("Found avatar create..")
@@ -79,6 +63,7 @@ def create_employee(app_context, data_dict):
             employee_model.save()
             for _md in _extras:
                 _md.save()
+            email.queue_email_create_employees([employee_model])
 
     except Exception as e:
         log.error(e)
@@ -91,11 +76,239 @@ def create_employee(app_context, data_dict):
             "message": "Employee with id: {} has been created successfully".format(_employee_id)
         }
 
-    email.send_email_create_employee(to=[data_dict.get('work_email').lower()])
-
     return result
 
 
+def _validate_employee_create_data(data_dict):
+    """
+    Prepare and validate the data for employee create against the employee schema.
+    :param data_dict: dict
+    :return: None (raises err.ValidationError)
+    """
+    schemas.normalize("employee_schema", data_dict)
+
+    log.info("Validating the given data for employee create")
+    # Validate the data vs schema and model validate
+    schemas.validate("employee_schema", data_dict)
+    return None
+
+
+def _build_employee_models(data_dict, schema):
+    """
+    Build (not saved) employee model and the extras models for the schema properties that are not employee
+    table columns.
+    :param data_dict: dict (validated data)
+    :param schema: EMAppSchema (employee schema)
+    :return: tuple (Employee, list of EmployeeExtras)
+    """
+    _columns, _extras_fields = schema.get_model_fields(models.Employee)
+    employee_model = models.Employee()
+    employee_model.username = data_dict.get('employee_id', '')
+    for _key in _columns:
+        setattr(employee_model, _key, data_dict.get(_key, ''))
+
+    _extras = []
+    for _key in _extras_fields:
+        log.info("Adding to extras key - employee: {}".format(_key))
+        _extras.append(model_helper.create_extras_table_values(
+            extras_model=models.EmployeeExtras,
+            connecting_key="employee",
+            connecting_model=employee_model,
+            key=_key,
+            value=data_dict.get(_key, '')
+        ))
+    return employee_model, _extras
+
+
+def _resolve_reporting_managers(employees):
+    """
+    Resolve the reporting manager emails of the given (not saved) employees to employee ids with a single query,
+    same as Employee.save. Managers can also be the employees in the given list.
+    :param employees: list of Employee
+    :return: dict {index: errors} for the employees with an invalid reporting manager
+    """
+    _emails = set(_e.reporting_manager.lower() for _e in employees if _e.reporting_manager)
+    if not _emails:
+        return dict()
+
+    # Emails are matched case insensitive same as get_employee_by_email (iexact)
+    _managers = dict(
+        models.Employee.objects.annotate(work_email_lower=Lower('work_email')).filter(
+            work_email_lower__in=_emails).values_list('work_email_lower', 'id')
+    )
+    for _employee in employees:
+        _managers.setdefault(_employee.work_email.lower(), _employee.id)
+
+    errors = dict()
+    for index, _employee in enumerate(employees):
+        if not _employee.reporting_manager:
+            continue
+        _manager_id = _managers.get(_employee.reporting_manager.lower())
+        if _manager_id is None:
+            errors[index] = {"reporting_manager": "Given reporting manager not available"}
+        elif _manager_id == _employee.id:
+            errors[index] = {"reporting_manager": "You cannot assign yourself as reporting manager"}
+        else:
+            _employee.reporting_manager = _manager_id
+    return errors
+
+
+def _index_employees(employees, action="index"):
+    """
+    Index or delete the given employees with a single elastic search bulk request. Errors are logged.
+    :param employees: list of Employee
+    :param action: str index or delete
+    :return: boolean True if succeeded
+    """
+    if not employees:
+        return True
+    try:
+        EmployeeDocument().update(employees, refresh=False, action=action)
+    except Exception as e:
+        log.error("Not able to {} the employees in elastic search: {}".format(action, e))
+        return False
+    return True
+
+
+def _refresh_employee_index():
+    """
+    Refresh the employee index once after bulk operations if auto refresh is enabled.
+    :return: None
+    """
+    if EmployeeDocument.django.auto_refresh:
+        try:
+            EmployeeDocument._index.refresh()
+        except Exception as e:
+            log.error("Not able to refresh the employee index: {}".format(e))
+    return None
+
+
+def bulk_create_employee(app_context, data_dict):
+    """
+    Create many employees in a single call (e.g. onboarding). Each employee is validated same as create_employee
+    and errors are reported per employee, valid employees are created.
+
+        - Employees and extras are inserted with set based inserts in chunks (HR_MGMT_BULK_CHUNK_SIZE), each chunk
+          in a transaction (model_helper.bulk_create_multi_table). If a chunk fails (e.g. duplicate created
+          meanwhile) all the employees of the chunk are reported with the error.
+        - Each chunk is indexed with a single elastic search bulk request.
+        - Api keys are not created (hashing is slow), use the management command provision_api_keys or
+          generate_api_key.
+        - Welcome emails are queued in the outbox in the transaction of the chunk and sent in the background.
+
+    Access: Same as create_employee.
+
+    :parameter
+        employees: list of employee dict (same as create_employee), max HR_MGMT_BULK_MAX_RECORDS
+
+    :param app_context: dict (contains user information)
+    :param data_dict: dict
+    :return: dict {created: [{index, id, employee_id}], errors: [{index, employee_id, errors}]}
+    """
+    log.info("Checking authorization")
+    auth.employee_create(app_context)
+    _employees = data_dict.get('employees')
+    _max_records = int(config.get('HR_MGMT_BULK_MAX_RECORDS', 5000))
+    _chunk_size = int(config.get('HR_MGMT_BULK_CHUNK_SIZE', 500))
+
+    if not isinstance(_employees, list) or not _employees:
+        raise err.ValidationError({
+            "employees": "employees should be a non empty list"
+        })
+    if len(_employees) > _max_records:
+        raise err.ValidationError({
+            "employees": "Max {} employees are allowed".format(_max_records)
+        })
+
+    _schema = schemas.get_frozen_schema('employee_schema')
+    errors = dict()
+    _valid = []
+
+    log.info("Validating {} employees for bulk create".format(len(_employees)))
+    _seen = dict()
+    for index, _data in enumerate(_employees):
+        try:
+            if not isinstance(_data, dict):
+                raise err.ValidationError({"employee": "Employee should be a dict"})
+            _validate_employee_create_data(_data)
+            employee_model, _extras = _build_employee_models(_data, _schema)
+            employee_model.normalize_fields()
+        except Exception as e:
+            log.error(e)
+            errors[index] = e.args[0] if e.args else str(e)
+            continue
+
+        for _key, _val in (("employee_id", employee_model.employee_id), ("work_email", employee_model.work_email)):
+            if (_key, _val.lower()) in _seen:
+                errors[index] = {_key: "Duplicate {} in the given employees".format(_key)}
+                break
+        else:
+            _seen[("employee_id", employee_model.employee_id.lower())] = index
+            _seen[("work_email", employee_model.work_email.lower())] = index
+            _valid.append((index, employee_model, _extras))
+
+    # Existing employees with a single query
+    _existing = models.Employee.objects.filter(
+        Q(employee_id__in=[_e.employee_id for _, _e, _ in _valid]) |
+        Q(work_email__in=[_e.work_email for _, _e, _ in _valid])
+    ).values_list('employee_id', 'work_email')
+    for _employee_id, _work_email in _existing:
+        for _key, _val in (("employee_id", _employee_id), ("work_email", _work_email)):
+            index = _seen.get((_key, _val.lower()))
+            if index is not None:
+                errors[index] = {_key: "Employee with {} already exists".format(_key)}
+    _valid = [_item for _item in _valid if _item[0] not in errors]
+
+    _manager_errors = _resolve_reporting_managers([_e for _, _e, _ in _valid])
+    for _i in _manager_errors:
+        errors[_valid[_i][0]] = _manager_errors[_i]
+    _valid = [_item for _item in _valid if _item[0] not in errors]
+
+    created = []
+    for _start in range(0, len(_valid), _chunk_size):
+        _chunk = _valid[_start:_start + _chunk_size]
+        _chunk_employees = [_e for _, _e, _ in _chunk]
+        log.info("Creating employees chunk: {} - {}".format(_start, _start + len(_chunk)))
+        try:
+            with model_transaction.atomic():
+                # QuerySet.bulk_create does not support multi table inheritance (Employee -> BaseProfile)
+                model_helper.bulk_create_multi_table(models.Employee, _chunk_employees)
+                _chunk_extras = [_extra for _, _, _extras in _chunk for _extra in _extras]
+                for _extra in _chunk_extras:
+                    # Employee primary key (baseprofile_ptr) is set by the insert
+                    _extra.employee_id = _extra.employee.pk
+                models.EmployeeExtras.objects.bulk_create(_chunk_extras)
+                email.queue_email_create_employees(_chunk_employees)
+        except Exception as e:
+            log.error(e)
+            for index, _, _ in _chunk:
+                errors[index] = {"employee": "Not able to create the employee: {}".format(e)}
+            api_jobs.set_progress(app_context, _start + len(_chunk), len(_valid))
+            continue
+
+        _index_employees(_chunk_employees)
+        created.extend({
+            "index": index,
+            "id": _employee.id,
+            "employee_id": _employee.employee_id
+        } for index, _employee, _ in _chunk)
+        api_jobs.set_progress(app_context, _start + len(_chunk), len(_valid))
+
+    if created:
+        _refresh_employee_index()
+
+    return {
+        "created": created,
+        "errors": [{
+            "index": index,
+            "employee_id": _employees[index].get('employee_id', '') if isinstance(_employees[index], dict) else '',
+            "errors": errors[index]
+        } for index in sorted(errors)],
+        "created_count": len(created),
+        "error_count": len(errors)
+    }
+
+
 def update_employee(app_context, data_dict):
     """
     Update employee profile. Parameter should contain id - representing unique id of the employee of id as employee id.
@@ -120,14 +333,11 @@ def update_employee(app_context, data_dict):
     _id = data_dict.pop('id', None)
 
     _files = app_context.get('files', '')
-    _schema = schemas.get_schema('employee_schema')
+    _schema = schemas.get_frozen_schema('employee_schema')
+    _update_fields = _schema.get_update_fields(role)
+    _columns, _ = _schema.get_model_fields(models.Employee)
     log.info("Updating an employee for an id: {}".format(_id))
-    if data_dict.get('skills', ''):
-        _skills = data_dict['skills']
-        if isinstance(_skills, str):
-            # Hack for multipart/form-data?? Dont know if this is the right way
-            # TODO: need to create a data insert pre processing pipeline
-            data_dict['skills'] = [s.strip().title() for s in _skills.split(",")]
+    schemas.normalize("employee_schema", data_dict)
 
     if role == "all":
         err.ValidationError({
@@ -161,17 +371,14 @@ def update_employee(app_context, data_dict):
             _extras = []
 
             for _key in data_dict:
-                if _key in _schema['properties']:
+                if _key in _schema.properties:
                     try:
-                        _property = _schema['properties'][_key]
-                        _update = _property.get('update', "").split(" ")
-
-                        if role not in _update:
+                        if _key not in _update_fields:
                             raise err.NotAuthorizedError({
                                 _key: "Not authorized to update the value"
                             })
 
-                        if hasattr(_employee, _key):
+                        if _key in _columns:
                             setattr(_employee, _key, data_dict.get(_key))
                         else:
                             for _emp_ext in _emp_extras:
@@ -213,6 +420,467 @@ def update_employee(app_context, data_dict):
     return result
 
 
+def _check_bulk_update_fields(fields, schema, role):
+    """
+    Check the fields to be updated against the employee schema (update attribute) once per field.
+    :param fields: set of field names
+    :param schema: EMAppSchema employee schema
+    :param role: str
+    :return: tuple (list of employee table columns, list of extras keys)
+    """
+    _unknown = sorted(fields.difference(schema.properties))
+    if _unknown:
+        raise err.ValidationError({
+            "changes": "Not allowed parameter: {}".format(_unknown[0])
+        })
+
+    _not_allowed = sorted(fields.difference(schema.get_update_fields(role)))
+    if _not_allowed:
+        raise err.NotAuthorizedError({
+            _not_allowed[0]: "Not authorized to update the value"
+        })
+
+    _columns, _ = schema.get_model_fields(models.Employee)
+    return [_f for _f in fields if _f in _columns], [_f for _f in fields if _f not in _columns]
+
+
+def _validate_employee_changes(changes):
+    """
+    Prepare and validate the changes of a bulk update against the employee schema (only the given fields).
+    :param changes: dict
+    :return: None (raises err.ValidationError)
+    """
+    if not isinstance(changes, dict) or not changes:
+        raise err.ValidationError({
+            "changes": "changes should be a non empty dict"
+        })
+
+    schemas.normalize("employee_schema", changes)
+    schemas.validate("employee_schema", changes, partial=True)
+    return None
+
+
+def _normalize_employee_changes(changes, fields):
+    """
+    Normalize the employee table columns of the changes same as Employee.save (bulk updates do not call save).
+    :param changes: dict
+    :param fields: list (employee table columns)
+    :return: dict
+    """
+    _employee = models.Employee(**{_f: changes[_f] for _f in fields if _f in changes})
+    _employee.normalize_fields()
+    return {_f: getattr(_employee, _f) for _f in fields if _f in changes}
+
+
+def _save_employee_extras(changes):
+    """
+    Update or create the extras of many employees with a query per operation.
+    :param changes: list of tuple (employee id, dict {key: value})
+    :return: None
+    """
+    _keys = set(_key for _, _changes in changes for _key in _changes)
+    if not _keys:
+        return None
+
+    _existing = dict(((_extra.employee_id, _extra.key), _extra) for _extra in models.EmployeeExtras.objects.filter(
+        employee_id__in=[_id for _id, _ in changes], key__in=_keys))
+    _update, _create = [], []
+    for _id, _changes in changes:
+        for _key, _val in _changes.items():
+            _extra = model_helper.create_extras_table_values(
+                extras_model=models.EmployeeExtras,
+                connecting_key="employee_id",
+                connecting_model=_id,
+                key=_key,
+                value=_val
+            )
+            _row = _existing.get((_id, _key))
+            if _row is None:
+                _create.append(_extra)
+            else:
+                _row.value = _extra.value
+                _update.append(_row)
+
+    models.EmployeeExtras.objects.bulk_update(_update, ['value'])
+    models.EmployeeExtras.objects.bulk_create(_create)
+    return None
+
+
+def _invalidate_employee_api_keys(employee_ids):
+    """
+    Invalidate the cached api keys (role might have changed) of the given employees.
+    :param employee_ids: list
+    :return: None
+    """
+    for _api_key_id in models.Employee.objects.filter(
+            id__in=employee_ids, _api_key__isnull=False).values_list('_api_key_id', flat=True):
+        api_key_cache.invalidate(_api_key_id)
+    return None
+
+
+def _bulk_update_employee_list(app_context, items, schema, max_records, chunk_size):
+    """
+    Bulk update for the list of {id, changes}. See bulk_update_employee.
+    :return: dict
+    """
+    if not isinstance(items, list) or not items:
+        raise err.ValidationError({
+            "employees": "employees should be a non empty list"
+        })
+    if len(items) > max_records:
+        raise err.ValidationError({
+            "employees": "Max {} employees are allowed".format(max_records)
+        })
+
+    _fields = set()
+    for _item in items:
+        if isinstance(_item, dict) and isinstance(_item.get('changes'), dict):
+            _fields.update(_item['changes'])
+    _model_fields, _extras_fields = _check_bulk_update_fields(_fields, schema, app_context.get('role'))
+
+    errors = dict()
+    _valid = []
+    for index, _item in enumerate(items):
+        try:
+            if not isinstance(_item, dict) or not _item.get('id'):
+                raise err.ValidationError({"id": "id parameter is required."})
+            _validate_employee_changes(_item.get('changes'))
+        except Exception as e:
+            log.error(e)
+            errors[index] = e.args[0] if e.args else str(e)
+            continue
+        _valid.append((index, str(_item['id']), _item['changes']))
+
+    # Employees by id or employee id with a single query
+    _ids = [_id for _, _id, _ in _valid]
+    _employees = dict()
+    for _employee in models.Employee.objects.filter(
+            Q(id__in=_ids) | Q(employee_id__in=[_id.lower() for _id in _ids])):
+        _employees[_employee.id] = _employee
+        _employees[_employee.employee_id] = _employee
+
+    _items = []
+    _seen = set()
+    for index, _id, _changes in _valid:
+        _employee = _employees.get(_id) or _employees.get(_id.lower())
+        if _employee is None:
+            errors[index] = {"employee_id_or_id": "Employee not found."}
+        elif _employee.id in _seen:
+            errors[index] = {"employee_id_or_id": "Duplicate employee in the given employees"}
+        else:
+            _seen.add(_employee.id)
+            for _key, _val in _normalize_employee_changes(_changes, _model_fields).items():
+                setattr(_employee, _key, _val)
+            _items.append((index, _employee, _changes))
+
+    _managers = [_item for _item in _items if _item[2].get('reporting_manager')]
+    _manager_errors = _resolve_reporting_managers([_employee for _, _employee, _ in _managers])
+    for _i in _manager_errors:
+        errors[_managers[_i][0]] = _manager_errors[_i]
+    _items = [_item for _item in _items if _item[0] not in errors]
+
+    updated = []
+    for _start in range(0, len(_items), chunk_size):
+        _chunk = _items[_start:_start + chunk_size]
+        _chunk_employees = [_employee for _, _employee, _ in _chunk]
+        _chunk_fields = set(_f for _, _, _changes in _chunk for _f in _changes if _f in _model_fields)
+        _now = timezone.now()
+        for _employee in _chunk_employees:
+            _employee.updated_at = _now
+
+        log.info("Updating employees chunk: {} - {}".format(_start, _start + len(_chunk)))
+        try:
+            with model_transaction.atomic():
+                models.Employee.objects.bulk_update(_chunk_employees, sorted(_chunk_fields | {"updated_at"}))
+                _save_employee_extras([
+                    (_employee.id, {_k: _v for _k, _v in _changes.items() if _k in _extras_fields})
+                    for _, _employee, _changes in _chunk
+                ])
+        except Exception as e:
+            log.error(e)
+            for index, _, _ in _chunk:
+                errors[index] = {"employee": "Not able to update the employee: {}".format(e)}
+            api_jobs.set_progress(app_context, _start + len(_chunk), len(_items))
+            continue
+
+        if "role" in _chunk_fields:
+            _invalidate_employee_api_keys([_employee.id for _employee in _chunk_employees])
+        _index_employees(_chunk_employees)
+        updated.extend({
+            "index": index,
+            "id": _employee.id,
+            "employee_id": _employee.employee_id
+        } for index, _employee, _ in _chunk)
+        api_jobs.set_progress(app_context, _start + len(_chunk), len(_items))
+
+    if updated:
+        _refresh_employee_index()
+
+    return {
+        "updated": updated,
+        "errors": [{
+            "index": index,
+            "id": items[index].get('id', '') if isinstance(items[index], dict) else '',
+            "errors": errors[index]
+        } for index in sorted(errors)],
+        "updated_count": len(updated),
+        "error_count": len(errors)
+    }
+
+
+def _bulk_update_employee_filter(app_context, filters, changes, schema, max_records, chunk_size):
+    """
+    Bulk update of the same changes for the employees matching the filters. See bulk_update_employee.
+    :return: dict
+    """
+    if not isinstance(filters, dict) or not filters:
+        raise err.ValidationError({
+            "filters": "filters should be a non empty dict"
+        })
+
+    _filter_fields = set(_f for _f in schema.get_model_fields(models.Employee)[0]
+                         if schema.properties[_f].get('type') == "string")
+    _unknown = sorted(set(filters).difference(_filter_fields))
+    if _unknown:
+        raise err.ValidationError({
+            "filters": "Not allowed filter: {}".format(_unknown[0])
+        })
+
+    if not isinstance(changes, dict) or not changes:
+        raise err.ValidationError({
+            "changes": "changes should be a non empty dict"
+        })
+    _model_fields, _extras_fields = _check_bulk_update_fields(set(changes), schema, app_context.get('role'))
+    for _unique in ("employee_id", "work_email"):
+        if _unique in changes:
+            raise err.ValidationError({
+                _unique: "Unique field cannot be updated with filters"
+            })
+    _validate_employee_changes(changes)
+    _changes = _normalize_employee_changes(changes, _model_fields)
+
+    _ids = list(models.Employee.objects.filter(**filters).values_list('id', flat=True))
+    if len(_ids) > max_records:
+        raise err.ValidationError({
+            "filters": "Max {} employees are allowed, {} employees matched".format(max_records, len(_ids))
+        })
+
+    if _changes.get('reporting_manager'):
+        try:
+            _manager = models.Employee.get_employee_by_email(_changes['reporting_manager'])
+        except err.NotFoundError:
+            raise err.ValidationError({
+                "reporting_manager": "Given reporting manager not available"
+            })
+        if _manager.id in _ids:
+            raise err.ValidationError({
+                "reporting_manager": "You cannot assign yourself as reporting manager"
+            })
+        _changes['reporting_manager'] = _manager.id
+
+    log.info("Updating {} employees with filters: {}".format(len(_ids), filters))
+    with model_transaction.atomic():
+        models.Employee.objects.filter(id__in=_ids).update(updated_at=timezone.now(), **_changes)
+        _save_employee_extras([
+            (_id, {_k: _v for _k, _v in changes.items() if _k in _extras_fields}) for _id in _ids
+        ])
+
+    if "role" in _changes:
+        _invalidate_employee_api_keys(_ids)
+
+    updated = []
+    for _start in range(0, len(_ids), chunk_size):
+        _chunk_employees = list(models.Employee.objects.filter(id__in=_ids[_start:_start + chunk_size]))
+        _index_employees(_chunk_employees)
+        updated.extend({"id": _employee.id, "employee_id": _employee.employee_id} for _employee in _chunk_employees)
+        api_jobs.set_progress(app_context, len(updated), len(_ids))
+
+    if updated:
+        _refresh_employee_index()
+
+    return {
+        "updated": updated,
+        "errors": [],
+        "updated_count": len(updated),
+        "error_count": 0
+    }
+
+
+def bulk_update_employee(app_context, data_dict):
+    """
+    Update many employees in a single call (e.g. position change of a team or address change after an office
+    move). Either a list of employees with their changes or filters with the changes for all the matching
+    employees are given.
+
+        - Authorization and the schema update access are checked once per field for the role.
+        - Changes are validated only for the given fields (schemas.validate partial).
+        - Employees are updated with bulk_update (list) or a single update query (filters), extras are updated
+          with a query per operation and employees are reindexed with elastic search bulk requests.
+        - With the list errors are reported per employee, with filters any error fails the whole update.
+        - Unique fields (employee_id, work_email) cannot be updated with filters. Avatar is not supported.
+
+    Access: Admin/HR only.
+
+    :parameter
+        employees: list of {id: id or employee id, changes: dict} (max HR_MGMT_BULK_MAX_RECORDS)
+        or
+        filters: dict equality filters on the employee string fields (e.g. {"position": "Developer"})
+        changes: dict
+
+    :param app_context: dict (contains user information)
+    :param data_dict: dict
+    :return: dict {updated: [{index, id, employee_id}], errors: [{index, id, errors}]}
+    """
+    log.info("Checking authorization")
+    auth.employee_bulk_update(app_context)
+    _schema = schemas.get_frozen_schema('employee_schema')
+    _max_records = int(config.get('HR_MGMT_BULK_MAX_RECORDS', 5000))
+    _chunk_size = int(config.get('HR_MGMT_BULK_CHUNK_SIZE', 500))
+
+    if 'employees' in data_dict:
+        if 'filters' in data_dict:
+            raise err.ValidationError({
+                "filters": "Either employees or filters should be given"
+            })
+        return _bulk_update_employee_list(app_context, data_dict['employees'], _schema, _max_records, _chunk_size)
+
+    return _bulk_update_employee_filter(app_context, data_dict.get('filters'), data_dict.get('changes'), _schema,
+                                        _max_records, _chunk_size)
+
+
+def bulk_delete_employee(app_context, data_dict):
+    """
+    Delete many employees in a single call (e.g. offboarding). Employees are resolved with a single query.
+
+        - Employees and the related rows (extras, tasks, project members etc.) are deleted with set based
+          queries in chunks (HR_MGMT_BULK_CHUNK_SIZE), each chunk in a transaction (model_helper.delete_cascade).
+          If a chunk fails (e.g. employee is a department head) all the employees of the chunk are reported.
+        - Each chunk is deleted from elastic search with a single bulk request.
+        - Avatars are removed in the background after the commit.
+
+    Access: Same as delete_employee.
+
+    :parameter
+        ids: list of id or employee id (max HR_MGMT_BULK_MAX_RECORDS)
+
+    :param app_context: dict (contains user information)
+    :param data_dict: dict
+    :return: dict {deleted: [{id, employee_id}], errors: [{id, errors}]}
+    """
+    auth.employee_delete(app_context)
+    _ids = data_dict.get('ids')
+    _max_records = int(config.get('HR_MGMT_BULK_MAX_RECORDS', 5000))
+    _chunk_size = int(config.get('HR_MGMT_BULK_CHUNK_SIZE', 500))
+
+    if not isinstance(_ids, list) or not _ids:
+        raise err.ValidationError({
+            "ids": "ids should be a non empty list"
+        })
+    if len(_ids) > _max_records:
+        raise err.ValidationError({
+            "ids": "Max {} employees are allowed".format(_max_records)
+        })
+
+    _ids = [str(_id) for _id in _ids]
+    log.info("Deleting {} employees".format(len(_ids)))
+    _employees = dict()
+    for _employee in models.Employee.objects.filter(
+            Q(id__in=_ids) | Q(employee_id__in=[_id.lower() for _id in _ids])).only(
+            "id", "employee_id", "avatar", "_api_key"):
+        _employees[_employee.id] = _employee
+        _employees[_employee.employee_id] = _employee
+
+    errors = dict()
+    _to_delete = dict()
+    for _id in _ids:
+        _employee = _employees.get(_id) or _employees.get(_id.lower())
+        if _employee is None:
+            errors[_id] = {"employee_id_or_id": "Employee not found."}
+        else:
+            _to_delete[_employee.id] = _employee
+    _to_delete = list(_to_delete.values())
+
+    deleted = []
+    _avatars = []
+    for _start in range(0, len(_to_delete), _chunk_size):
+        _chunk = _to_delete[_start:_start + _chunk_size]
+        log.info("Deleting employees chunk: {} - {}".format(_start, _start + len(_chunk)))
+        try:
+            with model_transaction.atomic():
+                model_helper.delete_cascade(models.Employee, [_employee.id for _employee in _chunk])
+        except Exception as e:
+            log.error(e)
+            for _employee in _chunk:
+                errors[_employee.id] = e.args[0] if e.args else str(e)
+            api_jobs.set_progress(app_context, _start + len(_chunk), len(_to_delete))
+            continue
+
+        for _employee in _chunk:
+            if _employee._api_key_id:
+                api_key_cache.invalidate(_employee._api_key_id)
+            if _employee.avatar:
+                _avatars.append(_employee.avatar.path)
+        _index_employees(_chunk, action="delete")
+        deleted.extend({"id": _employee.id, "employee_id": _employee.employee_id} for _employee in _chunk)
+        api_jobs.set_progress(app_context, _start + len(_chunk), len(_to_delete))
+
+    if deleted:
+        _refresh_employee_index()
+    files.remove_files_async(_avatars)
+
+    return {
+        "deleted": deleted,
+        "errors": [{"id": _id, "errors": _errors} for _id, _errors in errors.items()],
+        "deleted_count": len(deleted),
+        "error_count": len(errors)
+    }
+
+
+_META_FIELDS = ("id", "created_at", "updated_at", "avatar")
+
+
+def _get_projection_fields(data_dict, schema, role, allowed_fields=None):
+    """
+    Field projection for the employee read apis. Fields can be given as list or comma separated string in
+    the parameter fields. Fields that are not visible to the role (schema show attribute) are dropped.
+
+    :param data_dict: dict
+    :param schema: EMAppSchema employee schema
+    :param role: str
+    :param allowed_fields: iterable (optional) fields available in the api, default all schema properties
+    :return: list of fields or None if no projection is requested
+    """
+    _fields = data_dict.get('fields')
+    if _fields is None or _fields == '':
+        return None
+
+    if not isinstance(_fields, list):
+        if not isinstance(_fields, str):
+            raise err.ValidationError({
+                "fields": "Fields should be list or comma separated string"
+            })
+        _fields = _fields.split(",")
+    _fields = [str(_field).strip() for _field in _fields if str(_field).strip()]
+
+    if allowed_fields is None:
+        allowed_fields = tuple(schema.properties) + _META_FIELDS
+    _unknown = [_field for _field in _fields if _field not in allowed_fields]
+    if _unknown:
+        raise err.ValidationError({
+            "fields": "Unknown fields: {}".format(", ".join(_unknown))
+        })
+
+    result = list()
+    for _field in _fields:
+        if _field in result:
+            continue
+        if _field in _META_FIELDS:
+            result.append(_field)
+        elif _field in schema.get_show_fields(role):
+            result.append(_field)
+    return result
+
+
 def show_employee(app_context, data_dict):
     """
     Show employee for the given employee id or employee unique identifier.
@@ -224,6 +892,9 @@ def show_employee(app_context, data_dict):
         - admin hr member: show admin and to hr and user profile (logged in user ==  requested user profile)
         - all: show to every logged in user
 
+    Only the given fields are returned if parameter fields is given e.g. fields=first_name,work_email,id
+    (list or comma separated string), fields not visible to the user are ignored.
+
     :param app_context: dict
     :param data_dict: dict (containing employee_id oir id)
     :return: dict
@@ -233,7 +904,7 @@ def show_employee(app_context, data_dict):
     _user = app_context.get('user')
     role = app_context.get('role')
     _id = data_dict.get('id', '')
-    _schema = schemas.get_schema('employee_schema')
+    _schema = schemas.get_frozen_schema('employee_schema')
 
     log.info("Showing the employee data for id: {}".format(_id))
 
@@ -242,31 +913,154 @@ def show_employee(app_context, data_dict):
             "id": "id parameter is required."
         })
 
-    _employee = models.Employee.get_employee_by_id(_id)
+    # Fields are restricted further below if the member is requesting some other profile
+    _fields = _get_projection_fields(data_dict, _schema, role)
+    _employee = models.Employee.get_employee_by_id(_id, fields=_fields)
 
     # If logged in user and requesting profile are not same
     if role == "member":
         if _user.id != _employee.id:
             role = "all"
 
-    _data = _employee.as_dict()
+    _data = _employee.as_dict(fields=_fields)
 
     response = dict()
 
-    for _property in _schema['properties']:
-        _show = _schema['properties'][_property].get('show', "").split(" ")
-        if role in _show:
+    _show = _schema.get_show_fields(role)
+    for _property in _schema.properties:
+        if _fields is not None and _property not in _fields:
+            continue
+        if _property in _show:
             response[_property] = _data[_property]
 
-    for x in ("id", "created_at", "updated_at", "avatar"):
-        response[x] = _data[x]
+    for x in _META_FIELDS:
+        if _fields is None or x in _fields:
+            response[x] = _data[x]
 
     return response
 
 
+def show_employee_validator(app_context, data_dict):
+    """
+    Conditional GET validators for show_employee (see register.py). Response of show_employee changes if the
+    employee is updated, the effective role of the logged in user, the requested fields or the employee schema
+    changes.
+
+    Only the employee id and updated_at is fetched from the database.
+
+    :param app_context: dict
+    :param data_dict: dict (containing employee_id oir id)
+    :return: tuple (tag, last_modified) or None
+    """
+    auth.employee_show(app_context)
+    _user = app_context.get('user')
+    role = app_context.get('role')
+    _id = data_dict.get('id', '')
+
+    if not _id:
+        return None
+
+    _employees = list(models.Employee.objects.filter(
+        Q(id=_id) | Q(employee_id__iexact=_id) | Q(username__iexact=_id)
+    ).values_list('id', 'updated_at')[:2])
+
+    # Not found or multiple employees. Let show_employee raise the error
+    if len(_employees) != 1:
+        return None
+
+    _employee_id, _updated_at = _employees[0]
+    if role == "member" and _user.id != _employee_id:
+        role = "all"
+
+    _fields = _get_projection_fields(data_dict, schemas.get_frozen_schema('employee_schema'), app_context.get('role'))
+    tag = "{}:{}:{}:{}:{}".format(_employee_id, _updated_at.isoformat(), role,
+                                  schemas.get_schema_hash('employee_schema'),
+                                  ",".join(_fields) if _fields is not None else "*")
+    return tag, _updated_at
+
+
+def show_employee_cache_key(app_context, data_dict):
+    """
+    Cache key function for show_employee (see register.py). Member sees more fields on his/her own profile,
+    hence results of member role are cached per user.
+
+    :param app_context: dict
+    :param data_dict: dict
+    :return: str or None
+    """
+    if app_context.get('role') == "member":
+        return app_context.get('user').id
+    return None
+
+
+def _encode_cursor(sort_values):
+    """
+    Opaque cursor for the search_after pagination (url safe, without padding)
+    :param sort_values: list (sort values of the last hit)
+    :return: str
+    """
+    return base64.urlsafe_b64encode(json.dumps(list(sort_values)).encode('utf-8')).decode('ascii').rstrip("=")
+
+
+def _decode_cursor(cursor):
+    """
+    :param cursor: str (from _encode_cursor)
+    :return: list sort values
+    """
+    try:
+        sort_values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode('utf-8'))
+    except (TypeError, ValueError, binascii.Error) as e:
+        log.error(e)
+        sort_values = None
+
+    if not isinstance(sort_values, list) or len(sort_values) != 2:
+        raise err.ValidationError({
+            "cursor": "Invalid cursor"
+        })
+    return sort_values
+
+
+def _get_next_cursor(hits, page_size):
+    """
+    Cursor for the next page given the hits of the current page (search with cursor).
+    :param hits: list of hits
+    :param page_size: int
+    :return: str or None if it is the last page
+    """
+    if not hits or len(hits) < page_size:
+        return None
+    return _encode_cursor(hits[-1].meta.sort)
+
+
+def _stream_employees(profiles, offset, limit, fields=None):
+    """
+    Stream the employees of the search from offset with scan (scroll). Hits before offset are skipped, unlike
+    from/size it is not limited by the index max_result_window. Scroll is cleared once the stream ends or is
+    closed (e.g. client disconnected) before reaching the end.
+
+    :param profiles: Elastic search document search
+    :param offset: int
+    :param limit: int number of employees after offset
+    :param fields: list projection fields or None
+    :return: generator of dict
+    """
+    _scan = profiles.params(preserve_order=True).scan()
+    try:
+        for _p in itertools.islice(_scan, offset, offset + limit):
+            yield _p.as_dict(fields=fields)
+    finally:
+        _scan.close()
+
+
 def _search_employee_for_pagination(app_context, data_dict):
     """
     This function is for internal use only. Utilized by views for pagination
+
+    Cursor pagination: If data_dict contains cursor (empty for the first page), results are sorted by score and id
+    (stable order) and fetched after the cursor with search_after. Slice the search from 0 (page size) and get
+    the cursor for the next page with _get_next_cursor. Unlike from/size, it is not limited to 10000 hits and the
+    cost does not grow with the page number.
+
     :return: Elastic search document
     """
 
@@ -310,6 +1104,11 @@ def _search_employee_for_pagination(app_context, data_dict):
                 query=search_value,
                 fields=search_fields)
 
+    if 'cursor' in data_dict:
+        profiles = profiles.sort('_score', {'id': {'order': 'asc'}})
+        if data_dict['cursor']:
+            profiles = profiles.extra(search_after=_decode_cursor(data_dict['cursor']))
+
     return profiles
 
 
@@ -327,6 +1126,14 @@ def search_employee(app_context, data_dict):
     Max limit is 100. If no search_fields are give - full text search is performed.
     Employee can also be searched from elastic search dictionary using parameter raw_query
 
+    Streaming: If the client opted in for streaming (app_context stream), results are returned as a generator
+    of employees without res_count, limit is the number of employees streamed after offset and max limit is
+    API_STREAM_MAX_LIMIT. Employees are streamed with scan (scroll), hence offset is not limited to 10000.
+
+    Cursor: If parameter cursor is given (empty for the first page), limit is the page size and the response
+    contains next_cursor (None on the last page) to get the next page. Use it to page through all the employees,
+    offset is not allowed with cursor and it is not supported with streaming.
+
     :parameter
         search_fields: list
             Fields to perform search operation, if not given defaulkt value is used
@@ -336,6 +1143,11 @@ def search_employee(app_context, data_dict):
             Offset
         limit: int
             max value is 100
+        fields: list or comma separated str
+            Only these fields are returned (default search fields and id), fields not visible to the user
+            are ignored
+        cursor: str
+            next_cursor from the previous page, empty for the first page
 
     :param app_context: dict application context
     :param data_dict: dict
@@ -343,26 +1155,55 @@ def search_employee(app_context, data_dict):
     """
     limit = data_dict.get('limit', 20)
     offset = data_dict.get('offset', 0)
+    # Query string parameters (GET) are str
+    limit = int(limit) if isinstance(limit, str) and limit.isdigit() else limit
+    offset = int(offset) if isinstance(offset, str) and offset.isdigit() else offset
+    _is_stream = app_context.get('stream', False)
+    _max_limit = int(config.get('API_STREAM_MAX_LIMIT', 10000)) if _is_stream else 100
     if not isinstance(offset, int):
         raise err.ValidationError({
             'offset': "Offset should be integer"
         })
 
-    if not isinstance(limit, int) or limit > 100:
+    if not isinstance(limit, int) or limit > _max_limit:
+        raise err.ValidationError({
+            "limit": "Should be integer and max value allowed is {}".format(_max_limit)
+        })
+
+    _is_cursor = 'cursor' in data_dict
+    if _is_cursor and (offset or _is_stream):
         raise err.ValidationError({
-            "limit": "Should be integer and max value allowed is 100"
+            "cursor": "Cursor is not supported with offset or streaming"
         })
 
     # Authorization is checked in this function
     profiles = _search_employee_for_pagination(app_context, data_dict)
 
+    _fields = _get_projection_fields(
+        data_dict, schemas.get_frozen_schema('employee_schema'), app_context.get('role'),
+        allowed_fields=EmployeeDocument.default_search_fields_full_text() + ("id", )
+    )
+    if _fields is not None:
+        # Only the requested fields are fetched from the index
+        profiles = profiles.source(includes=_fields)
+
+    if _is_stream:
+        # Scan fetches the hits from the index in chunks, hence memory does not grow with limit
+        return _stream_employees(profiles, offset, limit, fields=_fields)
+
     results = {
         "results": [],
         "res_count": profiles.count()
     }
 
+    if _is_cursor:
+        _hits = list(profiles[0:limit])
+        results['results'] = [_p.as_dict(fields=_fields) for _p in _hits]
+        results['next_cursor'] = _get_next_cursor(_hits, limit)
+        return results
+
     for _p in profiles[offset:limit]:
-        results['results'].append(_p.as_dict())
+        results['results'].append(_p.as_dict(fields=_fields))
     return results
 
 
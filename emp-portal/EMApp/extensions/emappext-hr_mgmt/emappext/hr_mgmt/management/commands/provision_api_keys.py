@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from emappext.hr_mgmt.models import Employee
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Generate API keys for the employees without an API key (e.g. created with bulk_create_employee)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help="Max number of employees")
+
+    def handle(self, *args, **options):
+        """
+        Generate the api keys for the employees without an api key
+        :param args:
+        :param options:
+        :return:
+        """
+        count = Employee.provision_api_keys(limit=options['limit'])
+        log.info("Generated api keys for {} employees".format(count))
@@ -3,6 +3,7 @@ from django.contrib.postgres.fields import ArrayField
 from django.contrib.auth.models import BaseUserManager
 from rest_framework_api_key.models import APIKey
 from emappcore.utils import model_helper, errors as err
+from emappcore.utils.api_key_cache import api_key_cache
 from emappcore.common import schemas
 from emappext.hr_mgmt.models._user_manager import CustomUserManager
 from emappext.hr_mgmt.models.user import BaseProfile
@@ -49,6 +50,32 @@ class Employee(BaseProfile):
     def __str__(self):
         return "{} {}".format(self.employee_id, self.id)
 
+    def normalize_fields(self):
+        """
+        Clean the data before saving to the database. Called on save, bulk creates (which do not call save)
+        should call it for each instance.
+        :return: None
+        """
+        self.username = self.normalize_username(self.username)
+        self.work_email = BaseUserManager.normalize_email(self.work_email)
+
+        _fields = (
+            "employee_id",
+        )
+        for _field in _fields:
+            val = getattr(self, _field)
+            if val:
+                setattr(self, _field, val.lower().strip())
+
+        if not self.graduated_year:
+            self.graduated_year = None
+
+        # TODO default array doesnt work - Hack
+        if not getattr(self, "skills"):
+            self.skills = list()
+
+        return None
+
     def save(self, *args, **kwargs):
         """
         Clean the data before saving to the database also generate api key if no key
@@ -56,8 +83,7 @@ class Employee(BaseProfile):
         :param kwargs:
         :return:
         """
-        self.username = self.normalize_username(self.username)
-        self.work_email = BaseUserManager.normalize_email(self.work_email)
+        self.normalize_fields()
 
         if self.reporting_manager:
             try:
@@ -78,22 +104,22 @@ class Employee(BaseProfile):
             api_key, key = APIKey.objects.create_key(name=self.work_email)
             self._api_key = APIKey.objects.get_from_key(key)
 
-        _fields = (
-            "employee_id",
-        )
-        for _field in _fields:
-            val = getattr(self, _field)
-            if val:
-                setattr(self, _field, val.lower().strip())
-
-        if not self.graduated_year:
-            self.graduated_year = None
-
-        # TODO default array doesnt work - Hack
-        if not getattr(self, "skills"):
-            self.skills = list()
+        result = super(self.__class__, self).save(*args, **kwargs)
+        # Role or superuser flag might have changed
+        if self._api_key_id:
+            api_key_cache.invalidate(self._api_key_id)
+        return result
 
-        return super(self.__class__, self).save(*args, **kwargs)
+    def delete(self, *args, **kwargs):
+        """
+        Delete the employee and invalidate the cached api key
+        :param args:
+        :param kwargs:
+        :return:
+        """
+        if self._api_key_id:
+            api_key_cache.invalidate(self._api_key_id)
+        return super(self.__class__, self).delete(*args, **kwargs)
 
     @classmethod
     def get_employee_by_email(cls, email_id):
@@ -116,15 +142,28 @@ class Employee(BaseProfile):
         return _employees[0]
 
     @classmethod
-    def get_employee_by_id(cls, emp_id):
+    def get_model_field_names(cls):
+        """
+        Get the names of all the database columns of employee. Schema properties that are not
+        available here are stored in EmployeeExtras.
+        :return: set
+        """
+        return set(_field.name for _field in cls._meta.concrete_fields)
+
+    @classmethod
+    def get_employee_by_id(cls, emp_id, fields=None):
         """
         Get employee by id or employee_id
         :param emp_id: str
+        :param fields: list (optional) Only these fields are loaded from the database (other fields are deferred)
         :return: django model instance
         """
         log.info("Getting a employee instance for a id: {}".format(emp_id))
-        _employees = cls.objects.filter(id=emp_id) or cls.objects.filter(
-            employee_id__iexact=emp_id) or cls.objects.filter(username__iexact=emp_id)
+        _queryset = cls.objects.all()
+        if fields is not None:
+            _queryset = _queryset.only(*((set(fields) & cls.get_model_field_names()) | {"id"}))
+        _employees = _queryset.filter(id=emp_id) or _queryset.filter(
+            employee_id__iexact=emp_id) or _queryset.filter(username__iexact=emp_id)
 
         if not _employees:
             raise err.NotFoundError({
@@ -163,42 +202,114 @@ class Employee(BaseProfile):
 
         return api_key, key
 
-    def _as_dict(self):
+    @classmethod
+    def provision_api_keys(cls, limit=None):
+        """
+        Create api keys for the employees without an api key (e.g. created with bulk_create_employee, which defers
+        the api key creation as hashing the keys is slow).
+        :param limit: int (optional) max number of employees
+        :return: int number of api keys created
+        """
+        _employees = cls.objects.filter(_api_key__isnull=True).only("id", "work_email").order_by("created_at")
+        if limit:
+            _employees = _employees[:limit]
+
+        count = 0
+        for _employee in _employees:
+            log.info("Creating a new api key for: {}".format(_employee.id))
+            api_key, key = APIKey.objects.create_key(name=_employee.work_email)
+            cls.objects.filter(id=_employee.id, _api_key__isnull=True).update(_api_key=api_key)
+            count += 1
+        return count
+
+    @classmethod
+    def _get_dictize_schema(cls, fields=None):
+        """
+        Schema properties to extract and whether the extras table is needed. Extras table is needed only if
+        any of the fields is not a database column.
+        :param fields: list (optional)
+        :return: tuple (schema, boolean)
+        """
+        _schema = schemas.get_frozen_schema('employee_schema')
+        if fields is None:
+            return _schema, True
+        _, _extras_fields = _schema.get_model_fields(cls)
+        return {"properties": [k for k in _schema.properties if k in fields]}, any(k in fields for k in _extras_fields)
+
+    @staticmethod
+    def _clean_dict(schema_data):
+        if 'employee_id' in schema_data:
+            schema_data['employee_id'] = schema_data['employee_id'].upper()
+        return schema_data
+
+    def _get_meta_dict(self, fields=None):
+        _meta = {
+            "id": lambda: self.id,
+            "created_at": lambda: str(self.created_at),
+            "updated_at": lambda: str(self.updated_at),
+            "avatar": self._get_avatar_url
+        }
+        return {_key: _meta[_key]() for _key in _meta if fields is None or _key in fields}
+
+    def _as_dict(self, fields=None):
         """
         This for internal use only. The dict will not contain created_at, updated_at and id parameters
+
+        If fields are given only those schema properties are extracted and extras table is queried only
+        if any of the fields is not a database column.
+
+        :param fields: list (optional)
         :return:
         """
         log.info("Extracting employee data from the database")
-        _schema = schemas.get_schema('employee_schema')
+        _schema, _with_extras = self._get_dictize_schema(fields)
         schema_data = model_helper.model_dictize(
             db_models=(
                 self,
             ),
-            db_extras=(
-                EmployeeExtras.objects.filter(employee=self),
-            ),
+            db_extras=(EmployeeExtras.objects.filter(employee=self), ) if _with_extras else (),
             schema=_schema
         )
-        schema_data['employee_id'] = schema_data['employee_id'].upper()
-        return schema_data
+        return self._clean_dict(schema_data)
 
-    def as_dict(self):
+    def as_dict(self, fields=None):
         """
         Get database data for an employee given employee id or unique id
+        :param fields: list (optional) Only these fields are returned
         :return: dict
         """
-        schema_data = self._as_dict()
-        schema_data["id"] = self.id
-        schema_data['created_at'] = str(self.created_at)
-        schema_data['updated_at'] = str(self.updated_at)
+        schema_data = self._as_dict(fields=fields)
+        schema_data.update(self._get_meta_dict(fields))
+        return schema_data
+
+    @classmethod
+    def as_dict_many(cls, employees, fields=None):
+        """
+        Same as as_dict for a list of employees (e.g. list views, exports). Extras of all the employees are
+        fetched with a single query.
+        :param employees: queryset or list of employees
+        :param fields: list (optional) Only these fields are returned
+        :return: list of dict
+        """
+        employees = list(employees)
+        log.info("Extracting {} employees data from the database".format(len(employees)))
+        _schema, _with_extras = cls._get_dictize_schema(fields)
+        result = model_helper.model_dictize_many(
+            db_models=employees,
+            schema=_schema,
+            extras_model=EmployeeExtras if _with_extras else None,
+            connecting_key="employee"
+        )
+        for _employee, schema_data in zip(employees, result):
+            cls._clean_dict(schema_data).update(_employee._get_meta_dict(fields))
+        return result
 
+    def _get_avatar_url(self):
         try:
-            schema_data['avatar'] = self.avatar.url
+            return self.avatar.url
         except Exception as e:
             log.info(e)
-            schema_data['avatar'] = ''
-
-        return schema_data
+            return ''
 
 
 class EmployeeExtras(models.Model):
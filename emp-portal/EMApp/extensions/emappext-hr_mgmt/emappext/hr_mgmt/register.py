@@ -33,6 +33,11 @@ class EMAppHRManagementRegister(BaseAppCorePluginInterface, BaseAppRoutePluginIn
             - name: API name (str)
             - func: API function (function)
             - method: API method (GET, PUT, POST, DELETE)
+            - validator_func: (optional) conditional GET validators function (function) - GET only
+            - max_concurrency: (optional) max concurrent requests for the action (int)
+            - cache: (optional) GET result cache policy {tags, ttl, key_func} (dict)
+            - invalidates: (optional) cache tags invalidated by the action (list)
+            - async_ok: (optional) action can be run as a background job with async=1 (boolean)
 
         :param api: EMAppAPIActions class
         :return: None
@@ -40,32 +45,61 @@ class EMAppHRManagementRegister(BaseAppCorePluginInterface, BaseAppRoutePluginIn
         api.register(
             action_name="create_employee",
             action_func=employee_api.create_employee,
-            method='POST'
+            method='POST',
+            invalidates=["employee"]
+        )
+        api.register(
+            action_name="bulk_create_employee",
+            action_func=employee_api.bulk_create_employee,
+            method='POST',
+            invalidates=["employee"],
+            async_ok=True
         )
         api.register(
             action_name="update_employee",
             action_func=employee_api.update_employee,
-            method='POST'
+            method='POST',
+            invalidates=["employee"]
+        )
+        api.register(
+            action_name="bulk_update_employee",
+            action_func=employee_api.bulk_update_employee,
+            method='POST',
+            invalidates=["employee"],
+            async_ok=True
         )
         api.register(
             action_name="show_employee",
             action_func=employee_api.show_employee,
-            method='GET'
+            method='GET',
+            validator_func=employee_api.show_employee_validator,
+            cache={"tags": ["employee"], "key_func": employee_api.show_employee_cache_key}
         )
         api.register(
             action_name="search_employee",
             action_func=employee_api.search_employee,
-            method='GET'
+            method='GET',
+            max_concurrency=2,
+            cache={"tags": ["employee"]}
         )
         api.register(
             action_name="delete_employee",
             action_func=employee_api.delete_employee,
-            method='POST'
+            method='POST',
+            invalidates=["employee"]
+        )
+        api.register(
+            action_name="bulk_delete_employee",
+            action_func=employee_api.bulk_delete_employee,
+            method='POST',
+            invalidates=["employee"],
+            async_ok=True
         )
         api.register(
             action_name="suggestion_employee_index",
             action_func=suggestions_api.suggestion_employee_index,
-            method='GET'
+            method='GET',
+            cache={"tags": ["employee"]}
         )
 
         return None
@@ -4,12 +4,56 @@ from emappcore.common import schemas
 from emappext.hr_mgmt.utils import errors as hr_error
 from emappext.hr_mgmt.tests import test_data
 from emappext.hr_mgmt.models import Employee
+from rest_framework.test import APITestCase
 from django.test import Client
 from django.db import IntegrityError
+import copy
 
 url = "http://127.0.0.1/emapp/api/{}"
 
 
+def get_api_headers(key, **headers):
+    """
+    Json api headers for the given api key
+    :param key: str
+    :param headers: additional headers e.g. HTTP_IDEMPOTENCY_KEY
+    :return: dict
+    """
+    api_headers = {
+        "HTTP_API_KEY": key,
+        'content_type': 'application/json; charset=UTF-8',
+        'Accept': 'application/json'
+    }
+    api_headers.update(headers)
+    return api_headers
+
+
+def get_api_client(key, **headers):
+    """
+    Django test client with the json api headers for the given api key
+    :param key: str
+    :param headers: additional headers e.g. HTTP_IDEMPOTENCY_KEY
+    :return: Client
+    """
+    return Client(**get_api_headers(key, **headers))
+
+
+def get_test_employee(prefix, index, role="member"):
+    """
+    Employee data with minimum fields, employee id and work email are unique for the prefix and index
+    e.g. DLX-BULK1 and bulk_1@gmail.com
+    :param prefix: str
+    :param index: int
+    :param role: str
+    :return: dict
+    """
+    _data = copy.deepcopy(test_data.test_data_minimum_fields)
+    _data['role'] = role
+    _data['employee_id'] = "DLX-{}{}".format(prefix.upper(), index)
+    _data['work_email'] = "{}_{}@gmail.com".format(prefix.lower(), index)
+    return _data
+
+
 def send_api_post(api_headers=None, api_url=None, data=None):
     """
     Send api post requests with the given header, url and data.
@@ -162,11 +206,7 @@ def create_all_users(api_key):
     create all types of users
     :return: None
     """
-    api_headers = {
-        "HTTP_API_KEY": api_key,
-        'content_type': 'application/json; charset=UTF-8',
-        'Accept': 'application/json'
-    }
+    api_headers = get_api_headers(api_key)
     create_test_admin(api_headers)
     create_test_hr(api_headers)
     create_test_member(api_headers)
@@ -202,6 +242,20 @@ def show_employee(api_headers, data, api_url=None):
     return response.json(), response.status_code
 
 
+def send_api_batch(api_headers, actions, atomic=False):
+    """
+    Send a batch of api actions. Returns the batch response and status code.
+    :param api_headers: dict
+    :param actions: list of dict (action, method and params)
+    :param atomic: boolean
+    :return: tuple
+    """
+    client = Client(**api_headers)
+    response = client.post(url.format("batch"), {"actions": actions, "atomic": atomic},
+                           content_type=api_headers.get('content_type', 'application/json'))
+    return response.json(), response.status_code
+
+
 def get_schema_keys_given_role(action, role, schema_name="employee_schema"):
     """
     Get schema keys for a given role type. and action (show/update)
@@ -228,3 +282,27 @@ def delete_keys_from_employee_show(data_dict, del_keys):
     for _key in del_keys:
         del data_dict[_key]
     return data_dict
+
+
+class EMAppAPITestCase(APITestCase):
+    """
+    Base api test case. Users are created once for the test class inside the class transaction
+    (setUpTestData), hence they are rolled back at the end of the class.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Set up all the required data here.
+            - Setup super user
+            - Setup admin user
+            - Setup hr user
+            - Setup member
+        :return: None
+        """
+        api_key, cls._superuser_key = create_superuser()
+        create_all_users(cls._superuser_key)
+        api_key, cls._admin_key = get_api_key("admin")
+        api_key, cls._hr_key = get_api_key("hr")
+        api_key, cls._member_key = get_api_key("member")
+        return None
@@ -0,0 +1,87 @@
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from emappext.hr_mgmt.models import Employee
+import copy
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeBatchAPITestCase(h.EMAppAPITestCase):
+
+    def test_batch_show_employee(self):
+        """
+        Batch of show_employee should return one success envelope per action
+        :return:
+        """
+        actions = [
+            {"action": "show_employee", "method": "get", "params": {"id": test_data.employee_admin['employee_id']}},
+            {"action": "show_employee", "method": "get", "params": {"id": test_data.employee_hr['employee_id']}}
+        ]
+        res, code = h.send_api_batch(h.get_api_headers(self._admin_key), actions)
+        self.assertEqual(code, 200)
+        self.assertEqual(res['status'], "success")
+        self.assertEqual(res['count'], 2)
+        self.assertEqual([x['status'] for x in res['result']], ["success", "success"])
+        self.assertEqual(res['result'][0]['result']['employee_id'], test_data.employee_admin['employee_id'].upper())
+
+    def test_batch_partial_errors(self):
+        """
+        Failing action should not stop the non atomic batch
+        :return:
+        """
+        actions = [
+            {"action": "show_employee", "method": "get", "params": {"id": "not-available"}},
+            {"action": "unknown_action", "method": "get", "params": {}},
+            {"action": "show_employee", "method": "patch", "params": {}},
+            {"action": "show_employee", "method": "get", "params": {"id": test_data.employee_admin['employee_id']}}
+        ]
+        res, code = h.send_api_batch(h.get_api_headers(self._member_key), actions)
+        self.assertEqual(code, 200)
+        self.assertEqual(res['status'], "error")
+        self.assertEqual([x['status'] for x in res['result']], ["error", "error", "error", "success"])
+        self.assertEqual(res['result'][0]['error_type'], "NotFoundError")
+        self.assertEqual(res['result'][2]['error_type'], "MethodNotAllowed")
+
+    def test_batch_error_status_code(self):
+        """
+        Each failed action should report the http status code of its error type e.g. validation error is 400
+        :return:
+        """
+        actions = [
+            {"action": "search_employee", "method": "get", "params": {"limit": 1000}},
+            {"action": "show_employee", "method": "get", "params": {"id": "not-available"}},
+            {"action": "show_employee", "method": "patch", "params": {}}
+        ]
+        res, code = h.send_api_batch(h.get_api_headers(self._admin_key), actions)
+        self.assertEqual(code, 200)
+        self.assertEqual([x['error_type'] for x in res['result']], ["ValidationError", "NotFoundError",
+                                                                    "MethodNotAllowed"])
+        self.assertEqual([x['status_code'] for x in res['result']], [400, 404, 405])
+
+    def test_batch_atomic_rollback(self):
+        """
+        Atomic batch should roll back the created employee if any of the action fails
+        :return:
+        """
+        _data = copy.deepcopy(test_data.test_data_member_role)
+        _data['show_employee'] = False
+        actions = [
+            {"action": "create_employee", "method": "post", "params": _data},
+            {"action": "show_employee", "method": "get", "params": {"id": "not-available"}},
+            {"action": "show_employee", "method": "get", "params": {"id": _data['employee_id']}}
+        ]
+        res, code = h.send_api_batch(h.get_api_headers(self._admin_key), actions, atomic=True)
+        self.assertEqual(code, 200)
+        self.assertEqual([x['status'] for x in res['result']], ["rolled_back", "error", "skipped"])
+        self.assertFalse(Employee.objects.filter(employee_id__iexact=_data['employee_id']).exists())
+
+    def test_batch_requires_post(self):
+        """
+        Batch only supports post
+        :return:
+        """
+        client = h.get_api_client(self._admin_key)
+        response = client.get(h.url.format("batch"))
+        self.assertNotEqual(response.status_code, 200)
+        self.assertEqual(response.json()['error_type'], "MethodNotAllowed")
@@ -0,0 +1,69 @@
+from emappcore.utils import errors as core_err
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.models import Employee
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeBulkCreateAPITestCase(h.EMAppAPITestCase):
+
+    def _bulk_create(self, key, employees):
+        res, code = h.send_api_post(h.get_api_headers(key), h.url.format("bulk_create_employee"),
+                                    json.dumps({"employees": employees}))
+        return res['result']
+
+    def test_bulk_create_employee(self):
+        """
+        Valid employees should be created and invalid employees reported with their index
+        :return:
+        """
+        _employees = [h.get_test_employee("bulk", i) for i in range(3)]
+        _employees[1]['reporting_manager'] = _employees[0]['work_email']
+        _duplicate = h.get_test_employee("bulk", 0)
+        _duplicate['work_email'] = "bulk_duplicate@gmail.com"
+        _invalid = h.get_test_employee("bulk", 4)
+        del _invalid['first_name']
+        _employees.extend([_duplicate, _invalid])
+
+        result = self._bulk_create(self._admin_key, _employees)
+        self.assertEqual(result['created_count'], 3)
+        self.assertEqual([x['index'] for x in result['errors']], [3, 4])
+
+        _manager = Employee.objects.get(employee_id="dlx-bulk0")
+        _employee = Employee.objects.get(employee_id="dlx-bulk1")
+        self.assertEqual(_employee.reporting_manager, _manager.id)
+        self.assertIsNone(_employee._api_key)
+
+        self.assertEqual(Employee.provision_api_keys(), 3)
+        self.assertIsNotNone(Employee.objects.get(employee_id="dlx-bulk1")._api_key)
+
+        # Existing employees are reported
+        result = self._bulk_create(self._admin_key, [h.get_test_employee("bulk", 0)])
+        self.assertEqual(result['created_count'], 0)
+        self.assertIn("employee_id", result['errors'][0]['errors'])
+
+    def test_bulk_create_employee_mixed_case_manager(self):
+        """
+        Reporting manager email should be matched case insensitive
+        :return:
+        """
+        _manager = h.get_test_employee("bulk", 20)
+        _manager['work_email'] = "Bulk.Manager@gmail.com"
+        self.assertEqual(self._bulk_create(self._admin_key, [_manager])['created_count'], 1)
+
+        _employee = h.get_test_employee("bulk", 21)
+        _employee['reporting_manager'] = "bulk.manager@gmail.com"
+        result = self._bulk_create(self._admin_key, [_employee])
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(Employee.objects.get(employee_id="dlx-bulk21").reporting_manager,
+                         Employee.objects.get(employee_id="dlx-bulk20").id)
+
+    def test_bulk_create_employee_not_authorized(self):
+        """
+        Member should not be able to create employees
+        :return:
+        """
+        with self.assertRaises(core_err.NotAuthorized):
+            self._bulk_create(self._member_key, [h.get_test_employee("bulk", 10)])
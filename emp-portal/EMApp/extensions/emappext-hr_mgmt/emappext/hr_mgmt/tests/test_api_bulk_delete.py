@@ -0,0 +1,122 @@
+from rest_framework_api_key.models import APIKey
+from emappcore.utils import model_helper, errors as core_err
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from emappext.hr_mgmt.models import Employee, EmployeeExtras
+from emappext.project_mgmt.models import Department, Projects, ProjectMembers
+from emappext.task_mgmt.models import Tasks, TasksExtras
+from django.db import transaction
+import datetime
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeBulkDeleteAPITestCase(h.EMAppAPITestCase):
+
+    def _create_employees(self, count):
+        _employees = [h.get_test_employee("del", index) for index in range(count)]
+        h.send_api_post(h.get_api_headers(self._admin_key), h.url.format("bulk_create_employee"),
+                        json.dumps({"employees": _employees}))
+        return [_data['employee_id'] for _data in _employees]
+
+    def _create_department(self, department_id, department_head):
+        return Department.objects.create(department_id=department_id, title="Delete", location="Bangalore",
+                                         description="Delete employees", department_head=department_head)
+
+    def _create_project(self, project_id, department):
+        return Projects.objects.create(project_title="Delete", project_id=project_id, project_description="Delete",
+                                       project_type="Internal", contract_start_date=datetime.date(2020, 1, 1),
+                                       contract_end_date=datetime.date(2021, 1, 1), department=department)
+
+    def _create_task(self, task_id, employee, project):
+        _task = Tasks.objects.create(task_date=datetime.date(2020, 1, 1), task_id=task_id, employee=employee,
+                                     project=project, task_summary="Delete", task_link="http://example.com",
+                                     task_type="Development")
+        TasksExtras.objects.create(tasks=_task, key="hours", value="8")
+        return _task
+
+    def _bulk_delete(self, key, ids):
+        res, code = h.send_api_post(h.get_api_headers(key), h.url.format("bulk_delete_employee"),
+                                    json.dumps({"ids": ids}))
+        return res['result']
+
+    def test_bulk_delete_employee(self):
+        """
+        Employees and the related rows should be deleted and not available employees reported
+        :return:
+        """
+        _ids = self._create_employees(3)
+        _employee_ids = list(Employee.objects.filter(employee_id__in=[x.lower() for x in _ids]).values_list(
+            'id', flat=True))
+
+        result = self._bulk_delete(self._admin_key, _ids + ["not-available"])
+        self.assertEqual(result['deleted_count'], 3)
+        self.assertEqual([x['id'] for x in result['errors']], ["not-available"])
+        self.assertFalse(Employee.objects.filter(id__in=_employee_ids).exists())
+        self.assertFalse(EmployeeExtras.objects.filter(employee_id__in=_employee_ids).exists())
+
+    def test_bulk_delete_employee_not_authorized(self):
+        """
+        Member should not be able to delete employees
+        :return:
+        """
+        with self.assertRaises(core_err.NotAuthorized):
+            self._bulk_delete(self._member_key, [test_data.employee_hr['employee_id']])
+
+    def test_bulk_delete_employee_tasks_and_project_members(self):
+        """
+        Tasks with the task extras and the project member (one to one) of the employees should be deleted,
+        project and department should not be deleted
+        :return:
+        """
+        _ids = self._create_employees(2)
+        _employees = list(Employee.objects.filter(employee_id__in=[x.lower() for x in _ids]))
+        _head = Employee.objects.get(work_email=test_data.employee_hr['work_email'])
+        _department = self._create_department("DEP-DEL-1", _head)
+        _project = self._create_project("PRJ-DEL-1", _department)
+        _tasks = [self._create_task("TSK-DEL-{}".format(index), _employee, _project)
+                  for index, _employee in enumerate(_employees)]
+        ProjectMembers.objects.create(project=_project, employee=_employees[0], is_manager=True)
+        _head_task = self._create_task("TSK-DEL-HEAD", _head, _project)
+
+        result = self._bulk_delete(self._admin_key, _ids)
+        self.assertEqual(result['deleted_count'], 2)
+        self.assertFalse(Tasks.objects.filter(id__in=[_task.id for _task in _tasks]).exists())
+        self.assertFalse(TasksExtras.objects.filter(tasks_id__in=[_task.id for _task in _tasks]).exists())
+        self.assertFalse(ProjectMembers.objects.filter(employee_id__in=[_e.id for _e in _employees]).exists())
+        self.assertTrue(TasksExtras.objects.filter(tasks=_head_task).exists())
+        self.assertTrue(Projects.objects.filter(id=_project.id).exists())
+        self.assertTrue(Department.objects.filter(id=_department.id).exists())
+
+    def test_bulk_delete_department_head(self):
+        """
+        Department head is protected, all the employees of the chunk should be reported and not deleted
+        :return:
+        """
+        _ids = self._create_employees(2)
+        _head = Employee.objects.get(employee_id=_ids[0].lower())
+        self._create_department("DEP-DEL-2", _head)
+
+        result = self._bulk_delete(self._admin_key, _ids)
+        self.assertEqual(result['deleted_count'], 0)
+        self.assertEqual(result['error_count'], 2)
+        self.assertIn("department", result['errors'][0]['errors'])
+        self.assertEqual(Employee.objects.filter(employee_id__in=[x.lower() for x in _ids]).count(), 2)
+
+    def test_delete_cascade_set_null(self):
+        """
+        SET_NULL relations should be updated and the related rows should not be deleted
+        :return:
+        """
+        _ids = self._create_employees(1)
+        _employee = Employee.objects.get(employee_id=_ids[0].lower())
+        api_key, key = h.get_api_key(email=_employee.work_email)
+
+        with transaction.atomic():
+            count = model_helper.delete_cascade(APIKey, [api_key.pk])
+        self.assertEqual(count, 1)
+        self.assertFalse(APIKey.objects.filter(pk=api_key.pk).exists())
+        _employee = Employee.objects.get(id=_employee.id)
+        self.assertIsNone(_employee._api_key_id)
@@ -0,0 +1,98 @@
+from emappcore.utils import errors as core_err
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from emappext.hr_mgmt.models import Employee
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeBulkUpdateAPITestCase(h.EMAppAPITestCase):
+
+    def _bulk_update(self, key, data):
+        res, code = h.send_api_post(h.get_api_headers(key), h.url.format("bulk_update_employee"), json.dumps(data))
+        return res['result']
+
+    def test_bulk_update_employee_list(self):
+        """
+        Changes should be applied per employee and errors reported with their index
+        :return:
+        """
+        result = self._bulk_update(self._admin_key, {"employees": [
+            {"id": test_data.employee_member['employee_id'], "changes": {"work_address": "Cork"}},
+            {"id": test_data.employee_hr['employee_id'], "changes": {"work_address": "Galway"}},
+            {"id": "not-available", "changes": {"work_address": "Cork"}},
+            {"id": test_data.employee_hr['employee_id'], "changes": {"first_name": ""}}
+        ]})
+        self.assertEqual(result['updated_count'], 2)
+        self.assertEqual([x['index'] for x in result['errors']], [2, 3])
+        self.assertEqual(Employee.get_employee_by_id(test_data.employee_member['employee_id']).work_address, "Cork")
+        self.assertEqual(Employee.get_employee_by_id(test_data.employee_hr['employee_id']).work_address, "Galway")
+
+    def test_bulk_update_employee_not_required_fields(self):
+        """
+        Changes of only not required fields should be validated and applied
+        :return:
+        """
+        result = self._bulk_update(self._admin_key, {"employees": [
+            {"id": test_data.employee_member['employee_id'], "changes": {"work_ph": "+353 1 234 5678"}},
+            {"id": test_data.employee_hr['employee_id'], "changes": {"skills": ["Python", "Django"]}}
+        ]})
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(result['updated_count'], 2)
+        self.assertEqual(Employee.get_employee_by_id(test_data.employee_member['employee_id']).work_ph,
+                         "+353 1 234 5678")
+        self.assertEqual(Employee.get_employee_by_id(test_data.employee_hr['employee_id']).skills,
+                         ["Python", "Django"])
+
+    def test_bulk_update_employee_mixed_case_manager(self):
+        """
+        Reporting manager email should be matched case insensitive
+        :return:
+        """
+        _manager = h.get_test_employee("manager", 1)
+        _manager['work_email'] = "Update.Manager@gmail.com"
+        h.create_employee(h.get_api_headers(self._admin_key), _manager)
+
+        result = self._bulk_update(self._admin_key, {"employees": [
+            {"id": test_data.employee_member['employee_id'],
+             "changes": {"reporting_manager": "update.manager@gmail.com"}}
+        ]})
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(Employee.get_employee_by_id(test_data.employee_member['employee_id']).reporting_manager,
+                         Employee.get_employee_by_id("dlx-manager1").id)
+
+    def test_bulk_update_employee_filters(self):
+        """
+        Changes should be applied to all the employees matching the filters
+        :return:
+        """
+        _count = Employee.objects.filter(work_country_code="ie").count()
+        result = self._bulk_update(self._admin_key, {
+            "filters": {"work_country_code": "ie"},
+            "changes": {"position": "Software Architect"}
+        })
+        self.assertEqual(result['updated_count'], _count)
+        self.assertEqual(Employee.objects.filter(position="Software Architect").count(), _count)
+
+        with self.assertRaises(core_err.ValidationError):
+            self._bulk_update(self._admin_key, {
+                "filters": {"work_country_code": "ie"},
+                "changes": {"employee_id": "DLX-EMP100"}
+            })
+
+    def test_bulk_update_employee_not_authorized(self):
+        """
+        Member should not be able to bulk update and unknown fields should raise validation error
+        :return:
+        """
+        with self.assertRaises(core_err.NotAuthorized):
+            self._bulk_update(self._member_key, {
+                "employees": [{"id": test_data.employee_member['employee_id'], "changes": {"position": "Manager"}}]
+            })
+
+        with self.assertRaises(core_err.ValidationError):
+            self._bulk_update(self._admin_key, {
+                "employees": [{"id": test_data.employee_member['employee_id'], "changes": {"unknown": "value"}}]
+            })
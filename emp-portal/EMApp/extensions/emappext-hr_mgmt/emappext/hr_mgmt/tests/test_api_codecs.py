@@ -0,0 +1,135 @@
+from emappcore.tools import api_action
+from emappcore.utils.api_codecs import EMAppCodecs, JSONCodec
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from unittest import mock
+import datetime
+import decimal
+import msgpack
+import uuid
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+_UUID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+
+def _codec_echo(app_context, data_dict):
+    return {
+        "params": data_dict,
+        "created": datetime.datetime(2020, 1, 2, 3, 4, 5),
+        "joined": datetime.date(2020, 1, 2),
+        "uuid": _UUID,
+        "salary": decimal.Decimal("1000.50")
+    }
+
+
+class APICodecsTestCase(h.EMAppAPITestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Register echo api action with types not supported by json
+        :return: None
+        """
+        super(APICodecsTestCase, cls).setUpClass()
+        api_action.register("test_codec_echo", _codec_echo, "post")
+        return None
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Remove the echo api action from the registry
+        :return: None
+        """
+        api_action.unregister("test_codec_echo", "post")
+        super(APICodecsTestCase, cls).tearDownClass()
+        return None
+
+    def _send_echo(self, body, content_type, accept):
+        client = h.get_api_client(self._admin_key)
+        return client.post(h.url.format("test_codec_echo"), body, content_type=content_type, HTTP_ACCEPT=accept)
+
+    def _assert_default_types(self, result):
+        self.assertEqual(result['created'], "2020-01-02T03:04:05")
+        self.assertEqual(result['joined'], "2020-01-02")
+        self.assertEqual(result['uuid'], str(_UUID))
+        self.assertEqual(result['salary'], "1000.50")
+
+    def test_json_codec(self):
+        """
+        Json request should get json response. Dates, uuid and decimal are encoded with DjangoJSONEncoder
+        :return:
+        """
+        response = self._send_echo(json.dumps({"name": "echo"}), "application/json", "application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], "application/json")
+        res = response.json()
+        self.assertEqual(res['result']['params'], {"name": "echo"})
+        self._assert_default_types(res['result'])
+
+    def test_msgpack_codec(self):
+        """
+        Messagepack request should be decoded and response encoded with messagepack if accepted
+        :return:
+        """
+        response = self._send_echo(msgpack.packb({"name": "echo", "ids": [1, 2]}), "application/msgpack",
+                                   "application/msgpack")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], "application/msgpack")
+        res = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(res['status'], "success")
+        self.assertEqual(res['result']['params'], {"name": "echo", "ids": [1, 2]})
+        self._assert_default_types(res['result'])
+
+        response = h.get_api_client(self._admin_key).get(
+            h.url.format("show_employee"), {"id": test_data.employee_hr['employee_id']},
+            HTTP_ACCEPT="application/x-msgpack")
+        self.assertEqual(response['Content-Type'], "application/msgpack")
+        res = msgpack.unpackb(response.content, raw=False)
+        self.assertEqual(res['result']['work_email'], test_data.employee_hr['work_email'])
+
+    def test_accept_negotiation(self):
+        """
+        First supported media type in the Accept header is selected, json is the default
+        :return:
+        """
+        body = json.dumps({"name": "echo"})
+        response = self._send_echo(body, "application/json", "text/html, application/msgpack;q=0.9")
+        self.assertEqual(response['Content-Type'], "application/msgpack")
+
+        response = self._send_echo(body, "application/json", "text/html, */*")
+        self.assertEqual(response['Content-Type'], "application/json")
+        self.assertEqual(response.json()['result']['params'], {"name": "echo"})
+
+        # Decoder is selected from Content-Type not from Accept
+        response = self._send_echo(msgpack.packb({"name": "echo"}), "application/msgpack", "application/json")
+        self.assertEqual(response['Content-Type'], "application/json")
+        self.assertEqual(response.json()['result']['params'], {"name": "echo"})
+
+    def test_not_supported_content_type(self):
+        """
+        Request with a content type that is not registered should be a bad request
+        :return:
+        """
+        response = self._send_echo("name=echo", "text/plain", "application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error_type'], "BadRequest")
+
+    def test_stdlib_json_fallback(self):
+        """
+        If orjson is not installed stdlib json codec is registered and the response should be same
+        :return:
+        """
+        body = json.dumps({"name": "echo"})
+        expected = self._send_echo(body, "application/json", "application/json").json()
+
+        with mock.patch.dict(EMAppCodecs._codecs, {"application/json": JSONCodec()}):
+            self.assertEqual(EMAppCodecs.get_encoder("application/json").name, "json")
+            response = self._send_echo(body, "application/json", "application/json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], "application/json")
+        self.assertEqual(response.json(), expected)
+        self._assert_default_types(response.json()['result'])
@@ -0,0 +1,50 @@
+from emappcore.common import config
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from unittest import mock
+import gzip
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeCompressionAPITestCase(h.EMAppAPITestCase):
+
+    def _show_employee(self, accept_encoding):
+        client = h.get_api_client(self._admin_key, HTTP_ACCEPT_ENCODING=accept_encoding)
+        return client.get(h.url.format("show_employee"), {"id": test_data.employee_hr['employee_id']})
+
+    @mock.patch.dict(config, {"RESPONSE_COMPRESSION_MIN_SIZE": 0})
+    def test_gzip_response(self):
+        """
+        Response should be gzip compressed if the client accepts gzip
+        :return:
+        """
+        response = self._show_employee("gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], "gzip")
+        self.assertIn("Accept-Encoding", response['Vary'])
+        result = json.loads(gzip.decompress(response.content))
+        self.assertEqual(result['result']['work_email'], test_data.employee_hr['work_email'])
+
+    @mock.patch.dict(config, {"RESPONSE_COMPRESSION_MIN_SIZE": 0})
+    def test_not_accepted_encoding(self):
+        """
+        Response should not be compressed if the client does not accept any of the encodings
+        :return:
+        """
+        response = self._show_employee("identity, gzip;q=0")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response.json()['result']['work_email'], test_data.employee_hr['work_email'])
+
+    @mock.patch.dict(config, {"RESPONSE_COMPRESSION_MIN_SIZE": 1000000})
+    def test_min_size(self):
+        """
+        Responses smaller than the min size should not be compressed
+        :return:
+        """
+        response = self._show_employee("gzip")
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,63 @@
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeConditionalAPITestCase(h.EMAppAPITestCase):
+
+    def _show_employee(self, key, employee_id, **headers):
+        client = h.get_api_client(key)
+        return client.get(h.url.format("show_employee"), {"id": employee_id}, **headers)
+
+    def test_show_employee_not_modified(self):
+        """
+        show_employee should send ETag/Last-Modified and answer 304 if not modified
+        :return:
+        """
+        employee_id = test_data.employee_hr['employee_id']
+        response = self._show_employee(self._admin_key, employee_id)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        response_304 = self._show_employee(self._admin_key, employee_id, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response_304.status_code, 304)
+        self.assertEqual(response_304['ETag'], response['ETag'])
+
+        response_304 = self._show_employee(self._admin_key, employee_id,
+                                           HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response_304.status_code, 304)
+
+    def test_show_employee_etag_by_role(self):
+        """
+        Same employee shown to different roles should have different ETag
+        :return:
+        """
+        employee_id = test_data.employee_hr['employee_id']
+        response_admin = self._show_employee(self._admin_key, employee_id)
+        response_member = self._show_employee(self._member_key, employee_id,
+                                              HTTP_IF_NONE_MATCH=response_admin['ETag'])
+        self.assertEqual(response_member.status_code, 200)
+        self.assertNotEqual(response_member['ETag'], response_admin['ETag'])
+
+    def test_show_employee_modified_after_update(self):
+        """
+        Updating an employee should change the ETag
+        :return:
+        """
+        employee_id = test_data.employee_hr['employee_id']
+        response = self._show_employee(self._admin_key, employee_id)
+        self.assertEqual(response.status_code, 200)
+
+        res, code = h.update_employee(h.get_api_headers(self._admin_key), {
+            "id": response.json()['result']['id'],
+            "last_name": "testmy_name"
+        })
+        self.assertEqual(code, 200)
+
+        response_updated = self._show_employee(self._admin_key, employee_id, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response_updated.status_code, 200)
+        self.assertNotEqual(response_updated['ETag'], response['ETag'])
+        self.assertEqual(response_updated.json()['result']['last_name'], "testmy_name")
@@ -1,9 +1,10 @@
-from rest_framework.test import APITestCase
 from emappcore.utils import errors as core_err
 from emappext.hr_mgmt.tests import helper as h
 from emappext.hr_mgmt.tests import test_data
 from django.db import IntegrityError
 from django.test import Client
+from django.core.files.uploadedfile import SimpleUploadedFile
+from emappcore.common import config
 import os
 import copy
 import logging
@@ -11,24 +12,7 @@ import logging
 log = logging.getLogger(__name__)
 
 
-class EmployeeCreateAPITestCase(APITestCase):
-
-    @classmethod
-    def setUpClass(cls):
-        """
-        Set up all the required data here.
-            - Setup admin user
-            - Setup hr user
-            - Setup member
-        :return: None
-        """
-
-        api_key, cls._superuser_key = h.create_superuser()
-        h.create_all_users(cls._superuser_key)
-        api_key, cls._admin_key = h.get_api_key("admin")
-        api_key, cls._hr_key = h.get_api_key("hr")
-        api_key, cls._member_key = h.get_api_key("member")
-        return None
+class EmployeeCreateAPITestCase(h.EMAppAPITestCase):
 
     def setUp(self):
         pass
@@ -782,6 +766,32 @@ class EmployeeCreateAPITestCase(APITestCase):
         response = client.post(api_url, _update_data, **api_headers_admin)
         self.assertEqual(200, response.status_code)
 
+    def test_employee_create_with_invalid_avatar(self):
+        """
+        Avatar content (file signature) and size are validated while the upload is received
+        :return:
+        """
+        client = Client()
+        api_headers_admin = {
+            "HTTP_API_KEY": self._admin_key
+            # default is multipart/form
+        }
+
+        # **************** Case 1: not an image with png extension
+        _data = copy.deepcopy(test_data.test_data_created_by_hr)
+        _data['upload_avatar'] = SimpleUploadedFile("avatar.png", b"not an image" * 10, content_type="image/png")
+        response = client.post(h.url.format("create_employee"), _data, **api_headers_admin)
+        self.assertEqual(response.json()['error_type'], "ValidationError")
+        self.assertIn("upload_avatar", response.json()['msg'])
+
+        # **************** Case 2: exceeds the max size
+        _data['upload_avatar'] = SimpleUploadedFile(
+            "avatar.png", b"\x89PNG\r\n\x1a\n" + b"\0" * int(config.get('MAX_AVATAR_SIZE_BYTES')),
+            content_type="image/png")
+        response = client.post(h.url.format("create_employee"), _data, **api_headers_admin)
+        self.assertEqual(response.json()['error_type'], "ValidationError")
+        self.assertIn("avatar", response.json()['msg'])
+
     def test_employee_create_with_non_mandatory_field(self):
         """
         Test employee create without mandatory field
@@ -803,12 +813,4 @@ class EmployeeCreateAPITestCase(APITestCase):
     def tearDown(self):
         pass
 
-    @classmethod
-    def tearDownClass(cls):
-        """
-        Destroy the data setup in setUpClass
-        :return: None
-        """
-        pass
-
 
@@ -0,0 +1,63 @@
+from emappcore.utils import errors as core_err
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from emappext.hr_mgmt.models import Employee
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeFieldsAPITestCase(h.EMAppAPITestCase):
+
+    def test_show_employee_fields(self):
+        """
+        Only the requested fields should be returned
+        :return:
+        """
+        employee_id = test_data.employee_hr['employee_id']
+        res, code = h.show_employee(h.get_api_headers(self._admin_key), {
+            "id": employee_id,
+            "fields": "first_name,work_email,id"
+        })
+        self.assertEqual(code, 200)
+        self.assertEqual(set(res['result']), {"first_name", "work_email", "id"})
+        self.assertEqual(res['result']['work_email'], test_data.employee_hr['work_email'])
+
+    def test_show_employee_fields_not_visible(self):
+        """
+        Fields not visible to the role are ignored
+        :return:
+        """
+        employee_id = test_data.employee_hr['employee_id']
+        res, code = h.show_employee(h.get_api_headers(self._member_key), {
+            "id": employee_id,
+            "fields": "first_name,role"
+        })
+        self.assertEqual(code, 200)
+        self.assertEqual(set(res['result']), {"first_name"})
+
+    def test_show_employee_unknown_field(self):
+        """
+        Unknown fields should raise validation error
+        :return:
+        """
+        with self.assertRaises(core_err.ValidationError):
+            h.show_employee(h.get_api_headers(self._admin_key), {
+                "id": test_data.employee_hr['employee_id'],
+                "fields": "first_name,password"
+            })
+
+    def test_as_dict_many(self):
+        """
+        Batched dictize should be same as as_dict of each employee and fetch the extras with a single query
+        :return:
+        """
+        _employees = list(Employee.objects.order_by('id'))
+        with self.assertNumQueries(1):
+            _result = Employee.as_dict_many(_employees)
+        self.assertEqual(_result, [_e.as_dict() for _e in _employees])
+
+        _fields = ["first_name", "employee_id", "id"]
+        with self.assertNumQueries(0):
+            _result = Employee.as_dict_many(_employees, fields=_fields)
+        self.assertEqual(_result, [_e.as_dict(fields=_fields) for _e in _employees])
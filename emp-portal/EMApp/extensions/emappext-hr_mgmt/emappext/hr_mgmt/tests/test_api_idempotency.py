@@ -0,0 +1,57 @@
+from emappcore.utils import errors as core_err
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from emappext.hr_mgmt.models import Employee
+import copy
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeIdempotencyAPITestCase(h.EMAppAPITestCase):
+
+    def test_create_employee_retry(self):
+        """
+        Retry with the same Idempotency-Key should replay the response instead of creating the employee again
+        :return:
+        """
+        _headers = h.get_api_headers(self._admin_key, HTTP_IDEMPOTENCY_KEY="create-1")
+        res, code = h.create_employee(_headers, test_data.test_data_created_by_admin)
+        self.assertEqual(code, 200)
+
+        res_retry, code = h.create_employee(_headers, test_data.test_data_created_by_admin)
+        self.assertEqual(code, 200)
+        self.assertEqual(res_retry, res)
+        self.assertEqual(Employee.objects.filter(
+            work_email=test_data.test_data_created_by_admin['work_email']).count(), 1)
+
+    def test_idempotency_key_different_parameters(self):
+        """
+        Reusing the Idempotency-Key with different parameters should raise bad request
+        :return:
+        """
+        _headers = h.get_api_headers(self._admin_key, HTTP_IDEMPOTENCY_KEY="create-2")
+        res, code = h.create_employee(_headers, test_data.test_data_created_by_hr)
+        self.assertEqual(code, 200)
+
+        _data = copy.deepcopy(test_data.test_data_created_by_hr)
+        _data['first_name'] = "different"
+        with self.assertRaises(core_err.BadRequest):
+            h.create_employee(_headers, _data)
+
+    def test_idempotency_key_scoped_by_user(self):
+        """
+        Stored response should not be replayed to another user or to a not verified api key with the same prefix
+        :return:
+        """
+        _data = test_data.test_data_member_role
+        _headers = h.get_api_headers(self._admin_key, HTTP_IDEMPOTENCY_KEY="create-3")
+        res, code = h.create_employee(_headers, _data)
+        self.assertEqual(code, 200)
+
+        for _key in (self._hr_key, "{}.not-valid".format(self._admin_key.partition(".")[0])):
+            response = h.get_api_client(_key, HTTP_IDEMPOTENCY_KEY="create-3").post(
+                h.url.format("create_employee"), json.dumps(_data), content_type='application/json')
+            self.assertNotIn('Idempotent-Replayed', response)
+            self.assertNotEqual(response.status_code, 200)
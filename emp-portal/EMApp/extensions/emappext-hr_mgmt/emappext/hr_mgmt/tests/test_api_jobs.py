@@ -0,0 +1,47 @@
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.models import Employee
+import django_rq
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeJobsAPITestCase(h.EMAppAPITestCase):
+
+    def _job_status(self, key, job_id):
+        return h.get_api_client(key).get(h.url.format("job_status"), {"job_id": job_id},
+                                     content_type='application/json')
+
+    def test_bulk_create_employee_job(self):
+        """
+        Bulk create with async=1 should return the job id and the result should be available with job_status
+        :return:
+        """
+        _data = h.get_test_employee("job", 1)
+
+        response = h.get_api_client(self._admin_key).post(
+            h.url.format("bulk_create_employee") + "?async=1", json.dumps({"employees": [_data]}),
+            content_type='application/json')
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['result']['job_id']
+
+        django_rq.get_worker('low', worker_class='rq.SimpleWorker').work(burst=True)
+
+        res = self._job_status(self._admin_key, job_id).json()
+        self.assertEqual(res['result']['status'], "finished")
+        self.assertEqual(res['result']['result']['created_count'], 1)
+        self.assertTrue(Employee.objects.filter(employee_id="dlx-job1").exists())
+
+        # Other users cannot see the job
+        self.assertEqual(self._job_status(self._member_key, job_id).status_code, 404)
+
+    def test_async_not_allowed(self):
+        """
+        Actions not registered with async_ok should not be run as a job
+        :return:
+        """
+        response = h.get_api_client(self._admin_key).post(
+            h.url.format("delete_employee") + "?async=1", json.dumps({"id": "not-available"}),
+            content_type='application/json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,64 @@
+from emappcore.utils import errors as core_err
+from emappcore.utils.api_key_cache import api_key_cache
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from emappext.hr_mgmt.models import Employee
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeAPIKeyCacheTestCase(h.EMAppAPITestCase):
+
+    def test_api_key_cached(self):
+        """
+        Verified api key should be cached with the role
+        :return:
+        """
+        api_key, _key = h.get_api_key("hr")
+        res, code = h.show_employee(h.get_api_headers(_key), {"id": test_data.employee_member['employee_id']})
+        self.assertEqual(code, 200)
+        _cached = api_key_cache.get(_key)
+        self.assertTrue(_cached)
+        self.assertEqual(_cached['role'], "hr")
+
+        # Cached key gives the same result
+        res_cached, code = h.show_employee(h.get_api_headers(_key), {"id": test_data.employee_member['employee_id']})
+        self.assertEqual(code, 200)
+        self.assertEqual(res_cached['result'], res['result'])
+
+    def test_api_key_rotated(self):
+        """
+        Rotated api key should not be valid anymore
+        :return:
+        """
+        api_key, _old_key = h.get_api_key("member")
+        res, code = h.show_employee(h.get_api_headers(_old_key), {"id": test_data.employee_member['employee_id']})
+        self.assertEqual(code, 200)
+
+        api_key, _new_key = h.get_api_key("member")
+        self.assertIsNone(api_key_cache.get(_old_key))
+        with self.assertRaises(core_err.NotAuthorizedError):
+            h.show_employee(h.get_api_headers(_old_key), {"id": test_data.employee_member['employee_id']})
+
+        res, code = h.show_employee(h.get_api_headers(_new_key), {"id": test_data.employee_member['employee_id']})
+        self.assertEqual(code, 200)
+
+    def test_api_key_role_change(self):
+        """
+        Changing the employee role should invalidate the cached api key
+        :return:
+        """
+        api_key, _key = h.get_api_key("member")
+        res, code = h.show_employee(h.get_api_headers(_key), {"id": test_data.employee_member['employee_id']})
+        self.assertEqual(code, 200)
+        self.assertEqual(api_key_cache.get(_key)['role'], "member")
+
+        _employee = Employee.get_employee_by_email(test_data.employee_member['work_email'])
+        _employee.role = "hr"
+        _employee.save()
+        self.assertIsNone(api_key_cache.get(_key))
+
+        res, code = h.show_employee(h.get_api_headers(_key), {"id": test_data.employee_member['employee_id']})
+        self.assertEqual(code, 200)
+        self.assertEqual(api_key_cache.get(_key)['role'], "hr")
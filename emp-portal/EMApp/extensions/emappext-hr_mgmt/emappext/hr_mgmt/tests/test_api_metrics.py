@@ -0,0 +1,91 @@
+from emappcore.common import config
+from emappcore.utils.metrics import api_metrics
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+import re
+import logging
+
+log = logging.getLogger(__name__)
+
+# Prometheus text format sample line e.g. name{label="value",...} 1
+_SAMPLE_LINE = re.compile(r'^([a-z_]+)\{((?:[a-z_]+="(?:[^"\\]|\\.)*",?)*)\} (-?[0-9.e+-]+)$')
+
+
+class APIMetricsTestCase(h.EMAppAPITestCase):
+
+    _metrics_url = "http://127.0.0.1/{}".format(config.get('API_METRICS_ENDPOINT', 'emapp/metrics'))
+
+    def _get_metrics(self, key):
+        return h.get_api_client(key).get(self._metrics_url)
+
+    def _show_employee(self, employee_id):
+        client = h.get_api_client(self._admin_key)
+        return client.get(h.url.format("show_employee"), {"id": employee_id}).json()
+
+    def test_metrics_admin_only(self):
+        """
+        Only admin can see the api metrics
+        :return:
+        """
+        response = self._get_metrics(self._member_key)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()['error_type'], "NotAuthorized")
+
+        response = self._get_metrics(self._admin_key)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith("text/plain"))
+
+    def test_metrics_observed(self):
+        """
+        Requests, errors by error_type and latency buckets should be incremented for each api call
+        :return:
+        """
+        _label = ("get", "show_employee")
+        before = api_metrics.collect()
+
+        res = self._show_employee(test_data.employee_hr['employee_id'])
+        self.assertEqual(res['status'], "success")
+        res = self._show_employee("DLX-NOT-EXISTS")
+        self.assertEqual(res['status'], "error")
+        _error_label = _label + (res['error_type'], )
+
+        after = api_metrics.collect()
+        self.assertEqual(after['requests'].get(_label, 0) - before['requests'].get(_label, 0), 2)
+        self.assertEqual(after['errors'].get(_error_label, 0) - before['errors'].get(_error_label, 0), 1)
+        self.assertGreater(after['latency_sum'].get(_label, 0), before['latency_sum'].get(_label, 0))
+
+        def _bucket_count(metrics):
+            return sum(v for k, v in metrics['latency_bucket'].items() if k[:2] == _label)
+
+        self.assertEqual(_bucket_count(after) - _bucket_count(before), 2)
+
+    def test_metrics_prometheus_format(self):
+        """
+        Metrics should be in prometheus text format and histogram buckets should be cumulative
+        :return:
+        """
+        self._show_employee(test_data.employee_hr['employee_id'])
+        response = self._get_metrics(self._admin_key)
+        self.assertEqual(response.status_code, 200)
+
+        buckets = dict()
+        counts = dict()
+        for line in response.content.decode().splitlines():
+            if line.startswith("#"):
+                self.assertRegex(line, r'^# (HELP|TYPE) emapp_api_[a-z_]+ .+$')
+                continue
+            match = _SAMPLE_LINE.match(line)
+            self.assertIsNotNone(match, line)
+            name, labels, value = match.groups()
+            _labels = dict(re.findall(r'([a-z_]+)="((?:[^"\\]|\\.)*)"', labels))
+            _key = (_labels['method'], _labels['action'])
+            if name == "emapp_api_request_duration_seconds_bucket":
+                buckets.setdefault(_key, []).append((_labels['le'], int(value)))
+            elif name == "emapp_api_request_duration_seconds_count":
+                counts[_key] = int(value)
+
+        self.assertIn(("get", "show_employee"), counts)
+        for _key, count in counts.items():
+            _values = [v for le, v in buckets[_key]]
+            self.assertEqual(_values, sorted(_values))
+            self.assertEqual(buckets[_key][-1], ("+Inf", count))
@@ -0,0 +1,74 @@
+from emappcore.common import config
+from rest_framework_api_key.models import APIKey
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+from unittest import mock
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeRateLimitAPITestCase(h.EMAppAPITestCase):
+
+    def setUp(self):
+        # config does not allow to modify the items, patch.dict updates and restores the dict as a whole
+        self._config_patch = mock.patch.dict(config, {
+            "API_RATE_LIMITS": {
+                "read": {"rate": 0.01, "burst": 1},
+                "write": {"rate": 0.01, "burst": 1}
+            }
+        })
+        self._config_patch.start()
+
+    def tearDown(self):
+        self._config_patch.stop()
+
+    def _show_employee(self, key, **headers):
+        client = h.get_api_client(key, **headers)
+        return client.get(h.url.format("show_employee"), {"id": test_data.employee_member['employee_id']})
+
+    def test_rate_limit_exceeded(self):
+        """
+        Requests exceeding the bucket should get 429 with Retry-After
+        :return:
+        """
+        api_key, _key = h.get_api_key("hr")
+        response = self._show_employee(_key)
+        self.assertEqual(response.status_code, 200)
+
+        response = self._show_employee(_key)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['error_type'], "TooManyRequests")
+        self.assertTrue(int(response['Retry-After']) >= 1)
+
+    def test_rate_limit_per_api_key(self):
+        """
+        Each api key has its own bucket
+        :return:
+        """
+        api_key, _admin_key = h.get_api_key("admin")
+        api_key, _member_key = h.get_api_key("member")
+        self.assertEqual(self._show_employee(_admin_key).status_code, 200)
+        self.assertEqual(self._show_employee(_member_key).status_code, 200)
+        self.assertEqual(self._show_employee(_admin_key).status_code, 429)
+
+    def test_rate_limit_not_verified_api_key(self):
+        """
+        Not verified api keys should be limited by the bucket of the remote address before the key is verified,
+        not by the bucket of the key prefix
+        :return:
+        """
+        _prefix = self._superuser_key.partition(".")[0]
+        _ip_limits = {
+            "read": {"rate": 0.01, "burst": 2},
+            "write": {"rate": 0.01, "burst": 2}
+        }
+        with mock.patch.dict(config, {"API_IP_RATE_LIMITS": _ip_limits}), \
+                mock.patch.object(APIKey.objects, "get_from_key", wraps=APIKey.objects.get_from_key) as get_from_key:
+            for i in range(3):
+                response = self._show_employee("{}.not-valid-{}".format(_prefix, i), REMOTE_ADDR="10.0.0.1")
+            self.assertEqual(response.status_code, 429)
+            # Third key is not verified
+            self.assertEqual(get_from_key.call_count, 2)
+
+            self.assertEqual(self._show_employee(self._superuser_key, REMOTE_ADDR="10.0.0.2").status_code, 200)
@@ -0,0 +1,60 @@
+from emappcore.tools import api_action
+from emappext.hr_mgmt.tests import helper as h
+from emappext.hr_mgmt.tests import test_data
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeResponseCacheAPITestCase(h.EMAppAPITestCase):
+
+    def test_cache_policy_registered(self):
+        """
+        Employee GET actions are cached and write actions invalidate the employee tag
+        :return:
+        """
+        for action_name in ("show_employee", "search_employee", "suggestion_employee_index"):
+            self.assertIn("employee", api_action.get_action_metadata("get", action_name)['cache']['tags'])
+        for action_name in ("create_employee", "update_employee", "delete_employee"):
+            self.assertIn("employee", api_action.get_action_metadata("post", action_name)['invalidates'])
+
+    def test_show_employee_invalidated_on_update(self):
+        """
+        Cached show_employee should not be used after the employee is updated
+        :return:
+        """
+        employee_id = test_data.employee_hr['employee_id']
+        res, code = h.show_employee(h.get_api_headers(self._admin_key), {"id": employee_id})
+        self.assertEqual(code, 200)
+
+        res_cached, code = h.show_employee(h.get_api_headers(self._admin_key), {"id": employee_id})
+        self.assertEqual(res_cached['result'], res['result'])
+
+        res, code = h.update_employee(h.get_api_headers(self._admin_key), {
+            "id": res['result']['id'],
+            "last_name": "testmy_name"
+        })
+        self.assertEqual(code, 200)
+
+        res, code = h.show_employee(h.get_api_headers(self._admin_key), {"id": employee_id})
+        self.assertEqual(res['result']['last_name'], "testmy_name")
+
+    def test_show_employee_cached_per_member(self):
+        """
+        Member sees his/her own profile with more fields, cached result should not be shared with other members
+        :return:
+        """
+        res, code = h.create_employee(h.get_api_headers(self._admin_key), test_data.test_data_member_role)
+        self.assertEqual(code, 200)
+        api_key, _other_member_key = h.get_api_key(email=test_data.test_data_member_role['work_email'])
+
+        employee_id = test_data.employee_member['employee_id']
+        res_self, code = h.show_employee(h.get_api_headers(self._member_key), {"id": employee_id})
+        self.assertEqual(code, 200)
+
+        res_other, code = h.show_employee(h.get_api_headers(_other_member_key), {"id": employee_id})
+        self.assertEqual(code, 200)
+        expected_keys = h.get_schema_keys_given_role("show", "all")
+        result = h.delete_keys_from_employee_show(res_other['result'],
+                                                  del_keys=('id', 'created_at', 'updated_at', 'avatar'))
+        self.assertFalse(set(result).difference(expected_keys))
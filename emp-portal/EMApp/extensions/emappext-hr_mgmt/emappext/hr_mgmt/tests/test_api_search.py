@@ -0,0 +1,41 @@
+from emappext.hr_mgmt.tests import helper as h
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeSearchCursorAPITestCase(h.EMAppAPITestCase):
+
+    def _search_employee(self, data):
+        client = h.get_api_client(self._admin_key)
+        return client.get(h.url.format("search_employee"), data).json()
+
+    def test_search_employee_cursor(self):
+        """
+        Paging with cursor should return all the employees once
+        :return:
+        """
+        res = self._search_employee({"limit": 100})
+        expected_ids = set(x['id'] for x in res['result']['results'])
+
+        ids = list()
+        cursor = ""
+        while cursor is not None:
+            res = self._search_employee({"limit": 1, "cursor": cursor})
+            self.assertEqual(res['status'], "success")
+            ids.extend(x['id'] for x in res['result']['results'])
+            cursor = res['result']['next_cursor']
+
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(set(ids), expected_ids)
+
+    def test_search_employee_invalid_cursor(self):
+        """
+        Invalid cursor or cursor with offset should raise validation error
+        :return:
+        """
+        res = self._search_employee({"cursor": "invalid"})
+        self.assertEqual(res['error_type'], "ValidationError")
+
+        res = self._search_employee({"cursor": "", "offset": 10})
+        self.assertEqual(res['error_type'], "ValidationError")
@@ -0,0 +1,108 @@
+from emappcore.common import config
+from emappext.hr_mgmt.tests import helper as h
+from elasticsearch import Elasticsearch
+from unittest import mock
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeSearchStreamAPITestCase(h.EMAppAPITestCase):
+
+    def _search_employee(self, data, accept="application/json"):
+        client = h.get_api_client(self._admin_key)
+        return client.get(h.url.format("search_employee"), data, HTTP_ACCEPT=accept)
+
+    def _get_expected_ids(self):
+        res = self._search_employee({"limit": 100}).json()
+        return [x['id'] for x in res['result']['results']]
+
+    def test_search_employee_ndjson(self):
+        """
+        Client opted in with Accept application/x-ndjson should get one json line per employee
+        :return:
+        """
+        expected_ids = self._get_expected_ids()
+        response = self._search_employee({"limit": 100}, accept="application/x-ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], "application/x-ndjson")
+
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), len(expected_ids))
+        self.assertEqual(set(json.loads(x)['id'] for x in lines), set(expected_ids))
+
+    def test_search_employee_stream_json(self):
+        """
+        Client opted in with Accept application/stream+json should get the json envelope with count
+        :return:
+        """
+        expected_ids = self._get_expected_ids()
+        response = self._search_employee({"limit": 100}, accept="application/stream+json")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], "application/json")
+
+        res = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(res['status'], "success")
+        self.assertEqual(res['action_name'], "search_employee")
+        self.assertEqual(res['count'], len(expected_ids))
+        self.assertNotIn("error", res)
+        self.assertEqual(set(x['id'] for x in res['result']), set(expected_ids))
+
+    def test_search_employee_not_streamed(self):
+        """
+        Client did not opt in for streaming should get the paged result with res_count
+        :return:
+        """
+        response = self._search_employee({"limit": 100})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+
+        res = response.json()
+        self.assertEqual(res['status'], "success")
+        self.assertIn("res_count", res['result'])
+
+    def test_search_employee_stream_offset(self):
+        """
+        Streaming with offset should stream limit number of employees after offset
+        :return:
+        """
+        expected_ids = self._get_expected_ids()
+        response = self._search_employee({"limit": 2, "offset": 1}, accept="application/x-ndjson")
+        self.assertEqual(response.status_code, 200)
+
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(x)['id'] for x in lines], expected_ids[1:3])
+
+    def test_search_employee_stream_closed(self):
+        """
+        Scroll should be cleared if the client closes the stream before the end
+        :return:
+        """
+        with mock.patch.object(Elasticsearch, "clear_scroll", autospec=True,
+                               side_effect=Elasticsearch.clear_scroll) as clear_scroll:
+            response = self._search_employee({"limit": 100}, accept="application/x-ndjson")
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("id", json.loads(next(iter(response.streaming_content))))
+            self.assertEqual(clear_scroll.call_count, 0)
+
+            response.close()
+            self.assertEqual(clear_scroll.call_count, 1)
+
+    @mock.patch.dict(config, {"API_STREAM_MAX_LIMIT": 2})
+    def test_search_employee_stream_max_limit(self):
+        """
+        Streaming limit more than API_STREAM_MAX_LIMIT should raise validation error
+        :return:
+        """
+        response = self._search_employee({"limit": 3}, accept="application/x-ndjson")
+        self.assertFalse(response.streaming)
+        res = response.json()
+        self.assertEqual(res['error_type'], "ValidationError")
+        self.assertIn("limit", res['msg'])
+
+        response = self._search_employee({"limit": 2}, accept="application/x-ndjson")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
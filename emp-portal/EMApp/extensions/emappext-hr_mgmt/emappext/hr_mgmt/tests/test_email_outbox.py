@@ -0,0 +1,74 @@
+from emappcore.common import config
+from emappcore.models import EmailOutbox
+from emappcore.utils import mail as core_mail
+from emappext.hr_mgmt.tests import helper as h
+from django.core import mail
+from django.utils import timezone
+from unittest import mock
+import smtplib
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeEmailOutboxTestCase(h.EMAppAPITestCase):
+
+    def _bulk_create(self, count):
+        _employees = [h.get_test_employee("mail", index) for index in range(count)]
+        res, code = h.send_api_post(h.get_api_headers(self._admin_key), h.url.format("bulk_create_employee"),
+                                    json.dumps({"employees": _employees}))
+        self.assertEqual(res['result']['created_count'], count)
+        return [_data['work_email'] for _data in _employees]
+
+    def test_create_employee_queues_email(self):
+        """
+        Welcome emails should be queued in the outbox and not sent in the request
+        :return:
+        """
+        _emails = self._bulk_create(3)
+        _outbox = EmailOutbox.objects.filter(to__overlap=_emails)
+        self.assertEqual(_outbox.count(), 3)
+        self.assertTrue(all(_row.status == EmailOutbox.STATUS_PENDING for _row in _outbox))
+        self.assertFalse(any(set(_message.to) & set(_emails) for _message in mail.outbox))
+
+    def test_send_outbox(self):
+        """
+        Pending emails should be sent in batches, one connection for each batch
+        :return:
+        """
+        _emails = self._bulk_create(3)
+        _pending = EmailOutbox.objects.filter(status=EmailOutbox.STATUS_PENDING).count()
+
+        with mock.patch.object(core_mail, 'get_connection', wraps=core_mail.get_connection) as _get_connection:
+            _sent = core_mail.send_outbox(batch_size=2)
+
+        self.assertEqual(_sent, _pending)
+        self.assertEqual(_get_connection.call_count, (_pending + 1) // 2)
+        self.assertEqual(set(_email for _message in mail.outbox for _email in _message.to) & set(_emails),
+                         set(_emails))
+        self.assertFalse(EmailOutbox.objects.filter(status=EmailOutbox.STATUS_PENDING).exists())
+
+    def test_send_outbox_retry(self):
+        """
+        Failed emails should be retried with a backoff and set as failed after max attempts
+        :return:
+        """
+        _outbox = core_mail.queue_email("Subject", "Body", ["retry@gmail.com"])
+        _now = timezone.now()
+
+        with mock.patch.object(core_mail.EmailMessage, 'send', side_effect=smtplib.SMTPException("failed")):
+            core_mail.send_outbox()
+        _outbox.refresh_from_db()
+        self.assertEqual(_outbox.status, EmailOutbox.STATUS_PENDING)
+        self.assertEqual(_outbox.attempts, 1)
+        self.assertGreater(_outbox.next_attempt_at, _now)
+
+        _outbox.next_attempt_at = _now
+        _outbox.save()
+        with mock.patch.dict(config, {"EMAIL_OUTBOX_MAX_ATTEMPTS": 2}), \
+                mock.patch.object(core_mail.EmailMessage, 'send', side_effect=smtplib.SMTPException("failed")):
+            core_mail.send_outbox()
+        _outbox.refresh_from_db()
+        self.assertEqual(_outbox.status, EmailOutbox.STATUS_FAILED)
+        self.assertEqual(_outbox.last_error, "failed")
@@ -0,0 +1,62 @@
+from django.test import SimpleTestCase
+from django.core.cache import caches
+from emappcore.common import config
+from emappcore.utils import validators as core_validators, errors as core_err
+from email_validator import EmailUndeliverableError
+from unittest import mock
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmailValidationModeTestCase(SimpleTestCase):
+
+    def setUp(self):
+        for _domain in ("deliverable.example.com", "undeliverable.example.com"):
+            caches[config.get('EMAIL_VALIDATION_CACHE', 'default')].delete("emapp:email:domain:{}".format(_domain))
+
+    @mock.patch.dict(config, {"EMAIL_VALIDATION_MODE": "syntax"})
+    def test_syntax_mode(self):
+        """
+        Syntax mode should not use the network
+        :return:
+        """
+        with mock.patch.object(core_validators, 'validate_email_deliverability',
+                               side_effect=AssertionError("DNS lookup")):
+            core_validators.email_validator("work_email", "employee@undeliverable.example.com")
+            with self.assertRaises(core_err.ValidationError):
+                core_validators.email_validator("work_email", "employee@")
+
+    @mock.patch.dict(config, {"EMAIL_VALIDATION_MODE": "deliverability"})
+    def test_deliverability_mode(self):
+        """
+        Domain should be looked up once and cached, undeliverable domains should raise validation error
+        :return:
+        """
+        with mock.patch.object(core_validators, 'validate_email_deliverability',
+                               return_value={"mx": [(10, "mx.example.com")]}) as _lookup:
+            for i in range(3):
+                core_validators.email_validator("work_email", "employee{}@deliverable.example.com".format(i))
+        self.assertEqual(_lookup.call_count, 1)
+
+        with mock.patch.object(core_validators, 'validate_email_deliverability',
+                               side_effect=EmailUndeliverableError("not found")) as _lookup:
+            for i in range(2):
+                with self.assertRaises(core_err.ValidationError):
+                    core_validators.email_validator("work_email", "employee@undeliverable.example.com")
+        self.assertEqual(_lookup.call_count, 1)
+
+    @mock.patch.dict(config, {"EMAIL_VALIDATION_MODE": "allowlist",
+                              "EMAIL_VALIDATION_ALLOWED_DOMAINS": ["example.com"]})
+    def test_allowlist_mode(self):
+        """
+        Only the allowed domains and their sub domains should be valid
+        :return:
+        """
+        with mock.patch.object(core_validators, 'validate_email_deliverability',
+                               side_effect=AssertionError("DNS lookup")):
+            core_validators.email_validator("work_email", "employee@example.com")
+            core_validators.email_validator("work_email", "employee@HR.Example.com")
+            for _email in ("employee@gmail.com", "employee@notexample.com"):
+                with self.assertRaises(core_err.ValidationError):
+                    core_validators.email_validator("work_email", _email)
@@ -0,0 +1,44 @@
+from django.test import SimpleTestCase
+from emappcore.common import utilities as u
+from emappcore.utils import validators as core_validators, errors as core_err
+from emappcore.utils.reference_data import countries
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class CountryReferenceDataTestCase(SimpleTestCase):
+
+    def test_country_lookup(self):
+        """
+        Country codes should be case insensitive and the tables read only
+        :return:
+        """
+        self.assertEqual(u.get_country_name("ie"), "Ireland")
+        self.assertEqual(u.get_country_name("IE"), "Ireland")
+        self.assertEqual(u.get_country_name("xx"), "")
+        self.assertEqual(u.get_country_name(""), "")
+        self.assertIs(u.get_all_countries_select_option(), countries.get_options())
+        with self.assertRaises(TypeError):
+            countries.get_options()[0]['value'] = "XX"
+
+    def test_country_code_validator(self):
+        """
+        Invalid or not string country codes should raise validation error
+        :return:
+        """
+        core_validators.country_code_validator("work_country_code", "in")
+        for _value in ("xx", "", " ie", None, 10):
+            with self.assertRaises(core_err.ValidationError):
+                core_validators.country_code_validator("work_country_code", _value)
+
+    def test_country_options_html(self):
+        """
+        Prerendered options should be escaped and only the given country selected
+        :return:
+        """
+        _html = u.get_all_countries_options_html("ci")
+        self.assertEqual(_html.count("<option "), len(countries.get_options()))
+        self.assertEqual(_html.count(" selected"), 1)
+        self.assertIn('<option value="CI" selected>Côte d&#39;Ivoire</option>', _html)
+        self.assertEqual(u.get_all_countries_options_html("").count(" selected"), 0)
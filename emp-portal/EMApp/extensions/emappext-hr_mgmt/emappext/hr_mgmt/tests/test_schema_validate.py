@@ -0,0 +1,109 @@
+from django.test import SimpleTestCase
+from emappcore.common import schemas, _essentials
+from emappcore.utils import errors as core_err
+from emappext.hr_mgmt.tests import test_data
+from emappext.hr_mgmt.models import Employee
+from unittest import mock
+import copy
+import datetime
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class EmployeeSchemaValidateTestCase(SimpleTestCase):
+
+    def _employee(self):
+        _data = copy.deepcopy(test_data.test_data_minimum_fields)
+        _data['work_email'] = "schema_validate@gmail.com"
+        return _data
+
+    def test_validate_compiled_once(self):
+        """
+        Schema should be compiled once and not copied on validate
+        :return:
+        """
+        _plan = schemas._get_compiled_schema("employee_schema")
+        with mock.patch.object(schemas, 'get_schema') as _get_schema:
+            self.assertTrue(schemas.validate("employee_schema", self._employee()))
+            self.assertTrue(schemas.validate("employee_schema", self._employee()))
+        _get_schema.assert_not_called()
+        self.assertIs(schemas._get_compiled_schema("employee_schema"), _plan)
+
+    def test_validate_errors(self):
+        """
+        Schema, custom validators and options errors should raise validation error
+        :return:
+        """
+        _invalid = [
+            ("first_name", None),
+            ("graduation_level", "invalid"),
+            ("joining_date", 10),
+            ("not_allowed", "value")
+        ]
+        for key, value in _invalid:
+            _data = self._employee()
+            if value is None:
+                del _data[key]
+            else:
+                _data[key] = value
+            with self.assertRaises(core_err.ValidationError):
+                schemas.validate("employee_schema", _data)
+
+    def test_validate_partial(self):
+        """
+        Partial validation should validate only the given keys, with or without required keys
+        :return:
+        """
+        self.assertTrue(schemas.validate("employee_schema", {"position": "Developer"}, partial=True))
+        self.assertTrue(schemas.validate("employee_schema", {"bio": "Developer"}, partial=True))
+        with self.assertRaises(core_err.ValidationError):
+            schemas.validate("employee_schema", {"position": ""}, partial=True)
+        with self.assertRaises(core_err.ValidationError):
+            schemas.validate("employee_schema", {"not_allowed": "value"}, partial=True)
+
+    def test_frozen_schema(self):
+        """
+        Frozen schema should be read only, built once and the indexes same as the schema attributes
+        :return:
+        """
+        _schema = schemas.get_schema("employee_schema")
+        _frozen = schemas.get_frozen_schema("employee_schema")
+        self.assertIs(schemas.get_frozen_schema("employee_schema"), _frozen)
+        with self.assertRaises(TypeError):
+            _frozen['properties']['first_name']['show'] = "admin"
+
+        for role in ("admin", "hr", "member", "all"):
+            self.assertEqual(_frozen.get_show_fields(role), set(
+                k for k, v in _schema['properties'].items() if role in v['show'].split(" ")))
+            self.assertEqual(_frozen.get_update_fields(role), set(
+                k for k, v in _schema['properties'].items() if role in v.get('update', "").split(" ")))
+
+        _columns, _extras = _frozen.get_model_fields(Employee)
+        self.assertEqual(set(_columns), set(_schema['properties']) & Employee.get_model_field_names())
+        self.assertEqual(set(_columns) | set(_extras), set(_schema['properties']))
+        self.assertEqual(
+            sorted(k for _keys in _frozen.get_groups().values() for k in _keys), sorted(_schema['properties']))
+
+    def test_normalize(self):
+        """
+        Only the given keys should be normalized as per the schema, in place
+        :return:
+        """
+        _data = {"skills": "python , django,", "employee_id": " DLX-1 ", "joining_date": datetime.date(2020, 1, 2),
+                 "first_name": " Test "}
+        self.assertIs(schemas.normalize("employee_schema", _data), _data)
+        self.assertEqual(_data, {"skills": ["Python", "Django"], "employee_id": "dlx-1",
+                                 "joining_date": "2020-01-02", "first_name": " Test "})
+        self.assertEqual(schemas.normalize("employee_schema", {"skills": ["python "]}), {"skills": ["Python"]})
+        self.assertEqual(schemas.normalize("employee_schema", {"joining_date": 10}), {"joining_date": 10})
+
+    def test_normalize_unknown(self):
+        """
+        Unknown normalizer should raise schema error on compile
+        :return:
+        """
+        with self.assertRaises(core_err.SchemaError):
+            _essentials._CompiledSchema({"properties": {
+                "name": {"type": "string", "validators": "", "normalize": "strip unknown"}
+            }})
@@ -91,6 +91,32 @@ def employee_update(app_context, raise_errors=True):
     return True
 
 
+def employee_bulk_update(app_context, raise_errors=True):
+    """
+    Check if the logged in user has access to update many employees at once.
+    if raise errors = True. This will raise NotAuthorized error else return boolean.
+
+    Rules:
+        - Admin/hr/super user can bulk update employees
+
+    :param app_context: dict (contains user information)
+    :param raise_errors: boolean (if true raises NotAuthorizedError)
+    :return: boolean or raises error
+    """
+    log.info("Validating employee bulk update access")
+    _role = app_context.get('role', '')
+    _is_super_user = app_context.get('is_superuser', False)
+
+    if _is_super_user or _role in ('admin', 'hr'):
+        return True
+
+    if raise_errors:
+        raise err.NotAuthorizedError({
+            "user": "Not authorized to perform bulk update action."
+        })
+    return False
+
+
 def employee_show(app_context, raise_errors=True):
     """
     Check if the logged in user has access to get an employee.
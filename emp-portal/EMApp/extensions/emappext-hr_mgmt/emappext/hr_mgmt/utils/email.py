@@ -1,5 +1,4 @@
-from django.core.mail import EmailMessage
-from emappcore.utils import validators, errors as err
+from emappcore.utils import mail, validators, errors as err
 from emappcore.common import config, utilities as u
 
 import logging
@@ -7,19 +6,12 @@ import logging
 log = logging.getLogger(__name__)
 
 
-def send_email_create_employee(to):
+def _get_create_employee_message(user):
     """
-    Sends Subject and body to the recently created employee
+    Subject and body of the email to the recently created employee
+    :param user: Employee model instance
     :return: tuple
     """
-    log.info("Sending an email to the new employee")
-    log.info(to)
-    if isinstance(to, list) or isinstance(to, tuple):
-        if len(to) > 1:
-            raise err.ValidationError("This should not happen. On create employee, email is sent to employee only")
-
-    validators.email_validator("work_email", to[0])
-    user = u.get_user_given_email(to[0])
     sub = "Admin has created your profile. Please reset your password"
     body = """
     Hi {first_name} {last_name},
@@ -45,9 +37,48 @@ def send_email_create_employee(to):
     return sub, body
 
 
+def queue_email_create_employees(employees):
+    """
+    Queue the emails to the recently created employees in the outbox. Call in the transaction that creates
+    the employees, emails are sent by the background sender once committed (see emappcore.utils.mail).
+    :param employees: list of Employee model instances
+    :return: None
+    """
+    _messages = list()
+    for _employee in employees:
+        sub, body = _get_create_employee_message(_employee)
+        _messages.append({
+            "subject": sub,
+            "body": body,
+            "to": [_employee.work_email.lower()]
+        })
+    mail.queue_emails(_messages)
+    return None
+
+
+def send_email_create_employee(to):
+    """
+    Sends Subject and body to the recently created employee (queued in the outbox)
+    :return: tuple
+    """
+    log.info("Sending an email to the new employee")
+    log.info(to)
+    if isinstance(to, list) or isinstance(to, tuple):
+        if len(to) > 1:
+            raise err.ValidationError("This should not happen. On create employee, email is sent to employee only")
+
+    validators.email_validator("work_email", to[0])
+    user = u.get_user_given_email(to[0])
+    sub, body = _get_create_employee_message(user)
+    mail.queue_email(sub, body, to=[to[0]])
+
+    return sub, body
+
+
 def send_email(subject=None, body=None, to=None):
     """
-    Send an email given subject body and user list
+    Send an email given subject body and user list. Email is queued in the outbox and sent by the
+    background sender once the current transaction is committed.
 
     :param subject: str Email subject
     :param body: str Email body
@@ -57,9 +88,8 @@ def send_email(subject=None, body=None, to=None):
     log.info("Sending email to: ")
     log.info(to)
     for _email in to:
-        validators.email_validator(_email)
+        validators.email_validator("to", _email)
 
     if not subject or not body:
         raise err.ValidationError("Subject or body is required parameter")
-    email = EmailMessage(subject, body, to=to)
-    email.send()
+    mail.queue_email(subject, body, to=to)
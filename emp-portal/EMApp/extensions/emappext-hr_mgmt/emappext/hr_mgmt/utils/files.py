@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from emappcore.common import model_transaction
+import os
+import threading
+import logging
+
+log = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """
+    Single thread pool for the file cleanup. Created on first use.
+    :return: ThreadPoolExecutor
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hr-mgmt-files")
+    return _executor
+
+
+def remove_files(paths):
+    """
+    Remove the given files. Missing files are skipped and errors are logged.
+    :param paths: list of file paths
+    :return: int number of removed files
+    """
+    count = 0
+    for _path in paths:
+        try:
+            if os.path.isfile(_path):
+                os.remove(_path)
+                count += 1
+        except OSError as e:
+            log.error("Not able to remove the file {}: {}".format(_path, e))
+    log.info("Removed {} files".format(count))
+    return count
+
+
+def remove_files_async(paths):
+    """
+    Remove the given files in the background once the current transaction is committed
+    (e.g. avatars of the deleted employees), so that the request does not wait for the file system.
+    :param paths: list of file paths
+    :return: None
+    """
+    paths = list(paths)
+    if not paths:
+        return None
+    model_transaction.on_commit(lambda: _get_executor().submit(remove_files, paths))
+    return None
@@ -54,18 +54,9 @@ def get_schema_groups(schema_name):
     """
     Get schema grouop given schema group
     :param schema_name: str
-    :return: tuple
-    """
-    _schema = schemas.get_schema(schema_name)
-    groups = dict()
-    for _property in _schema['properties']:
-        _gp = _schema['properties'][_property].get('group_label', '')
-        if _gp in groups:
-            groups[_gp].append(_property)
-        else:
-            groups[_gp] = [_property]
-
-    return groups
+    :return: mapping {group_label: tuple of properties} (read only)
+    """
+    return schemas.get_frozen_schema(schema_name).get_groups()
 
 
 def employee_verify_access(action, logged_user, emp_id=None):
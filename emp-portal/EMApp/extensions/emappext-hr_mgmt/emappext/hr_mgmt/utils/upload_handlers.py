@@ -0,0 +1,164 @@
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile, UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopFutureHandlers, StopUpload
+from emappcore.common import config
+import os
+import tempfile
+import logging
+
+log = logging.getLogger(__name__)
+
+# File signatures of the supported avatar formats
+_MAGIC_BYTES = {
+    "png": (b"\x89PNG\r\n\x1a\n", ),
+    "jpeg": (b"\xff\xd8\xff", ),
+    "jpg": (b"\xff\xd8\xff", ),
+    "gif": (b"GIF87a", b"GIF89a")
+}
+_HEADER_SIZE = max(len(_magic) for _signatures in _MAGIC_BYTES.values() for _magic in _signatures)
+
+
+class AvatarUploadedFile(TemporaryUploadedFile):
+    """
+    Avatar upload streamed to a temporary file in MEDIA_ROOT (AVATAR_UPLOAD_TEMP_DIR), so that saving the avatar
+    is a file move in the same file system.
+    """
+
+    def __init__(self, name, content_type, size, charset, content_type_extra=None):
+        _, ext = os.path.splitext(name)
+        _dir = os.path.join(settings.MEDIA_ROOT, config.get('AVATAR_UPLOAD_TEMP_DIR', 'tmp'))
+        os.makedirs(_dir, exist_ok=True)
+        file = tempfile.NamedTemporaryFile(suffix='.upload' + ext, dir=_dir)
+        UploadedFile.__init__(self, file, name, content_type, size, charset, content_type_extra)
+
+
+class AvatarUploadHandler(FileUploadHandler):
+    """
+    Upload handler for the avatar (upload_avatar field). Format and size are validated while the upload is
+    received, hence large or not supported files are rejected without reading the whole file:
+
+        - File extension against AVATAR_FILE_FORMATS before receiving the data
+        - File signature (magic bytes) from the first chunk
+        - Size against MAX_AVATAR_SIZE_BYTES for each chunk
+
+    Chunks are written to a temporary file in MEDIA_ROOT, never buffered in memory. Invalid upload is stopped
+    with StopUpload and the errors are set in upload_errors (see emappcore utilities get_upload_errors), rest of
+    the request is not stored. Other fields are handled by the next upload handlers.
+
+    Enabled in FILE_UPLOAD_HANDLERS before the django upload handlers.
+
+    Methods:
+        new_file: Validate the file extension and create the temporary file
+        receive_data_chunk: Validate the signature and size and write the chunk
+        file_complete: Get the uploaded file
+        upload_interrupted: Remove the temporary file
+    """
+    avatar_field_name = "upload_avatar"
+
+    def __init__(self, request=None):
+        super(AvatarUploadHandler, self).__init__(request)
+        self._is_active = False
+        self._header = b""
+        self._is_sniffed = False
+        self.upload_errors = dict()
+
+    @staticmethod
+    def _get_allowed_formats():
+        return tuple(_format.lower() for _format in config.get('AVATAR_FILE_FORMATS', ["png", "jpeg", "jpg"]))
+
+    @staticmethod
+    def _get_max_size():
+        return int(config.get('MAX_AVATAR_SIZE_BYTES'))
+
+    def _abort(self, error):
+        """
+        Remove the temporary file and stop the upload
+        :param error: dict
+        :return: None (raises StopUpload)
+        """
+        self.upload_interrupted()
+        self.upload_errors.update(error)
+        raise StopUpload()
+
+    def _sniff(self):
+        """
+        Validate the file signature against the signatures of the allowed formats. Formats without a known
+        signature are not checked.
+        :return: None (raises StopUpload)
+        """
+        self._is_sniffed = True
+        _signatures = list()
+        for _format in self._get_allowed_formats():
+            if _format not in _MAGIC_BYTES:
+                log.warning("No file signature for avatar format: {}".format(_format))
+                return None
+            _signatures.extend(_MAGIC_BYTES[_format])
+
+        if not self._header.startswith(tuple(_signatures)):
+            self._abort({
+                "upload_avatar": "File content is not in required format only allowed format is {}".format(
+                    ", ".join(self._get_allowed_formats()))
+            })
+        return None
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super(AvatarUploadHandler, self).new_file(field_name, file_name, content_type, content_length, charset,
+                                                  content_type_extra)
+        self._is_active = field_name == self.avatar_field_name
+        if not self._is_active:
+            return None
+
+        self._header = b""
+        self._is_sniffed = False
+        _, file_ext = os.path.splitext(file_name)
+        if not file_ext or file_ext.replace(".", "").lower() not in self._get_allowed_formats():
+            self._abort({
+                "upload_avatar": "File not in required format only allowed format is {}".format(
+                    ", ".join(self._get_allowed_formats()))
+            })
+
+        if content_length and content_length > self._get_max_size():
+            self._abort({
+                "avatar": "Uploaded image file exceeded limit."
+            })
+
+        log.info("Receiving avatar upload: {}".format(file_name))
+        self.file = AvatarUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        raise StopFutureHandlers()
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self._is_active:
+            return raw_data
+
+        if start + len(raw_data) > self._get_max_size():
+            self._abort({
+                "avatar": "Uploaded image file exceeded limit."
+            })
+
+        if not self._is_sniffed:
+            self._header += raw_data[:_HEADER_SIZE - len(self._header)]
+            if len(self._header) >= _HEADER_SIZE:
+                self._sniff()
+
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size):
+        if not self._is_active:
+            return None
+
+        self._is_active = False
+        if not self._is_sniffed:
+            self._sniff()
+
+        # Parser closes the file of the handlers if the upload is stopped, hence the handler does not keep it
+        _file = self.file
+        del self.file
+        _file.seek(0)
+        _file.size = file_size
+        return _file
+
+    def upload_interrupted(self):
+        if getattr(self, 'file', None) is not None and not self.file.closed:
+            self.file.close()
+        return None
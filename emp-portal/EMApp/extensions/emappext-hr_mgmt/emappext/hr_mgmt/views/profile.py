@@ -45,7 +45,7 @@ class EmployeeProfileView(View):
                 }
             )
             extra_vars['profile'] = user_data
-            extra_vars["schema"] = schemas.get_schema("employee_schema")
+            extra_vars["schema"] = schemas.get_frozen_schema("employee_schema")
         except err.NotAuthorizedError:
             messages.error(request, 'You are not authorized to perform this action')
             log.info("Logged in user not authorized to see the page")
@@ -115,7 +115,7 @@ class EmployeeEditView(View):
                 data['id'] = profile_id or request.user.id
                 user_data = data
             extra_vars['profile'] = user_data
-            extra_vars["schema"] = schemas.get_schema("employee_schema")
+            extra_vars["schema"] = schemas.get_frozen_schema("employee_schema")
             extra_vars["action"] = "edit"
         except err.NotAuthorizedError:
             messages.error(request, 'You are not authorized to perform this action')
@@ -138,6 +138,18 @@ class EmployeeEditView(View):
         :param profile_id: str
         :return: redurect to profile/<id> page
         """
+        # Avatar upload is validated while it is received (utils.upload_handlers.AvatarUploadHandler)
+        _upload_errors = u.get_upload_errors(request)
+        if _upload_errors:
+            u.prepare_error_data(_upload_errors)
+            messages.error(request, "<br>".join(
+                ["{}: {}".format(key, value) for key, value in _upload_errors.items()]
+            ))
+            response = self.get(request, profile_id=profile_id, errors=_upload_errors)
+            if response.status_code == 200:
+                response.status_code = 400
+            return response
+
         context = {
             "type": "profile",
             "user": request.user,
@@ -236,7 +248,7 @@ class EmployeeCreateView(View):
             # check create access
             auth.employee_create(context)
             extra_vars['profile'] = data if data else dict() # if data some validation error
-            extra_vars["schema"] = schemas.get_schema("employee_schema")
+            extra_vars["schema"] = schemas.get_frozen_schema("employee_schema")
             extra_vars["action"] = "create"
         except err.NotAuthorizedError:
             messages.error(request, 'You are not authorized to perform this action')
@@ -258,6 +270,18 @@ class EmployeeCreateView(View):
         :param request: request object
         :return: redirect to profile/<id> page
         """
+        # Avatar upload is validated while it is received (utils.upload_handlers.AvatarUploadHandler)
+        _upload_errors = u.get_upload_errors(request)
+        if _upload_errors:
+            u.prepare_error_data(_upload_errors)
+            messages.error(request, "<br>".join(
+                ["{}: {}".format(key, value) for key, value in _upload_errors.items()]
+            ))
+            response = self.get(request, errors=_upload_errors)
+            if response.status_code == 200:
+                response.status_code = 400
+            return response
+
         context = {
             "type": "profile",
             "user": request.user,
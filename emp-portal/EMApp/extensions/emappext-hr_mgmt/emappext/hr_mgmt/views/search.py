@@ -5,7 +5,8 @@ from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.shortcuts import render
 from emappcore.utils import errors as err
 from emappcore.common import abort, server_error, schemas, utilities
-from emappext.hr_mgmt.logic.employee import _search_employee_for_pagination as search_employee_object
+from emappext.hr_mgmt.logic.employee import _search_employee_for_pagination as search_employee_object, \
+    _get_next_cursor
 import logging
 
 log = logging.getLogger(__name__)
@@ -23,6 +24,9 @@ class EmployeeSearch(View):
         - last name
         - email id
         - position
+
+    Results are paginated with page numbers. If parameter cursor is given, next page is fetched with the cursor
+    (see search_employee_object) and only next page link is available.
     """
 
     _items_per_page = 12
@@ -49,16 +53,21 @@ class EmployeeSearch(View):
 
         try:
             search_result = search_employee_object(context, data_dict)
-            paginator = Paginator(search_result, self._items_per_page)
+            if 'cursor' in data_dict:
+                results = list(search_result[0:self._items_per_page])
+                extra_vars['next_cursor'] = _get_next_cursor(results, self._items_per_page)
+            else:
+                paginator = Paginator(search_result, self._items_per_page)
+
+                try:
+                    results = paginator.page(page)
+                except PageNotAnInteger:
+                    results = paginator.page(1)
+                except EmptyPage:
+                    results = paginator.page(paginator.num_pages)
 
-            try:
-                results = paginator.page(page)
-            except PageNotAnInteger:
-                results = paginator.page(1)
-            except EmptyPage:
-                results = paginator.page(paginator.num_pages)
+                extra_vars['total_pages'] = paginator.num_pages
 
-            extra_vars['total_pages'] = paginator.num_pages
             extra_vars['q'] = data_dict.get('q')
             extra_vars['search_results'] = results
             extra_vars['profile'] = request.user
@@ -31,6 +31,11 @@ class EMAppTaskManagementRegister(BaseAppCorePluginInterface, BaseAppRoutePlugin
             - name: API name (str)
             - func: API function (function)
             - method: API method (GET, PUT, POST, DELETE)
+            - validator_func: (optional) conditional GET validators function (function) - GET only
+            - max_concurrency: (optional) max concurrent requests for the action (int)
+            - cache: (optional) GET result cache policy {tags, ttl, key_func} (dict)
+            - invalidates: (optional) cache tags invalidated by the action (list)
+            - async_ok: (optional) action can be run as a background job with async=1 (boolean)
 
         :param api: EMAppAPIActions class
         :return: None